@@ -18,9 +18,15 @@ class Settings:
     if 'supabase' in DATABASE_URL and not os.getenv('FORCE_SUPABASE', 'false').lower() == 'true':
         DATABASE_URL = f"sqlite:///{os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'database', 'app.db'))}"
     
+    # Migration Configuration: sync (block startup), async (background thread) or skip
+    MIGRATION_MODE: str = os.getenv('MIGRATION_MODE', 'sync').lower()
+    
     # Security Configuration
     SECRET_KEY: str = os.getenv('SECRET_KEY', '')
     
+    # AES-256 key for integration credentials at rest: 32 random bytes, base64-encoded
+    CREDENTIALS_ENCRYPTION_KEY: str = os.getenv('CREDENTIALS_ENCRYPTION_KEY', '')
+    
     # CORS Configuration
     CORS_ORIGINS: list = os.getenv('CORS_ORIGINS', 'http://localhost:3000,http://localhost:3001,https://your-production-domain.com').split(',')
     
@@ -44,6 +50,10 @@ class Settings:
     # Analytics Configuration
     ANALYTICS_CACHE_TTL: int = int(os.getenv('ANALYTICS_CACHE_TTL', '300'))  # 5 minutes
     
+    # Redis Cache Configuration (caching is skipped when REDIS_URL is unset)
+    REDIS_URL: str = os.getenv('REDIS_URL', '')
+    MARKET_INTELLIGENCE_CACHE_TTL: int = int(os.getenv('MARKET_INTELLIGENCE_CACHE_TTL', '3600'))  # 1 hour
+    
     # Agent Astra API Configuration
     AGENT_ASTRA_API_KEY: str = os.getenv('AGENT_ASTRA_API_KEY', '')
     AGENT_ASTRA_BASE_URL: str = os.getenv('AGENT_ASTRA_BASE_URL', 'https://api.agentastra.ai/v2')
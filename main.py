@@ -11,6 +11,7 @@ sys.path.insert(0, current_dir)
 
 from flask import Flask, send_from_directory
 from flask_cors import CORS
+from sqlalchemy.engine import make_url
 from models import (
     db, Organization, Upload, ProcessedData, Agent,
     TriangleScore, ProductAnalytics, SupplierPerformance,
@@ -23,6 +24,7 @@ from models_enhanced import UnifiedTransaction, DocumentInventoryLink
 from config.settings import settings
 from utils.logger import get_logger
 from utils.error_handler import register_error_handlers
+from utils.json_provider import OrjsonProvider
 
 # Import blueprints
 from routes.upload_routes import upload_bp
@@ -34,11 +36,17 @@ logger = get_logger('main')
 
 # Initialize Flask app
 app = Flask(__name__, static_folder='static', static_url_path='/static')
+app.json = OrjsonProvider(app)
 
 # Configure app
 app.config['SECRET_KEY'] = settings.SECRET_KEY
 app.config['SQLALCHEMY_DATABASE_URI'] = settings.DATABASE_URL
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+engine_options = {'insertmanyvalues_page_size': 10_000, 'query_cache_size': 1200}
+if make_url(settings.DATABASE_URL).drivername in ('postgresql', 'postgresql+psycopg2'):
+    # INSERTs already use multi-row VALUES pages; also batch executemany UPDATE/DELETE
+    engine_options['executemany_mode'] = 'values_plus_batch'
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options
 app.config['MAX_CONTENT_LENGTH'] = settings.MAX_FILE_SIZE
 
 # Initialize extensions
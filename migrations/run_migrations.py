@@ -4,10 +4,15 @@ Database migration runner for agent system deployment.
 Handles both SQLite (development) and PostgreSQL (production) databases.
 """
 
+import itertools
 import os
+import re
 import sys
 import sqlite3
+import threading
 import psycopg2
+import psycopg2.pool
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 import logging
@@ -25,14 +30,152 @@ logging.basicConfig(
 )
 logger = logging.getLogger('migration_runner')
 
+# PostgreSQL connection pools shared by all runners, keyed by database URL
+_PG_POOLS = {}
+_PG_POOLS_LOCK = threading.Lock()
+
+
+def _get_postgresql_pool(database_url: str):
+    """Get (or lazily create) the shared connection pool for a database URL."""
+    with _PG_POOLS_LOCK:
+        pool = _PG_POOLS.get(database_url)
+        if pool is None:
+            pool = psycopg2.pool.ThreadedConnectionPool(1, 4, database_url)
+            _PG_POOLS[database_url] = pool
+        return pool
+
+# Advisory lock key that serializes migration runs across replicas
+_MIGRATION_LOCK_NAME = 'tip_vf_migrations'
+
+_MIGRATION_MODES = ('sync', 'async', 'skip')
+
+# Forward migration files for a dialect, e.g. 001_create_agent_tables.sqlite.sql
+# -> version 001. PostgreSQL files are generated by
+# scripts/generate_dialect_migrations.py.
+_MIGRATION_FILE_PATTERN = r'^(\d+)_(?!rollback\.)(.+)\.{db_type}\.sql$'
+
+# Quoted strings, quoted identifiers, comments and dollar-quoted bodies,
+# whose contents are never SQL punctuation
+_QUOTED_TOKEN_PATTERN = (
+    r"'(?:[^']|'')*'"
+    r'|"(?:[^"]|"")*"'
+    r'|--[^\n]*'
+    r'|/\*.*?\*/'
+    r'|\$(\w*)\$.*?\$\1\$'
+)
+
+# Tokens that may contain a ';' which must not end a statement, or the
+# top-level ';' terminator itself
+_STATEMENT_TOKEN_RE = re.compile(_QUOTED_TOKEN_PATTERN + r'|;', re.DOTALL)
+
+# Quoted tokens, or the punctuation of a VALUES row list
+_VALUES_TOKEN_RE = re.compile(_QUOTED_TOKEN_PATTERN + r'|[(),]', re.DOTALL)
+
+
+def _iter_statements(sql_content: str):
+    """Yield SQL statements split on top-level semicolons in a single pass.
+    
+    Semicolons inside quoted strings, identifiers, dollar-quoted bodies and
+    comments do not terminate a statement.
+    """
+    start = 0
+    for match in _STATEMENT_TOKEN_RE.finditer(sql_content):
+        if match.group(0) != ';':
+            continue
+        statement = sql_content[start:match.start()].strip()
+        if statement:
+            yield statement
+        start = match.end()
+    
+    statement = sql_content[start:].strip()
+    if statement:
+        yield statement
+
+# INSERT INTO <table> (<columns>) VALUES ...; _is_row_list checks that the
+# rest is only (<row>)[, (<row>)...]
+_INSERT_RE = re.compile(
+    r'^\s*(?P<head>INSERT\s+INTO\s+\w+\s*\([^)]+\)\s*VALUES)\s*(?P<values>\(.*\))\s*$',
+    re.IGNORECASE | re.DOTALL
+)
+
+def _is_row_list(values: str) -> bool:
+    """Whether text is nothing but a comma-separated list of parenthesized rows.
+    
+    Anything else at the top level, such as ON CONFLICT or RETURNING,
+    makes the INSERT unsafe to merge with others.
+    """
+    depth = 0
+    expect_row = True
+    position = 0
+    for match in _VALUES_TOKEN_RE.finditer(values):
+        token = match.group(0)
+        if depth == 0:
+            if values[position:match.start()].strip():
+                return False
+            if token == '(' and expect_row:
+                depth, expect_row = 1, False
+            elif token == ',' and not expect_row:
+                expect_row = True
+            else:
+                return False
+        elif token == '(':
+            depth += 1
+        elif token == ')':
+            depth -= 1
+        position = match.end()
+    return depth == 0 and not expect_row and not values[position:].strip()
+
+# Rows per coalesced INSERT, kept under SQLite's compound VALUES limit
+_INSERT_BATCH_SIZE = 500
+
+
+def _coalesce_inserts(statements):
+    """Merge runs of adjacent INSERTs into the same table and columns.
+    
+    Each run is emitted as multi-row INSERT ... VALUES statements so seed data
+    costs one round trip per batch instead of one per row.
+    """
+    batch_key = batch_head = None
+    batch_values = []
+    
+    for statement in statements:
+        match = _INSERT_RE.match(statement)
+        if match and not _is_row_list(match.group('values')):
+            match = None
+        key = ' '.join(match.group('head').upper().split()) if match else None
+        
+        if batch_values and (key != batch_key or len(batch_values) >= _INSERT_BATCH_SIZE):
+            yield f"{batch_head} {', '.join(batch_values)}"
+            batch_values = []
+        
+        if match:
+            if not batch_values:
+                batch_key, batch_head = key, match.group('head')
+            batch_values.append(match.group('values'))
+        else:
+            yield statement
+    
+    if batch_values:
+        yield f"{batch_head} {', '.join(batch_values)}"
+
+
 class MigrationRunner:
     """Database migration runner with support for multiple database types."""
     
+    # Status of the latest migration run in this process: pending, running, succeeded or failed
+    MIGRATION_STATUS = {'state': 'pending', 'error': None, 'started_at': None, 'finished_at': None}
+    _status_lock = threading.Lock()
+    
     def __init__(self):
         """Initialize migration runner."""
         self.database_url = settings.DATABASE_URL
         self.migration_dir = Path(__file__).parent
         self.db_type = self._detect_database_type()
+        self.mode = settings.MIGRATION_MODE
+        if self.mode not in _MIGRATION_MODES:
+            raise ValueError(f"Unsupported migration mode: {self.mode}")
+        self._migration_files_cache = None
+        self._migration_dir_mtime = None
         
     def _detect_database_type(self) -> str:
         """Detect database type from URL."""
@@ -55,9 +198,17 @@ class MigrationRunner:
         
         return sqlite3.connect(db_path)
     
+    @contextmanager
     def _get_postgresql_connection(self):
-        """Get PostgreSQL database connection."""
-        return psycopg2.connect(self.database_url)
+        """Get a pooled PostgreSQL connection, returned to the pool on exit."""
+        pool = _get_postgresql_pool(self.database_url)
+        conn = pool.getconn()
+        try:
+            with conn:
+                yield conn
+        finally:
+            # A closed connection is dropped from the pool rather than reused
+            pool.putconn(conn, close=bool(conn.closed))
     
     def _get_connection(self):
         """Get database connection based on type."""
@@ -68,6 +219,29 @@ class MigrationRunner:
         else:
             raise ValueError(f"Unsupported database type: {self.db_type}")
     
+    def _list_migration_files(self) -> list:
+        """Get (file, version, description, path) tuples sorted by file name.
+        
+        Only files for the runner's database type are listed. The directory
+        is rescanned only when its mtime changes.
+        """
+        mtime = os.stat(self.migration_dir).st_mtime
+        if self._migration_files_cache is None or mtime != self._migration_dir_mtime:
+            suffix = f'.{self.db_type}.sql'
+            file_re = re.compile(_MIGRATION_FILE_PATTERN.format(db_type=re.escape(self.db_type)))
+            migration_files = []
+            with os.scandir(self.migration_dir) as entries:
+                for entry in entries:
+                    match = file_re.match(entry.name)
+                    if match and entry.is_file():
+                        description = entry.name[:-len(suffix)].replace('_', ' ')
+                        migration_files.append((entry.name, match.group(1), description, entry.path))
+            
+            migration_files.sort()
+            self._migration_files_cache = migration_files
+            self._migration_dir_mtime = mtime
+        return self._migration_files_cache
+    
     def _create_migration_table(self, cursor):
         """Create migration tracking table."""
         if self.db_type == 'sqlite':
@@ -87,77 +261,41 @@ class MigrationRunner:
                 )
             ''')
     
-    def _get_applied_migrations(self, cursor) -> set:
-        """Get list of applied migrations."""
+    def _get_applied_migrations(self, cursor, candidate_versions=None) -> set:
+        """Get set of applied migrations, optionally limited to the candidate versions."""
         try:
-            cursor.execute("SELECT version FROM schema_migrations")
-            return {row[0] for row in cursor.fetchall()}
+            if candidate_versions is None:
+                cursor.execute("SELECT version FROM schema_migrations")
+            elif not candidate_versions:
+                return set()
+            elif self.db_type == 'sqlite':
+                placeholders = ', '.join('?' * len(candidate_versions))
+                cursor.execute(
+                    f"SELECT version FROM schema_migrations WHERE version IN ({placeholders})",
+                    tuple(candidate_versions)
+                )
+            else:
+                cursor.execute(
+                    "SELECT version FROM schema_migrations WHERE version = ANY(%s)",
+                    (list(candidate_versions),)
+                )
+            cursor.arraysize = 1000
+            return set(itertools.chain.from_iterable(cursor))
         except Exception:
             # Table doesn't exist yet
             return set()
     
-    def _convert_sql_for_postgresql(self, sql_content: str) -> str:
-        """Convert SQLite SQL to PostgreSQL compatible SQL."""
-        # Basic conversions for PostgreSQL
-        conversions = {
-            'INTEGER PRIMARY KEY AUTOINCREMENT': 'SERIAL PRIMARY KEY',
-            'DATETIME': 'TIMESTAMP',
-            'DECIMAL(10,4)': 'NUMERIC(10,4)',
-            'DECIMAL(3,2)': 'NUMERIC(3,2)',
-            'DECIMAL(5,2)': 'NUMERIC(5,2)',
-            'DECIMAL(10,2)': 'NUMERIC(10,2)',
-            'BOOLEAN': 'BOOLEAN',
-            'JSON': 'JSONB',
-            'TEXT': 'TEXT',
-            'VARCHAR(255)': 'VARCHAR(255)',
-            'CURRENT_TIMESTAMP': 'CURRENT_TIMESTAMP',
-            'INDEX idx_': 'CREATE INDEX IF NOT EXISTS idx_',
-            'UNIQUE(': 'CONSTRAINT unique_constraint UNIQUE(',
-        }
-        
-        result = sql_content
-        for old, new in conversions.items():
-            result = result.replace(old, new)
-        
-        # Fix INDEX creation syntax
-        lines = result.split('\n')
-        processed_lines = []
-        
-        for line in lines:
-            if 'CREATE INDEX IF NOT EXISTS idx_' in line and 'ON ' not in line:
-                # This is an inline index definition, convert to separate CREATE INDEX
-                if '(' in line and ')' in line:
-                    # Extract table name from previous CREATE TABLE statement
-                    table_name = None
-                    for prev_line in reversed(processed_lines):
-                        if 'CREATE TABLE' in prev_line:
-                            table_name = prev_line.split('CREATE TABLE IF NOT EXISTS ')[1].split(' ')[0]
-                            break
-                    
-                    if table_name:
-                        index_name = line.strip().split('CREATE INDEX IF NOT EXISTS ')[1].split(' ')[0]
-                        columns = line.split('(')[1].split(')')[0]
-                        new_line = f"CREATE INDEX IF NOT EXISTS {index_name} ON {table_name} ({columns});"
-                        processed_lines.append(new_line)
-                        continue
-            
-            processed_lines.append(line)
-        
-        return '\n'.join(processed_lines)
-    
     def _execute_migration(self, cursor, sql_content: str, version: str, description: str):
-        """Execute a migration."""
+        """Execute a migration and its bookkeeping in a single transaction."""
         logger.info(f"Applying migration {version}: {description}")
         
-        # Convert SQL if needed
-        if self.db_type == 'postgresql':
-            sql_content = self._convert_sql_for_postgresql(sql_content)
-        
-        # Split SQL into individual statements
-        statements = [stmt.strip() for stmt in sql_content.split(';') if stmt.strip()]
+        conn = cursor.connection
+        if self.db_type == 'sqlite':
+            # sqlite3 does not open a transaction implicitly before DDL
+            cursor.execute('BEGIN')
         
-        for statement in statements:
-            if statement:
+        try:
+            for statement in _coalesce_inserts(_iter_statements(sql_content)):
                 try:
                     cursor.execute(statement)
                     logger.debug(f"Executed: {statement[:100]}...")
@@ -165,15 +303,19 @@ class MigrationRunner:
                     logger.error(f"Error executing statement: {statement[:100]}...")
                     logger.error(f"Error: {e}")
                     raise
+            
+            # Record migration as applied
+            cursor.execute(
+                "INSERT INTO schema_migrations (version, description) VALUES (?, ?)" 
+                if self.db_type == 'sqlite' else
+                "INSERT INTO schema_migrations (version, description) VALUES (%s, %s)",
+                (version, description)
+            )
+        except Exception:
+            conn.rollback()
+            raise
         
-        # Record migration as applied
-        cursor.execute(
-            "INSERT INTO schema_migrations (version, description) VALUES (?, ?)" 
-            if self.db_type == 'sqlite' else
-            "INSERT INTO schema_migrations (version, description) VALUES (%s, %s)",
-            (version, description)
-        )
-        
+        conn.commit()
         logger.info(f"Migration {version} applied successfully")
     
     def run_migrations(self):
@@ -181,10 +323,7 @@ class MigrationRunner:
         logger.info(f"Starting migrations for {self.db_type} database")
         
         # Get all migration files
-        migration_files = sorted([
-            f for f in os.listdir(self.migration_dir)
-            if f.endswith('.sql') and f[0].isdigit()
-        ])
+        migration_files = self._list_migration_files()
         
         if not migration_files:
             logger.info("No migration files found")
@@ -193,38 +332,113 @@ class MigrationRunner:
         with self._get_connection() as conn:
             cursor = conn.cursor()
             
-            # Create migration tracking table
-            self._create_migration_table(cursor)
-            conn.commit()
+            if self.db_type == 'postgresql':
+                # Block until no other replica is migrating
+                cursor.execute("SELECT pg_advisory_lock(hashtext(%s))", (_MIGRATION_LOCK_NAME,))
             
-            # Get applied migrations
-            applied_migrations = self._get_applied_migrations(cursor)
-            
-            # Run pending migrations
-            for migration_file in migration_files:
-                version = migration_file.split('_')[0]
-                
-                if version in applied_migrations:
-                    logger.info(f"Migration {version} already applied, skipping")
-                    continue
-                
-                # Read migration file
-                migration_path = self.migration_dir / migration_file
-                with open(migration_path, 'r') as f:
-                    sql_content = f.read()
+            try:
+                # Create migration tracking table
+                self._create_migration_table(cursor)
+                conn.commit()
                 
-                # Extract description from filename
-                description = migration_file.replace('.sql', '').replace('_', ' ')
+                # Get applied migrations among the ones on disk
+                applied_migrations = self._get_applied_migrations(
+                    cursor, [version for _, version, _, _ in migration_files]
+                )
                 
-                # Execute migration
-                self._execute_migration(cursor, sql_content, version, description)
-                conn.commit()
+                # Run pending migrations
+                for _, version, description, path in migration_files:
+                    if version in applied_migrations:
+                        logger.info(f"Migration {version} already applied, skipping")
+                        continue
+                    
+                    # Read migration file
+                    sql_content = Path(path).read_text(encoding='utf-8')
+                    
+                    # Execute migration
+                    self._execute_migration(cursor, sql_content, version, description)
+            finally:
+                if self.db_type == 'postgresql':
+                    self._release_migration_lock(conn, cursor)
         
         logger.info("All migrations completed successfully")
     
+    def _release_migration_lock(self, conn, cursor):
+        """Release the migration advisory lock, closing the connection if that fails.
+        
+        The lock is held by the session, so a connection that still holds it
+        must not go back to the pool; closing it releases the lock.
+        """
+        try:
+            # A failed statement leaves the transaction aborted
+            conn.rollback()
+            cursor.execute("SELECT pg_advisory_unlock(hashtext(%s))", (_MIGRATION_LOCK_NAME,))
+            conn.commit()
+        except Exception as e:
+            logger.error(f"Could not release the migration lock, closing the connection: {e}")
+            conn.close()
+    
+    @classmethod
+    def _set_status(cls, state: str, error: str = None):
+        """Record the state of the current migration run."""
+        with cls._status_lock:
+            cls.MIGRATION_STATUS['state'] = state
+            cls.MIGRATION_STATUS['error'] = error
+            if state == 'running':
+                cls.MIGRATION_STATUS['started_at'] = datetime.now().isoformat()
+                cls.MIGRATION_STATUS['finished_at'] = None
+            elif state in ('succeeded', 'failed'):
+                cls.MIGRATION_STATUS['finished_at'] = datetime.now().isoformat()
+    
+    @classmethod
+    def get_status(cls) -> dict:
+        """Get a snapshot of the latest migration run status."""
+        with cls._status_lock:
+            return dict(cls.MIGRATION_STATUS)
+    
+    def _run_and_record(self, raise_errors: bool = True):
+        """Run migrations, recording progress in MIGRATION_STATUS."""
+        self._set_status('running')
+        try:
+            self.run_migrations()
+        except Exception as e:
+            logger.error(f"Migration run failed: {e}")
+            self._set_status('failed', str(e))
+            if raise_errors:
+                raise
+        else:
+            self._set_status('succeeded')
+    
+    def run_migrations_async(self) -> threading.Thread:
+        """Run pending migrations in a background thread."""
+        thread = threading.Thread(
+            target=self._run_and_record,
+            kwargs={'raise_errors': False},
+            name='migration-runner',
+            daemon=True
+        )
+        thread.start()
+        return thread
+    
+    def start(self):
+        """Run migrations according to MIGRATION_MODE.
+        
+        Returns the background thread in async mode, otherwise None.
+        """
+        if self.mode == 'skip':
+            logger.info("MIGRATION_MODE=skip, not running migrations")
+            return None
+        
+        if self.mode == 'async':
+            logger.info("MIGRATION_MODE=async, running migrations in the background")
+            return self.run_migrations_async()
+        
+        self._run_and_record()
+        return None
+    
     def rollback_migration(self, version: str):
         """Rollback a specific migration (if rollback file exists)."""
-        rollback_file = self.migration_dir / f"{version}_rollback.sql"
+        rollback_file = self.migration_dir / f"{version}_rollback.{self.db_type}.sql"
         
         if not rollback_file.exists():
             logger.error(f"Rollback file not found for migration {version}")
@@ -246,15 +460,11 @@ class MigrationRunner:
                 return False
             
             # Read rollback file
-            with open(rollback_file, 'r') as f:
-                sql_content = f.read()
+            sql_content = rollback_file.read_text(encoding='utf-8')
             
             # Execute rollback
-            statements = [stmt.strip() for stmt in sql_content.split(';') if stmt.strip()]
-            
-            for statement in statements:
-                if statement:
-                    cursor.execute(statement)
+            for statement in _iter_statements(sql_content):
+                cursor.execute(statement)
             
             # Remove migration record
             cursor.execute(
@@ -270,22 +480,19 @@ class MigrationRunner:
     
     def get_migration_status(self):
         """Get status of all migrations."""
-        migration_files = sorted([
-            f for f in os.listdir(self.migration_dir)
-            if f.endswith('.sql') and f[0].isdigit()
-        ])
+        migration_files = self._list_migration_files()
         
         try:
             with self._get_connection() as conn:
                 cursor = conn.cursor()
-                applied_migrations = self._get_applied_migrations(cursor)
+                applied_migrations = self._get_applied_migrations(
+                    cursor, [version for _, version, _, _ in migration_files]
+                )
         except Exception:
             applied_migrations = set()
         
         status = []
-        for migration_file in migration_files:
-            version = migration_file.split('_')[0]
-            description = migration_file.replace('.sql', '').replace('_', ' ')
+        for migration_file, version, description, _ in migration_files:
             is_applied = version in applied_migrations
             
             status.append({
@@ -340,7 +547,10 @@ def main():
                 print(f"  {migration['version']} - {migration['description']}")
     
     else:
-        runner.run_migrations()
+        thread = runner.start()
+        if thread:
+            # Keep the CLI process alive until the background run finishes
+            thread.join()
 
 
 if __name__ == '__main__':
@@ -1,9 +1,118 @@
 from flask_sqlalchemy import SQLAlchemy
-from datetime import datetime
-import json
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import declared_attr
+from sqlalchemy.types import TypeDecorator
+import os
+import sys
+import time
 import uuid
+import zlib
+import orjson
 
-db = SQLAlchemy()
+# numpy scalars/arrays from the analytics engines and non-string keys are encoded as-is
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+def _json_dumps(value):
+    """Encode JSON/JSONB column values with orjson"""
+    return orjson.dumps(value, option=_ORJSON_OPTIONS).decode()
+
+# JSON and JSONB columns are (de)serialized with orjson rather than the json module
+db = SQLAlchemy(engine_options={'json_serializer': _json_dumps, 'json_deserializer': orjson.loads})
+
+def _iso(value):
+    """Format an optional date/datetime as an ISO 8601 string"""
+    return value.isoformat() if value else None
+
+# Version 7 and RFC 4122 variant bits
+_UUID7_MASK = ~(0xF << 76 | 0x3 << 62)
+_UUID7_BITS = 0x7 << 76 | 0x2 << 62
+
+def uuid7():
+    """Time-ordered UUID (RFC 9562 version 7).
+    
+    The leading 48 bits are the Unix time in milliseconds, so new keys land at
+    the right edge of the primary key index instead of on random pages.
+    """
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), 'big')
+    return uuid.UUID(int=value & _UUID7_MASK | _UUID7_BITS)
+
+def uuid7_many(count):
+    """count version 7 UUIDs for one batch, drawing their random bits in a single os.urandom call"""
+    timestamp = (time.time_ns() // 1_000_000) << 80
+    random_bytes = os.urandom(10 * count)
+    return [
+        uuid.UUID(int=(timestamp | int.from_bytes(random_bytes[i:i + 10], 'big')) & _UUID7_MASK | _UUID7_BITS)
+        for i in range(0, 10 * count, 10)
+    ]
+
+class InternedString(TypeDecorator):
+    """String column for low-cardinality values (status, type, severity).
+    
+    Loaded values are interned, so large result sets share one str object per
+    distinct value instead of allocating a copy per row.
+    """
+    impl = db.String
+    cache_ok = True
+    
+    def process_result_value(self, value, dialect):
+        return sys.intern(value) if value else value
+
+class CodedString(TypeDecorator):
+    """Closed set of string values stored as SMALLINT codes.
+    
+    Python code keeps reading and writing the strings; the database stores
+    each value's 1-based position in ``values``. The tuple is append-only:
+    reordering or removing values changes the meaning of stored codes.
+    """
+    impl = db.SmallInteger
+    cache_ok = True
+    
+    def __init__(self, values):
+        super().__init__()
+        self.values = tuple(values)
+        self._codes = {value: code for code, value in enumerate(self.values, start=1)}
+    
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        try:
+            return self._codes[value]
+        except KeyError:
+            raise ValueError(f"{value!r} is not one of {self.values}") from None
+    
+    def process_result_value(self, value, dialect):
+        return self.values[value - 1] if value is not None else None
+
+class CompressedJSON(TypeDecorator):
+    """JSON document stored as zlib-compressed bytes.
+    
+    For large blobs that are always read and written whole (forecasts, trend
+    series): they take a fraction of the space of JSON/JSONB, at the cost of
+    key-level queries in SQL. Uncompressed JSON bytes, e.g. rows converted
+    in place from JSONB, are still read correctly.
+    """
+    impl = db.LargeBinary
+    cache_ok = True
+    
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return zlib.compress(orjson.dumps(value, option=_ORJSON_OPTIONS), 6)
+    
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        value = bytes(value)
+        # zlib streams start with 0x78 ('x'), which never starts a JSON document
+        if value[:1] == b'x':
+            value = zlib.decompress(value)
+        return orjson.loads(value)
+
+# JSON documents are stored as binary JSONB on PostgreSQL and as JSON text elsewhere
+JSONDocument = db.JSON().with_variant(postgresql.JSONB(), 'postgresql')
+
+# Heuristic scores (0-1, 0-100) carry a few significant digits, so they are stored as 4-byte REAL
+ScoreFloat = db.Float(precision=24)
 
 class Organization(db.Model):
     """Organization model for multi-tenancy"""
@@ -12,8 +121,8 @@ class Organization(db.Model):
     id = db.Column(db.String(100), primary_key=True)  # Clerk organization ID
     name = db.Column(db.String(255), nullable=False)
     domain = db.Column(db.String(255))  # For domain-based assignment
-    created_date = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_date = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_date = db.Column(db.DateTime, server_default=db.func.now())
+    updated_date = db.Column(db.DateTime, server_default=db.func.now(), onupdate=db.func.now())
     
     # Relationships
     uploads = db.relationship('Upload', backref='organization', lazy=True)
@@ -23,8 +132,8 @@ class Organization(db.Model):
             'id': self.id,
             'name': self.name,
             'domain': self.domain,
-            'created_date': self.created_date.isoformat() if self.created_date else None,
-            'updated_date': self.updated_date.isoformat() if self.updated_date else None
+            'created_date': _iso(self.created_date),
+            'updated_date': _iso(self.updated_date)
         }
 
 class Upload(db.Model):
@@ -36,13 +145,13 @@ class Upload(db.Model):
     original_filename = db.Column(db.String(255), nullable=False)
     file_size = db.Column(db.Integer, nullable=False)
     file_type = db.Column(db.String(50), nullable=False)
-    upload_date = db.Column(db.DateTime, default=datetime.utcnow)
+    upload_date = db.Column(db.DateTime, server_default=db.func.now())
     user_id = db.Column(db.String(100), nullable=False)  # Clerk user ID
     org_id = db.Column(db.String(100), db.ForeignKey('organizations.id'), nullable=False)  # Clerk organization ID
-    status = db.Column(db.String(50), default='uploaded')  # uploaded, processing, completed, error
+    status = db.Column(InternedString(50), default='uploaded')  # uploaded, processing, completed, error
     row_count = db.Column(db.Integer, default=0)
     column_count = db.Column(db.Integer, default=0)
-    data_summary = db.Column(db.Text)  # JSON string with data summary
+    data_summary = db.Column(JSONDocument)  # Data summary
     error_message = db.Column(db.Text)
     
     # Relationships
@@ -55,13 +164,13 @@ class Upload(db.Model):
             'original_filename': self.original_filename,
             'file_size': self.file_size,
             'file_type': self.file_type,
-            'upload_date': self.upload_date.isoformat() if self.upload_date else None,
+            'upload_date': _iso(self.upload_date),
             'user_id': self.user_id,
             'org_id': self.org_id,
             'status': self.status,
             'row_count': self.row_count,
             'column_count': self.column_count,
-            'data_summary': json.loads(self.data_summary) if self.data_summary else None,
+            'data_summary': self.data_summary,
             'error_message': self.error_message
         }
 
@@ -72,9 +181,10 @@ class ProcessedData(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     upload_id = db.Column(db.Integer, db.ForeignKey('uploads.id'), nullable=False)
     org_id = db.Column(db.String(100), db.ForeignKey('organizations.id'), nullable=False)  # Clerk organization ID
-    data_type = db.Column(db.String(50), nullable=False)  # inventory, supplier, shipment
-    processed_data = db.Column(db.Text, nullable=False)  # JSON string with processed data
-    created_date = db.Column(db.DateTime, default=datetime.utcnow)
+    data_type = db.Column(InternedString(50), nullable=False)  # inventory, supplier, shipment
+    # Large payload: deferred so listings and upload cascades skip it, read sites undefer it
+    processed_data = db.deferred(db.Column(JSONDocument, nullable=False))
+    created_date = db.Column(db.DateTime, server_default=db.func.now())
     
     def to_dict(self):
         return {
@@ -82,9 +192,14 @@ class ProcessedData(db.Model):
             'upload_id': self.upload_id,
             'org_id': self.org_id,
             'data_type': self.data_type,
-            'processed_data': json.loads(self.processed_data) if self.processed_data else None,
-            'created_date': self.created_date.isoformat() if self.created_date else None
+            'processed_data': self.processed_data,
+            'created_date': _iso(self.created_date)
         }
+    
+    @classmethod
+    def query_with_payload(cls):
+        """Query that loads the deferred processed_data payload with the row"""
+        return cls.query.options(db.undefer(cls.processed_data))
 
 class Agent(db.Model):
     """AI Agent model for organization-specific automation"""
@@ -95,11 +210,11 @@ class Agent(db.Model):
     user_id = db.Column(db.String(100), nullable=False)  # Creator's Clerk user ID
     name = db.Column(db.String(255), nullable=False)
     description = db.Column(db.Text)
-    agent_type = db.Column(db.String(50), nullable=False)  # inventory_monitor, supplier_evaluator, demand_forecaster
-    configuration = db.Column(db.Text)  # JSON string with agent configuration
-    status = db.Column(db.String(50), default='active')  # active, paused, error
-    created_date = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_date = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    agent_type = db.Column(InternedString(50), nullable=False)  # inventory_monitor, supplier_evaluator, demand_forecaster
+    configuration = db.Column(JSONDocument)  # Agent configuration
+    status = db.Column(InternedString(50), default='active')  # active, paused, error
+    created_date = db.Column(db.DateTime, server_default=db.func.now())
+    updated_date = db.Column(db.DateTime, server_default=db.func.now(), onupdate=db.func.now())
     last_run = db.Column(db.DateTime)
     
     def to_dict(self):
@@ -110,20 +225,36 @@ class Agent(db.Model):
             'name': self.name,
             'description': self.description,
             'agent_type': self.agent_type,
-            'configuration': json.loads(self.configuration) if self.configuration else None,
+            'configuration': self.configuration,
             'status': self.status,
-            'created_date': self.created_date.isoformat() if self.created_date else None,
-            'updated_date': self.updated_date.isoformat() if self.updated_date else None,
-            'last_run': self.last_run.isoformat() if self.last_run else None
+            'created_date': _iso(self.created_date),
+            'updated_date': _iso(self.updated_date),
+            'last_run': _iso(self.last_run)
         }
 
+class OrgScopedMixin:
+    """Organization foreign key and relationship shared by org-scoped models.
+    
+    The Organization backref is named after the table and uses lazy='raise':
+    collections such as Organization.triangle_scores are never loaded
+    implicitly, so callers must eager-load them, e.g.
+    Organization.query.options(selectinload(Organization.triangle_scores)).
+    """
+    
+    @declared_attr
+    def org_id(cls):
+        return db.Column(db.String(100), db.ForeignKey('organizations.id'), nullable=False)
+    
+    @declared_attr
+    def organization(cls):
+        return db.relationship('Organization', backref=db.backref(cls.__tablename__, lazy='raise'))
+
 # Supply Chain Triangle Analytics Models
-class TriangleScore(db.Model):
+class TriangleScore(OrgScopedMixin, db.Model):
     __tablename__ = 'triangle_scores'
     
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    org_id = db.Column(db.String(100), db.ForeignKey('organizations.id'), nullable=False)
-    calculated_at = db.Column(db.DateTime, default=datetime.utcnow)
+    id = db.Column(db.Uuid, primary_key=True, default=uuid.uuid4)
+    calculated_at = db.Column(db.DateTime, server_default=db.func.now())
     
     # Triangle Vertex Scores (0-100)
     service_score = db.Column(db.Float, nullable=False)
@@ -134,14 +265,14 @@ class TriangleScore(db.Model):
     # Component Metrics (JSON)
     metrics = db.Column(db.Text)  # JSON string with detailed metrics
     
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    organization = db.relationship('Organization', backref=db.backref('triangle_scores', lazy=True))
+    created_at = db.Column(db.DateTime, server_default=db.func.now())
+    
+    __table_args__ = (db.Index('idx_triangle_scores_org_calculated', 'org_id', 'calculated_at'),)
 
-class ProductAnalytics(db.Model):
+class ProductAnalytics(OrgScopedMixin, db.Model):
     __tablename__ = 'product_analytics'
     
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    org_id = db.Column(db.String(100), db.ForeignKey('organizations.id'), nullable=False)
+    id = db.Column(db.Uuid, primary_key=True, default=uuid.uuid4)
     sku = db.Column(db.String(255), nullable=False)
     
     # Core Metrics
@@ -162,17 +293,18 @@ class ProductAnalytics(db.Model):
     safety_stock_days = db.Column(db.Integer, default=3)
     
     # Status
-    stock_status = db.Column(db.String(20))  # healthy, low_stock, stockout, excess
-    last_updated = db.Column(db.DateTime, default=datetime.utcnow)
+    stock_status = db.Column(InternedString(20))  # healthy, low_stock, stockout, excess
+    last_updated = db.Column(db.DateTime, server_default=db.func.now())
     
-    __table_args__ = (db.UniqueConstraint('org_id', 'sku'),)
-    organization = db.relationship('Organization', backref=db.backref('product_analytics', lazy=True))
+    __table_args__ = (
+        db.UniqueConstraint('org_id', 'sku'),
+        db.Index('idx_product_analytics_org_updated', 'org_id', 'last_updated'),
+    )
 
-class SupplierPerformance(db.Model):
+class SupplierPerformance(OrgScopedMixin, db.Model):
     __tablename__ = 'supplier_performance'
     
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    org_id = db.Column(db.String(100), db.ForeignKey('organizations.id'), nullable=False)
+    id = db.Column(db.Uuid, primary_key=True, default=uuid.uuid4)
     supplier_name = db.Column(db.String(255), nullable=False)
     
     # Performance Scores (0-100)
@@ -188,16 +320,17 @@ class SupplierPerformance(db.Model):
     price_variance = db.Column(db.Float, default=0)
     average_response_hours = db.Column(db.Integer, default=24)
     
-    last_evaluated = db.Column(db.DateTime, default=datetime.utcnow)
+    last_evaluated = db.Column(db.DateTime, server_default=db.func.now())
     
-    __table_args__ = (db.UniqueConstraint('org_id', 'supplier_name'),)
-    organization = db.relationship('Organization', backref=db.backref('supplier_performance', lazy=True))
+    __table_args__ = (
+        db.UniqueConstraint('org_id', 'supplier_name'),
+        db.Index('idx_supplier_performance_org_evaluated', 'org_id', 'last_evaluated'),
+    )
 
-class FinancialMetrics(db.Model):
+class FinancialMetrics(OrgScopedMixin, db.Model):
     __tablename__ = 'financial_metrics'
     
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    org_id = db.Column(db.String(100), db.ForeignKey('organizations.id'), nullable=False)
+    id = db.Column(db.Uuid, primary_key=True, default=uuid.uuid4)
     period_date = db.Column(db.Date, nullable=False)
     
     # Working Capital
@@ -217,54 +350,48 @@ class FinancialMetrics(db.Model):
     inventory_turnover = db.Column(db.Float, default=0)
     return_on_capital_employed = db.Column(db.Float, default=0)
     
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, server_default=db.func.now())
     
     __table_args__ = (db.UniqueConstraint('org_id', 'period_date'),)
-    organization = db.relationship('Organization', backref=db.backref('financial_metrics', lazy=True))
 
-class AlertRule(db.Model):
+class AlertRule(OrgScopedMixin, db.Model):
     __tablename__ = 'alert_rules'
     
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    org_id = db.Column(db.String(100), db.ForeignKey('organizations.id'), nullable=False)
-    alert_type = db.Column(db.String(50), nullable=False)
+    id = db.Column(db.Uuid, primary_key=True, default=uuid.uuid4)
+    alert_type = db.Column(InternedString(50), nullable=False)
     metric_name = db.Column(db.String(100), nullable=False)
-    condition = db.Column(db.String(20), nullable=False)  # greater_than, less_than, equals, between
+    condition = db.Column(InternedString(20), nullable=False)  # greater_than, less_than, equals, between
     threshold_value = db.Column(db.Float)
     threshold_min = db.Column(db.Float)
     threshold_max = db.Column(db.Float)
-    severity = db.Column(db.String(20), nullable=False)  # critical, high, medium, low
+    severity = db.Column(InternedString(20), nullable=False)  # critical, high, medium, low
     is_active = db.Column(db.Boolean, default=True)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    
-    organization = db.relationship('Organization', backref=db.backref('alert_rules', lazy=True))
+    created_at = db.Column(db.DateTime, server_default=db.func.now())
 
-class AlertInstance(db.Model):
+class AlertInstance(OrgScopedMixin, db.Model):
     __tablename__ = 'alert_instances'
     
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    org_id = db.Column(db.String(100), db.ForeignKey('organizations.id'), nullable=False)
-    alert_rule_id = db.Column(db.String(36), db.ForeignKey('alert_rules.id'))
+    id = db.Column(db.Uuid, primary_key=True, default=uuid.uuid4)
+    alert_rule_id = db.Column(db.Uuid, db.ForeignKey('alert_rules.id'))
     sku = db.Column(db.String(255))
     metric_value = db.Column(db.Float)
-    severity = db.Column(db.String(20))
-    status = db.Column(db.String(20), default='active')  # active, acknowledged, resolved
+    severity = db.Column(InternedString(20))
+    status = db.Column(InternedString(20), default='active')  # active, acknowledged, resolved
     message = db.Column(db.Text)
     action_required = db.Column(db.Text)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, server_default=db.func.now())
     acknowledged_at = db.Column(db.DateTime)
     resolved_at = db.Column(db.DateTime)
     
-    organization = db.relationship('Organization', backref=db.backref('alert_instances', lazy=True))
+    __table_args__ = (db.Index('idx_alert_instances_org_status_created', 'org_id', 'status', 'created_at'),)
     alert_rule = db.relationship('AlertRule', backref=db.backref('instances', lazy=True))
 
 # Trade Document Models
-class TradeDocument(db.Model):
+class TradeDocument(OrgScopedMixin, db.Model):
     __tablename__ = 'trade_documents'
     
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    org_id = db.Column(db.String(100), db.ForeignKey('organizations.id'), nullable=False)
-    document_type = db.Column(db.String(50), nullable=False)
+    document_type = db.Column(InternedString(50), nullable=False)
     document_number = db.Column(db.String(100))
     upload_id = db.Column(db.Integer, db.ForeignKey('uploads.id'))
     
@@ -277,17 +404,15 @@ class TradeDocument(db.Model):
     processed_at = db.Column(db.DateTime)
     
     # Status
-    status = db.Column(db.String(50))
+    status = db.Column(InternedString(50))
     validation_errors = db.Column(db.JSON)
     
-    organization = db.relationship('Organization', backref=db.backref('trade_documents', lazy=True))
     upload = db.relationship('Upload', backref=db.backref('trade_document', uselist=False))
 
-class DocumentAnalytics(db.Model):
+class DocumentAnalytics(OrgScopedMixin, db.Model):
     __tablename__ = 'document_analytics'
     
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    org_id = db.Column(db.String(100), db.ForeignKey('organizations.id'), nullable=False)
+    id = db.Column(db.Uuid, primary_key=True, default=uuid.uuid4)
     period_date = db.Column(db.Date, nullable=False)
     
     # Document metrics
@@ -306,13 +431,11 @@ class DocumentAnalytics(db.Model):
     rework_percentage = db.Column(db.Float, default=0)
     
     __table_args__ = (db.UniqueConstraint('org_id', 'period_date'),)
-    organization = db.relationship('Organization', backref=db.backref('document_analytics', lazy=True))
 
-class ShipmentTracking(db.Model):
+class ShipmentTracking(OrgScopedMixin, db.Model):
     __tablename__ = 'shipment_tracking'
     
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    org_id = db.Column(db.String(100), db.ForeignKey('organizations.id'), nullable=False)
+    id = db.Column(db.Uuid, primary_key=True, default=uuid.uuid4)
     shipment_number = db.Column(db.String(100), unique=True)
     
     # Document references
@@ -327,7 +450,5 @@ class ShipmentTracking(db.Model):
     actual_delivery_date = db.Column(db.Date)
     
     # Status tracking
-    current_status = db.Column(db.String(50))
-    milestone_data = db.Column(db.JSON)
-    
-    organization = db.relationship('Organization', backref=db.backref('shipment_tracking', lazy=True))
\ No newline at end of file
+    current_status = db.Column(InternedString(50))
+    milestone_data = db.Column(db.JSON)
\ No newline at end of file
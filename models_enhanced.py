@@ -3,27 +3,380 @@ Enhanced Data Models for Finkargo Data Moat Strategy
 These models extend the base models.py to create comprehensive market intelligence
 """
 
-from models import db
-from datetime import datetime
+from models import db, CodedString, CompressedJSON, JSONDocument, ScoreFloat, _json_dumps, uuid7, uuid7_many
+from datetime import date, datetime
+import io
+import logging
+import operator
 import uuid
-import json
-from typing import List, Dict
+from typing import Callable, Dict, Iterable, List, Optional
 import numpy as np
+import orjson
+import redis
+from sqlalchemy.types import TypeDecorator
+from config.settings import settings
+from utils import crypto
+from utils.cache import get_redis
+
+logger = logging.getLogger(__name__)
+
+# Domains of the coded columns below. Append only: codes are positions.
+TRADE_FINANCE_TRANSACTION_TYPES = ('LC', 'factoring', 'credit_insurance', 'trade_loan')
+PRICE_TRENDS = ('increasing', 'decreasing', 'stable')
+MARKETPLACE_TIERS = ('free', 'basic', 'premium', 'enterprise')
+FEEDBACK_STATUSES = ('new', 'in_review', 'actioned', 'closed')
+FEEDBACK_OPEN_STATUSES = ('new', 'in_review')
+FEEDBACK_PRIORITIES = ('low', 'medium', 'high', 'critical')
+INTEGRATION_STATUSES = ('active', 'paused', 'error', 'pending')
+QUALITY_TIERS = ('gold', 'silver', 'bronze')
+CUSTOMER_TYPES = ('importer', 'distributor', 'retailer', 'manufacturer')
+COMPANY_SIZES = ('small', 'medium', 'large', 'enterprise')
+REVENUE_RANGES = ('<1M', '1-10M', '10-50M', '50-100M', '>100M')
+FEEDBACK_TYPES = ('feature_request', 'bug_report', 'satisfaction', 'competitor_info', 'market_insight')
+FEEDBACK_SOURCES = ('in_app', 'email', 'support_ticket', 'sales_call')
+INTEGRATION_TYPES = ('erp', 'accounting', 'ecommerce', 'customs', 'logistics')
+UNIFIED_TRANSACTION_TYPES = ('SALE', 'PURCHASE', 'INVENTORY', 'DOCUMENT', 'INVOICE', 'SHIPMENT')
+INVENTORY_STATUSES = ('available', 'committed', 'in_transit', 'compromised', 'billed', 'received')
+COMPLIANCE_STATUSES = ('compliant', 'at_risk', 'violated', 'pending', 'in_progress')
+
+
+def _copy_text(value) -> str:
+    """Encode a value as a field of PostgreSQL's COPY text format"""
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        value = 't' if value else 'f'
+    elif isinstance(value, (dict, list)):
+        value = _json_dumps(value)
+    elif isinstance(value, (datetime, date)):
+        value = value.isoformat()
+    elif isinstance(value, bytes):
+        value = '\\x' + value.hex()
+    else:
+        value = str(value)
+    return (value.replace('\\', '\\\\').replace('\t', '\\t')
+                 .replace('\n', '\\n').replace('\r', '\\r'))
+
+
+# Cap on the values bound by one multi-row INSERT page. PostgreSQL's protocol allows
+# 65535 parameters per statement, and wide tables would otherwise build huge statements
+BULK_INSERT_MAX_PARAMETERS = 32_767
+
+# Redis set holding every cached intelligence lookup key, for invalidation
+INTELLIGENCE_CACHE_KEYS = 'intelligence:cache_keys'
+
+
+def _row_dict(record) -> Dict:
+    """Column values of a row in JSON-compatible form"""
+    row = {}
+    for column in record.__table__.c:
+        value = getattr(record, column.name)
+        if isinstance(value, (datetime, date)):
+            value = value.isoformat()
+        elif isinstance(value, uuid.UUID):
+            value = str(value)
+        row[column.name] = value
+    return row
+
+
+def cached_intelligence(key: str, compute: Callable[[], Optional[Dict]]) -> Optional[Dict]:
+    """Read-through Redis cache for results derived from the intelligence tables.
+    
+    compute() runs on a miss and its result is stored as JSON, so hits and
+    misses return the same JSON-compatible dict (dates as ISO strings). None is
+    not cached. Entries are dropped by invalidate_intelligence_cache(). Redis
+    errors are logged and the result is computed without the cache.
+    """
+    client = get_redis()
+    if client is not None:
+        try:
+            cached = client.get(key)
+            if cached is not None:
+                return orjson.loads(cached)
+        except redis.RedisError as e:
+            logger.warning(f"Intelligence cache read failed: {e}")
+            client = None
+    
+    result = compute()
+    if result is None:
+        return None
+    
+    payload = orjson.dumps(result, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    if client is not None:
+        try:
+            with client.pipeline() as pipe:
+                pipe.set(key, payload, ex=settings.MARKET_INTELLIGENCE_CACHE_TTL)
+                pipe.sadd(INTELLIGENCE_CACHE_KEYS, key)
+                pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Intelligence cache write failed: {e}")
+    return orjson.loads(payload)
+
+
+def _cached_lookup(model, key: str, **filters) -> Optional[Dict]:
+    """Single-row lookup through the intelligence cache; the row as a dict, or None"""
+    def lookup():
+        record = model.query.filter_by(**filters).first()
+        return None if record is None else _row_dict(record)
+    
+    return cached_intelligence(key, lookup)
+
+
+def invalidate_intelligence_cache():
+    """Drop every cached market/marketplace intelligence lookup"""
+    client = get_redis()
+    if client is None:
+        return
+    try:
+        keys = client.smembers(INTELLIGENCE_CACHE_KEYS)
+        client.delete(INTELLIGENCE_CACHE_KEYS, *keys)
+    except redis.RedisError as e:
+        logger.warning(f"Intelligence cache invalidation failed: {e}")
+
+
+class _LineReader(io.TextIOBase):
+    """Read-only text file over an iterator of lines, so COPY can pull rows as they are produced"""
+    
+    def __init__(self, lines):
+        self._lines = lines
+        self._pending = ''
+    
+    def readable(self):
+        return True
+    
+    def read(self, size=-1):
+        parts = [self._pending]
+        length = len(self._pending)
+        for line in self._lines:
+            parts.append(line)
+            length += len(line)
+            if 0 <= size <= length:
+                break
+        data = ''.join(parts)
+        if size < 0:
+            size = len(data)
+        self._pending = data[size:]
+        return data[:size]
+
+
+class BulkInsertMixin:
+    """Batched multi-row INSERTs for the high-volume ingest models.
+    
+    This is the ingestion API for these models: ETL and sync paths should
+    pass plain column dicts to bulk_insert()/copy_from() rather than adding
+    ORM objects one by one, which pays for a flush, identity-map entry and
+    attribute instrumentation per row.
+    """
+    
+    @classmethod
+    def column_values(cls, instance) -> Dict:
+        """The column attributes set on a transient instance, as a bulk_insert record.
+        
+        For pipelines that build instances to work on them in memory before
+        saving; unset columns are left out so their defaults still apply.
+        """
+        state = instance.__dict__
+        return {attr.key: state[attr.key] for attr in cls.__mapper__.column_attrs if attr.key in state}
+    
+    @classmethod
+    def bulk_insert_instances(cls, session, instances: List, page_size: int = 10_000) -> int:
+        """bulk_insert transient instances, which stay usable afterwards.
+        
+        Generated ids are set on the instances, and columns filled by server
+        defaults (created_at, updated_at) are read back with RETURNING, so
+        to_dict() on them shows the stored values without reloading anything.
+        """
+        if not instances:
+            return 0
+        
+        rows = cls._prepare_rows([cls.column_values(instance) for instance in instances])
+        returned = [column.key for column in cls.__table__.c if column.server_default is not None]
+        statement = db.insert(cls).returning(
+            *(getattr(cls, key) for key in returned), sort_by_parameter_order=True
+        )
+        result = cls._execute_pages(session, statement, rows, page_size)
+        
+        for instance, row, saved in zip(instances, rows, result):
+            if 'id' in row:
+                instance.id = row['id']
+            for key, value in zip(returned, saved):
+                setattr(instance, key, value)
+        return len(rows)
+    
+    @classmethod
+    def _prepare_rows(cls, records: List[Dict]) -> List[Dict]:
+        """Fill in primary keys (time-ordered UUIDs) for models keyed by a generated id"""
+        if 'id' not in cls.__table__.c:
+            return records
+        return [{'id': key, **record} for key, record in zip(uuid7_many(len(records)), records)]
+    
+    @classmethod
+    def bulk_insert(cls, session, records: List[Dict], page_size: int = 10_000) -> int:
+        """Insert column dicts in as few round trips as possible.
+        
+        Primary keys are filled in up front and timestamps come from server
+        defaults, so rows with the same keys are sent as multi-row
+        INSERT ... VALUES pages instead of one statement per row. Pages hold
+        at most page_size rows and BULK_INSERT_MAX_PARAMETERS values, so wide
+        rows get proportionally shorter pages. Returns the number of rows.
+        """
+        return len(cls.bulk_insert_returning(session, records, page_size))
+    
+    @classmethod
+    def bulk_insert_returning(cls, session, records: List[Dict], page_size: int = 10_000) -> List:
+        """Insert like bulk_insert and return the new rows' ids, in record order.
+        
+        The ids are generated (or, for models with a natural key such as
+        UnifiedTransaction.transaction_id, supplied by the caller) before the
+        INSERT, so no RETURNING clause, flush or refresh is needed to learn them.
+        """
+        if not records:
+            return []
+        
+        rows = cls._prepare_rows(records)
+        cls._execute_pages(session, cls._insert_statement(), rows, page_size)
+        key = 'id' if 'id' in cls.__table__.c else cls.__mapper__.primary_key[0].key
+        return [row[key] for row in rows]
+    
+    @classmethod
+    def _execute_pages(cls, session, statement, rows: List[Dict], page_size: int):
+        """Execute an INSERT over rows in pages of at most page_size rows and
+        BULK_INSERT_MAX_PARAMETERS values"""
+        width = max(map(len, rows)) or 1
+        page_rows = max(1, min(page_size, BULK_INSERT_MAX_PARAMETERS // width))
+        return session.execute(
+            statement,
+            rows,
+            execution_options={'insertmanyvalues_page_size': page_rows}
+        )
+    
+    @classmethod
+    def _insert_statement(cls):
+        """The model's INSERT, built once so every batch hits the same compiled-cache entry"""
+        statement = cls.__dict__.get('_bulk_insert_statement')
+        if statement is None:
+            statement = cls._bulk_insert_statement = db.insert(cls)
+        return statement
+    
+    @classmethod
+    def copy_from(cls, session, records: Iterable[Dict], columns: Optional[List[str]] = None) -> int:
+        """Stream column dicts into the table with a single COPY ... FROM STDIN.
+        
+        Runs inside the session's current transaction. Columns missing from a
+        record get their scalar default (e.g. currency) or NULL; columns no
+        record sets are left to their server defaults. Without ``columns`` the
+        records are read up front to find the columns they set; with it,
+        records may be any iterable (e.g. a generator over an API's result
+        pages) and rows are encoded and sent as they are consumed, so a large
+        sync never holds the whole batch in memory. Falls back to bulk_insert
+        on databases other than PostgreSQL.
+        """
+        connection = session.connection()
+        if connection.dialect.name != 'postgresql':
+            return cls.bulk_insert(session, list(records))
+        
+        if columns is None:
+            records = list(records)
+            if not records:
+                return 0
+            columns = set().union(*records)
+        provided = set(columns) | {'id'}
+        defaults = {
+            column.name: column.default.arg
+            for column in cls.__table__.c
+            if column.default is not None and column.default.is_scalar
+        }
+        table_columns = [column for column in cls.__table__.c if column.name in provided or column.name in defaults]
+        # Custom column types (coded strings, compressed JSON) convert values
+        # as for INSERT; _copy_text encodes the rest
+        processors = [
+            column.type.process_bind_param if isinstance(column.type, TypeDecorator) else None
+            for column in table_columns
+        ]
+        keys = iter(uuid7_many(len(records))) if isinstance(records, list) else iter(uuid7, None)
+        count = 0
+        
+        def lines():
+            nonlocal count
+            for record in records:
+                fields = []
+                for column, processor in zip(table_columns, processors):
+                    if column.name == 'id' and record.get('id') is None:
+                        value = next(keys)
+                    else:
+                        value = record.get(column.name, defaults.get(column.name))
+                    if processor is not None and value is not None:
+                        value = processor(value, connection.dialect)
+                    fields.append(_copy_text(value))
+                count += 1
+                yield '\t'.join(fields) + '\n'
+        
+        column_list = ', '.join(column.name for column in table_columns)
+        with connection.connection.cursor() as cursor:
+            cursor.copy_expert(f"COPY {cls.__tablename__} ({column_list}) FROM STDIN", _LineReader(lines()))
+        return count
+
+
+def _market_columns(market_data: List, *names: str) -> np.ndarray:
+    """Read the named numeric attributes of every record in one pass.
+    
+    Returns a (len(names), len(market_data)) float array, so each row unpacks
+    to one column; missing (None) values are NaN.
+    """
+    values = np.array([[getattr(record, name) for name in names] for record in market_data], dtype=np.float64)
+    return values.reshape(len(market_data), len(names)).T
+
+
+# Completeness points for demand, growth rate, unit price, suppliers, lead time and risk score
+_COMPLETENESS_WEIGHTS = np.array([20, 15, 15, 15, 15, 20], dtype=np.float64)
+
+
+def _is_truthy(values: np.ndarray) -> np.ndarray:
+    """Elementwise ``bool(value)`` for a column from _market_columns (NaN is falsy)"""
+    return (values != 0) & ~np.isnan(values)
+
+
+def _nonzero(values: np.ndarray) -> np.ndarray:
+    """Mark zeros as missing, matching ``[v for v in values if v]`` before a nanmean"""
+    return np.where(values == 0, np.nan, values)
+
+
+# Compliance status -> score; any other status counts as 0
+_COMPLIANCE_POINTS = {'compliant': 1.0, 'at_risk': 0.5}
+
+
+def _compliance_points(status) -> float:
+    """Score a document's compliance_status"""
+    return _COMPLIANCE_POINTS.get(status, 0.0)
+
+
+def _document_column(document_results: List[Dict], key: str, convert=float) -> np.ndarray:
+    """One float per document result for key, NaN where the result lacks the key"""
+    return np.fromiter(
+        (convert(doc[key]) if key in doc else np.nan for doc in document_results),
+        dtype=np.float64, count=len(document_results)
+    )
+
+
+def _any_present(values: np.ndarray) -> bool:
+    """Whether any document result had the column's key"""
+    return not np.isnan(values).all()
+
 
 # Phase 1: Enhanced Data Capture Models
 
-class TradeFinanceTransaction(db.Model):
+class TradeFinanceTransaction(BulkInsertMixin, db.Model):
     """Captures detailed trade finance transactions for intelligence extraction"""
     __tablename__ = 'trade_finance_transactions'
     
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = db.Column(db.Uuid, primary_key=True, default=uuid7)
     org_id = db.Column(db.String(100), db.ForeignKey('organizations.id'), nullable=False)
     
     # Transaction Details
-    transaction_type = db.Column(db.String(50))  # LC, factoring, credit_insurance, trade_loan
+    transaction_type = db.Column(CodedString(TRADE_FINANCE_TRANSACTION_TYPES))
     amount_usd = db.Column(db.Float, nullable=False)
     currency = db.Column(db.String(3), default='USD')
-    transaction_date = db.Column(db.Date, nullable=False)
+    transaction_date = db.Column(db.Date, primary_key=True)  # Partition key, so part of the primary key
     completion_date = db.Column(db.Date)
     
     # Parties
@@ -46,14 +399,14 @@ class TradeFinanceTransaction(db.Model):
     financing_rate = db.Column(db.Float)
     
     # Risk Metrics
-    country_risk_score = db.Column(db.Float)
-    supplier_risk_score = db.Column(db.Float)
-    transaction_risk_score = db.Column(db.Float)
-    currency_risk_score = db.Column(db.Float)
+    country_risk_score = db.Column(ScoreFloat)
+    supplier_risk_score = db.Column(ScoreFloat)
+    transaction_risk_score = db.Column(ScoreFloat)
+    currency_risk_score = db.Column(ScoreFloat)
     
     # Market Intelligence
-    market_demand_score = db.Column(db.Float)  # Based on other importers
-    competitive_pricing_score = db.Column(db.Float)
+    market_demand_score = db.Column(ScoreFloat)  # Based on other importers
+    competitive_pricing_score = db.Column(ScoreFloat)
     supplier_market_share = db.Column(db.Float)
     
     # Financial Impact
@@ -61,97 +414,123 @@ class TradeFinanceTransaction(db.Model):
     cash_conversion_days = db.Column(db.Integer)
     financing_cost = db.Column(db.Float)
     
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = db.Column(db.DateTime, server_default=db.func.now())
+    updated_at = db.Column(db.DateTime, server_default=db.func.now(), onupdate=db.func.now())
     
     # Relationships
-    organization = db.relationship('Organization', backref=db.backref('trade_finance_transactions', lazy=True))
+    organization = db.relationship('Organization', backref=db.backref('trade_finance_transactions', lazy='raise'))
+    
+    __table_args__ = (
+        # Per-org history, newest first
+        db.Index('idx_trade_finance_transactions_org_date', 'org_id', 'transaction_date'),
+        # Monthly market aggregation: one category and region over a date range
+        db.Index('idx_trade_finance_transactions_scope_date', 'product_category', 'supplier_region', 'transaction_date'),
+        # Monthly partitions are created by the Supabase migrations
+        {'postgresql_partition_by': 'RANGE (transaction_date)'},
+    )
+    
+    # Columns exposed by to_dict() and rows_as_json(), in output order
+    LIST_FIELDS = (
+        'id', 'org_id', 'transaction_type', 'amount_usd', 'currency',
+        'transaction_date', 'supplier_name', 'supplier_country',
+        'product_category', 'hs_code', 'payment_terms_days',
+        'transaction_risk_score', 'market_demand_score'
+    )
+    _list_values = operator.attrgetter(*LIST_FIELDS)
+    
+    @classmethod
+    def rows_as_json(cls, *criteria, order_by=None) -> bytes:
+        """Serialize the matching transactions to a JSON array without loading ORM objects.
+        
+        Produces the same objects as to_dict(), but selects only LIST_FIELDS and
+        hands the rows straight to orjson, which encodes UUIDs and dates natively.
+        """
+        columns = [getattr(cls, field) for field in cls.LIST_FIELDS]
+        query = db.select(*columns).where(*criteria)
+        if order_by is not None:
+            query = query.order_by(order_by)
+        rows = db.session.execute(query)
+        return orjson.dumps([dict(zip(cls.LIST_FIELDS, row)) for row in rows])
     
     def to_dict(self):
-        return {
-            'id': self.id,
-            'org_id': self.org_id,
-            'transaction_type': self.transaction_type,
-            'amount_usd': self.amount_usd,
-            'currency': self.currency,
-            'transaction_date': self.transaction_date.isoformat() if self.transaction_date else None,
-            'supplier_name': self.supplier_name,
-            'supplier_country': self.supplier_country,
-            'product_category': self.product_category,
-            'hs_code': self.hs_code,
-            'payment_terms_days': self.payment_terms_days,
-            'transaction_risk_score': self.transaction_risk_score,
-            'market_demand_score': self.market_demand_score
-        }
+        data = dict(zip(self.LIST_FIELDS, self._list_values(self)))
+        if data['transaction_date']:
+            data['transaction_date'] = data['transaction_date'].isoformat()
+        return data
 
 
-class CustomerIntelligence(db.Model):
+class CustomerIntelligence(BulkInsertMixin, db.Model):
     """Deep customer profiling for understanding needs and predicting behavior"""
     __tablename__ = 'customer_intelligence'
     
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = db.Column(db.Uuid, primary_key=True, default=uuid7)
     org_id = db.Column(db.String(100), db.ForeignKey('organizations.id'), nullable=False)
     
     # Customer Profile
-    customer_type = db.Column(db.String(50))  # importer, distributor, retailer, manufacturer
+    customer_type = db.Column(CodedString(CUSTOMER_TYPES))
     industry_sector = db.Column(db.String(100))
-    company_size = db.Column(db.String(50))  # small, medium, large, enterprise
+    company_size = db.Column(CodedString(COMPANY_SIZES))
     geographic_market = db.Column(db.String(100))
     years_in_business = db.Column(db.Integer)
     
     # Business Intelligence
-    annual_revenue_range = db.Column(db.String(50))  # <1M, 1-10M, 10-50M, 50-100M, >100M
+    annual_revenue_range = db.Column(CodedString(REVENUE_RANGES))
     credit_rating = db.Column(db.String(10))
-    payment_history_score = db.Column(db.Float)
-    financial_health_score = db.Column(db.Float)
+    payment_history_score = db.Column(ScoreFloat)
+    financial_health_score = db.Column(ScoreFloat)
     
     # Supply Chain Intelligence
-    preferred_suppliers = db.Column(db.JSON)  # List of supplier names and countries
+    preferred_suppliers = db.Column(JSONDocument)  # List of supplier names and countries
     typical_order_size = db.Column(db.Float)
     order_frequency_days = db.Column(db.Integer)
-    seasonal_patterns = db.Column(db.JSON)  # Monthly demand patterns
-    product_preferences = db.Column(db.JSON)  # Categories and subcategories
+    seasonal_patterns = db.Column(JSONDocument)  # Monthly demand patterns
+    product_preferences = db.Column(JSONDocument)  # Categories and subcategories
     
     # Behavioral Intelligence
-    platform_engagement_score = db.Column(db.Float)  # How actively they use the platform
-    feature_usage_pattern = db.Column(db.JSON)  # Which features they use most
+    platform_engagement_score = db.Column(ScoreFloat)  # How actively they use the platform
+    feature_usage_pattern = db.Column(JSONDocument)  # Which features they use most
     data_quality_contribution = db.Column(db.Float)  # How good their data is
     
     # Feedback & Satisfaction
-    satisfaction_score = db.Column(db.Float)
+    satisfaction_score = db.Column(ScoreFloat)
     net_promoter_score = db.Column(db.Integer)
-    pain_points = db.Column(db.JSON)
-    feature_requests = db.Column(db.JSON)
+    pain_points = db.Column(JSONDocument)
+    feature_requests = db.Column(JSONDocument)
     
     # Market Intelligence
-    competitors_used = db.Column(db.JSON)  # Other platforms/solutions they use
+    competitors_used = db.Column(JSONDocument)  # Other platforms/solutions they use
     market_share_estimate = db.Column(db.Float)
     growth_rate = db.Column(db.Float)
     
     # Predictive Scores
-    churn_risk_score = db.Column(db.Float)
-    upsell_potential_score = db.Column(db.Float)
+    churn_risk_score = db.Column(ScoreFloat)
+    upsell_potential_score = db.Column(ScoreFloat)
     lifetime_value_estimate = db.Column(db.Float)
     
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = db.Column(db.DateTime, server_default=db.func.now())
+    updated_at = db.Column(db.DateTime, server_default=db.func.now(), onupdate=db.func.now())
     
     # Relationships
-    organization = db.relationship('Organization', backref=db.backref('customer_intelligence', lazy=True))
+    organization = db.relationship('Organization', backref=db.backref('customer_intelligence', lazy='raise'))
+    
+    __table_args__ = (
+        db.Index('idx_customer_intelligence_preferred_suppliers_gin', 'preferred_suppliers', postgresql_using='gin'),
+        db.Index('idx_customer_intelligence_pain_points_gin', 'pain_points', postgresql_using='gin'),
+    )
 
 
-class MarketIntelligence(db.Model):
+class MarketIntelligence(BulkInsertMixin, db.Model):
     """Aggregated market data for specific product categories and regions"""
     __tablename__ = 'market_intelligence'
     
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = db.Column(db.Uuid, primary_key=True, default=uuid7)
     
     # Market Scope
     product_category = db.Column(db.String(100), nullable=False)
     product_subcategory = db.Column(db.String(100))
     geographic_region = db.Column(db.String(100), nullable=False)
     country = db.Column(db.String(100))
-    time_period = db.Column(db.Date, nullable=False)
+    time_period = db.Column(db.Date, primary_key=True)  # Partition key, so part of the primary key
     
     # Demand Intelligence
     total_market_demand = db.Column(db.Float)  # In units or USD
@@ -169,48 +548,86 @@ class MarketIntelligence(db.Model):
     # Pricing Intelligence
     average_unit_price = db.Column(db.Float)
     price_volatility = db.Column(db.Float)
-    price_trend = db.Column(db.String(20))  # increasing, decreasing, stable
+    price_trend = db.Column(CodedString(PRICE_TRENDS))
     price_elasticity = db.Column(db.Float)  # Demand sensitivity to price
     
     # Quality Metrics
-    average_quality_score = db.Column(db.Float)
+    average_quality_score = db.Column(ScoreFloat)
     defect_rate = db.Column(db.Float)
     return_rate = db.Column(db.Float)
     
     # Competitive Intelligence
-    top_importers = db.Column(db.JSON)  # List of anonymized importer profiles
-    market_share_distribution = db.Column(db.JSON)  # Distribution of market share
+    top_importers = db.Column(JSONDocument)  # List of anonymized importer profiles
+    market_share_distribution = db.Column(JSONDocument)  # Distribution of market share
     new_entrants = db.Column(db.Integer)  # New importers this period
     
     # Risk Intelligence
-    supply_chain_risk_score = db.Column(db.Float)
-    currency_risk_score = db.Column(db.Float)
-    political_risk_score = db.Column(db.Float)
-    logistics_risk_score = db.Column(db.Float)
+    supply_chain_risk_score = db.Column(ScoreFloat)
+    currency_risk_score = db.Column(ScoreFloat)
+    political_risk_score = db.Column(ScoreFloat)
+    logistics_risk_score = db.Column(ScoreFloat)
     
     # Data Quality
     data_points_count = db.Column(db.Integer)  # Number of transactions analyzed
-    confidence_score = db.Column(db.Float)  # Statistical confidence
+    confidence_score = db.Column(ScoreFloat)  # Statistical confidence
     
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = db.Column(db.DateTime, server_default=db.func.now())
+    updated_at = db.Column(db.DateTime, server_default=db.func.now(), onupdate=db.func.now())
     
     __table_args__ = (
-        db.UniqueConstraint('product_category', 'geographic_region', 'time_period', 'country'),
+        db.UniqueConstraint('time_period', 'product_category', 'geographic_region', 'country'),
+        # Trend reads: one category and region over a range of periods
+        db.Index('idx_market_intelligence_scope_period', 'product_category', 'geographic_region', 'time_period'),
+        # Region dashboards: filter by region, order by period, index-only aggregates
+        db.Index('idx_market_intelligence_region_period', 'geographic_region', 'time_period', 'product_category',
+                 postgresql_include=['average_unit_price', 'total_market_demand', 'demand_growth_rate']),
+        # Monthly partitions are created by the Supabase migrations
+        {'postgresql_partition_by': 'RANGE (time_period)'},
     )
+    
+    # Columns read by the market moat analyses
+    ANALYSIS_FIELDS = (
+        'product_category', 'geographic_region', 'total_market_demand',
+        'demand_growth_rate', 'average_unit_price', 'price_volatility',
+        'total_suppliers', 'new_entrants', 'average_lead_time',
+        'supply_chain_risk_score', 'data_points_count', 'confidence_score'
+    )
+    
+    @classmethod
+    def analysis_rows(cls, *criteria) -> List:
+        """Load ANALYSIS_FIELDS of the matching markets as plain result rows.
+        
+        Rows support the same attribute access as instances, but skip the
+        identity map and change tracking, which read-only analyses never use.
+        """
+        columns = [getattr(cls, field) for field in cls.ANALYSIS_FIELDS]
+        return db.session.execute(db.select(*columns).where(*criteria)).all()
+    
+    @classmethod
+    def get_cached(cls, product_category: str, geographic_region: str,
+                   time_period: date, country: Optional[str] = None) -> Optional[Dict]:
+        """Look up one market scope, served from Redis when cached"""
+        key = f"mi:{product_category}:{geographic_region}:{time_period.isoformat()}:{country or ''}"
+        return _cached_lookup(
+            cls, key,
+            product_category=product_category,
+            geographic_region=geographic_region,
+            time_period=time_period,
+            country=country
+        )
 
 
-class MarketplaceIntelligence(db.Model):
+class MarketplaceIntelligence(BulkInsertMixin, db.Model):
     """Anonymized and aggregated data for the marketplace"""
     __tablename__ = 'marketplace_intelligence'
     
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = db.Column(db.Uuid, primary_key=True, default=uuid7)
     
     # Market Scope
     intelligence_type = db.Column(db.String(50))  # demand, supply, pricing, risk
     product_category = db.Column(db.String(100), nullable=False)
     geographic_region = db.Column(db.String(100), nullable=False)
-    time_period = db.Column(db.Date, nullable=False)
+    time_period = db.Column(db.Date, primary_key=True)  # Partition key, so part of the primary key
     
     # Aggregated Intelligence
     total_transaction_volume = db.Column(db.Float)
@@ -218,105 +635,257 @@ class MarketplaceIntelligence(db.Model):
     average_order_size = db.Column(db.Float)
     
     # Performance Benchmarks
-    top_quartile_metrics = db.Column(db.JSON)  # Best performers
-    median_metrics = db.Column(db.JSON)  # Average performers
-    bottom_quartile_metrics = db.Column(db.JSON)  # Poor performers
+    top_quartile_metrics = db.Column(JSONDocument)  # Best performers
+    median_metrics = db.Column(JSONDocument)  # Average performers
+    bottom_quartile_metrics = db.Column(JSONDocument)  # Poor performers
     
     # Supplier Intelligence (Anonymized)
-    supplier_performance_scores = db.Column(db.JSON)  # Aggregated scores by country/region
+    supplier_performance_scores = db.Column(CompressedJSON)  # Aggregated scores by country/region
     supplier_reliability_index = db.Column(db.Float)
-    supplier_diversity_score = db.Column(db.Float)
+    supplier_diversity_score = db.Column(ScoreFloat)
     
     # Market Trends
-    demand_trends = db.Column(db.JSON)  # Historical and projected
-    pricing_trends = db.Column(db.JSON)
-    supply_chain_trends = db.Column(db.JSON)
+    demand_trends = db.Column(CompressedJSON)  # Historical and projected
+    pricing_trends = db.Column(CompressedJSON)
+    supply_chain_trends = db.Column(CompressedJSON)
     
     # Predictive Intelligence
-    demand_forecast = db.Column(db.JSON)  # Next 3, 6, 12 months
-    price_forecast = db.Column(db.JSON)
-    risk_forecast = db.Column(db.JSON)
+    demand_forecast = db.Column(CompressedJSON)  # Next 3, 6, 12 months
+    price_forecast = db.Column(CompressedJSON)
+    risk_forecast = db.Column(CompressedJSON)
     
     # Competitive Landscape
     market_concentration = db.Column(db.Float)
     competitive_intensity = db.Column(db.Float)
-    market_maturity_score = db.Column(db.Float)
+    market_maturity_score = db.Column(ScoreFloat)
     
     # Data Quality
-    confidence_score = db.Column(db.Float)
+    confidence_score = db.Column(ScoreFloat)
     data_points_count = db.Column(db.Integer)
-    last_updated = db.Column(db.DateTime, default=datetime.utcnow)
+    last_updated = db.Column(db.DateTime, server_default=db.func.now())
     
     # Monetization
-    tier_required = db.Column(db.String(20))  # free, basic, premium, enterprise
+    tier_required = db.Column(CodedString(MARKETPLACE_TIERS))
     
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, server_default=db.func.now())
     
     __table_args__ = (
-        db.UniqueConstraint('intelligence_type', 'product_category', 'geographic_region', 'time_period'),
+        db.UniqueConstraint('time_period', 'intelligence_type', 'product_category', 'geographic_region'),
+        # Region dashboards: filter by region, order by period, index-only aggregates
+        db.Index('idx_marketplace_intelligence_region_period', 'geographic_region', 'time_period', 'intelligence_type',
+                 postgresql_include=['total_transaction_volume', 'transaction_count']),
+        # Monthly partitions are created by the Supabase migrations
+        {'postgresql_partition_by': 'RANGE (time_period)'},
     )
+    
+    @classmethod
+    def get_cached(cls, intelligence_type: str, product_category: str,
+                   geographic_region: str, time_period: date) -> Optional[Dict]:
+        """Look up one marketplace slice, served from Redis when cached"""
+        key = f"mpi:{intelligence_type}:{product_category}:{geographic_region}:{time_period.isoformat()}"
+        return _cached_lookup(
+            cls, key,
+            intelligence_type=intelligence_type,
+            product_category=product_category,
+            geographic_region=geographic_region,
+            time_period=time_period
+        )
+
+
+class MarketplaceTransactionAggregate(db.Model):
+    """Monthly trade finance aggregates per product category and supplier region.
+    
+    Read-only mapping of the ``marketplace_transaction_aggregates`` materialized
+    view (PostgreSQL only). The table lives in its own MetaData so that
+    ``db.create_all()`` never creates it.
+    """
+    __table__ = db.Table(
+        'marketplace_transaction_aggregates',
+        db.MetaData(),
+        db.Column('product_category', db.String(100), primary_key=True),
+        db.Column('supplier_region', db.String(100), primary_key=True),
+        db.Column('time_period', db.Date, primary_key=True),
+        db.Column('transaction_count', db.Integer),
+        db.Column('total_volume', db.Float),
+        db.Column('average_transaction', db.Float),
+        db.Column('amount_stddev', db.Float),
+        db.Column('average_lead_time', db.Float),
+        db.Column('average_risk_score', ScoreFloat),
+        db.Column('unique_suppliers', db.Integer),
+        db.Column('unique_importers', db.Integer),
+        info={'is_view': True},
+    )
+    
+    @classmethod
+    def refresh(cls, session):
+        """Recompute the view without blocking concurrent readers"""
+        session.execute(db.text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {cls.__table__.name}"))
+
+
+class TradeFinanceScores(db.Model):
+    """Narrow copy of the risk and market scores of each trade finance transaction.
+    
+    Score aggregations only need a handful of floats per row; scanning this
+    table instead of the wide ``trade_finance_transactions`` rows reads a
+    fraction of the pages. Rows are written by a trigger on
+    ``trade_finance_transactions`` (PostgreSQL only), so the table lives in its
+    own MetaData and ``db.create_all()`` never creates it.
+    """
+    __table__ = db.Table(
+        'trade_finance_scores',
+        db.MetaData(),
+        db.Column('id', db.Uuid, primary_key=True),
+        db.Column('org_id', db.String(100), nullable=False),
+        db.Column('transaction_date', db.Date, nullable=False),
+        db.Column('product_category', db.String(100)),
+        db.Column('supplier_region', db.String(100)),
+        db.Column('country_risk_score', ScoreFloat),
+        db.Column('supplier_risk_score', ScoreFloat),
+        db.Column('transaction_risk_score', ScoreFloat),
+        db.Column('currency_risk_score', ScoreFloat),
+        db.Column('market_demand_score', ScoreFloat),
+        info={'is_trigger_maintained': True},
+    )
+    
+    @classmethod
+    def category_region_averages(cls, start_date: date, end_date: date) -> Dict:
+        """Average country and currency risk per (category, region) between two dates.
+        
+        Zero scores count as missing, as in the other risk score averages.
+        """
+        rows = db.session.execute(
+            db.select(
+                cls.product_category,
+                cls.supplier_region,
+                db.func.avg(db.func.nullif(cls.country_risk_score, 0)).label('average_country_risk'),
+                db.func.avg(db.func.nullif(cls.currency_risk_score, 0)).label('average_currency_risk'),
+            )
+            .where(cls.transaction_date >= start_date, cls.transaction_date <= end_date)
+            .group_by(cls.product_category, cls.supplier_region)
+        )
+        return {
+            (row.product_category, row.supplier_region): {
+                'average_country_risk': row.average_country_risk,
+                'average_currency_risk': row.average_currency_risk,
+            }
+            for row in rows
+        }
 
 
 # Phase 2: Enhanced Collection Models
 
-class FeedbackCollection(db.Model):
+class FeedbackCollection(BulkInsertMixin, db.Model):
     """Systematic collection of customer feedback for intelligence extraction"""
     __tablename__ = 'feedback_collection'
     
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = db.Column(db.Uuid, primary_key=True, default=uuid7)
     org_id = db.Column(db.String(100), db.ForeignKey('organizations.id'), nullable=False)
     user_id = db.Column(db.String(100), nullable=False)
     
     # Feedback Types
-    feedback_type = db.Column(db.String(50))  # feature_request, bug_report, satisfaction, competitor_info, market_insight
+    feedback_type = db.Column(CodedString(FEEDBACK_TYPES))
     feedback_text = db.Column(db.Text)
-    feedback_source = db.Column(db.String(50))  # in_app, email, support_ticket, sales_call
+    feedback_source = db.Column(CodedString(FEEDBACK_SOURCES))
     
     # Sentiment Analysis
-    sentiment_score = db.Column(db.Float)  # -1 to 1
-    emotion_tags = db.Column(db.JSON)  # frustrated, satisfied, excited, etc.
-    urgency_score = db.Column(db.Float)
+    sentiment_score = db.Column(ScoreFloat)  # -1 to 1
+    emotion_tags = db.Column(JSONDocument)  # frustrated, satisfied, excited, etc.
+    urgency_score = db.Column(ScoreFloat)
     
     # Intelligence Extraction
-    key_topics = db.Column(db.JSON)  # Extracted topics using NLP
-    entities_mentioned = db.Column(db.JSON)  # Companies, products, features
-    action_items = db.Column(db.JSON)  # Identified actions
+    key_topics = db.Column(JSONDocument)  # Extracted topics using NLP
+    entities_mentioned = db.Column(JSONDocument)  # Companies, products, features
+    action_items = db.Column(JSONDocument)  # Identified actions
     
     # Business Intelligence
-    pain_points = db.Column(db.JSON)
-    competitor_mentions = db.Column(db.JSON)  # Competitors and what's mentioned
-    feature_requests = db.Column(db.JSON)
-    pricing_feedback = db.Column(db.JSON)
+    pain_points = db.Column(JSONDocument)
+    competitor_mentions = db.Column(JSONDocument)  # Competitors and what's mentioned
+    feature_requests = db.Column(JSONDocument)
+    pricing_feedback = db.Column(JSONDocument)
     
     # Follow-up
-    status = db.Column(db.String(50))  # new, in_review, actioned, closed
-    priority = db.Column(db.String(20))  # low, medium, high, critical
+    status = db.Column(CodedString(FEEDBACK_STATUSES))
+    priority = db.Column(CodedString(FEEDBACK_PRIORITIES))
     assigned_to = db.Column(db.String(100))
     resolution = db.Column(db.Text)
     
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = db.Column(db.DateTime, server_default=db.func.now())
+    updated_at = db.Column(db.DateTime, server_default=db.func.now(), onupdate=db.func.now())
     
     # Relationships
-    organization = db.relationship('Organization', backref=db.backref('feedback_collection', lazy=True))
+    organization = db.relationship('Organization', backref=db.backref('feedback_collection', lazy='raise'))
+    
+    __table_args__ = (
+        db.Index('idx_feedback_collection_key_topics_gin', 'key_topics', postgresql_using='gin'),
+        db.Index('idx_feedback_collection_entities_mentioned_gin', 'entities_mentioned', postgresql_using='gin'),
+        db.Index('idx_feedback_collection_competitor_mentions_gin', 'competitor_mentions', postgresql_using='gin'),
+        db.Index('idx_feedback_collection_org_created', 'org_id', 'created_at'),
+        # Triage queue: only open feedback is indexed, so the index stays small
+        db.Index('idx_feedback_collection_open_queue', priority.desc(), created_at,
+                 postgresql_where=status.in_(FEEDBACK_OPEN_STATUSES),
+                 sqlite_where=status.in_(FEEDBACK_OPEN_STATUSES)),
+    )
+    
+    @classmethod
+    def open_queue(cls):
+        """Open feedback, most urgent and then oldest first"""
+        return cls.query.filter(cls.status.in_(FEEDBACK_OPEN_STATUSES)).order_by(
+            cls.priority.desc(), cls.created_at
+        )
+    
+    # Fields an enrichment analyzer may fill in from feedback_text
+    ENRICHMENT_FIELDS = (
+        'sentiment_score', 'emotion_tags', 'urgency_score',
+        'key_topics', 'entities_mentioned', 'action_items'
+    )
+    
+    @classmethod
+    def enrich_batch(cls, session, analyze: Callable[[List[str]], List[Dict]], batch_size: int = 256) -> int:
+        """Run NLP enrichment over the next batch of unprocessed feedback.
+        
+        Feedback is unprocessed while sentiment_score is NULL. analyze receives
+        the batch's texts in one call, so a batched model pipeline can score them
+        together, and returns one dict of ENRICHMENT_FIELDS per text (it must set
+        sentiment_score). The results are written back with a single bulk UPDATE
+        by primary key. Returns the number of rows enriched; 0 means done.
+        """
+        rows = session.execute(
+            db.select(cls.id, cls.feedback_text)
+            .where(cls.sentiment_score.is_(None), cls.feedback_text.isnot(None))
+            .order_by(cls.created_at)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            return 0
+        
+        results = analyze([row.feedback_text for row in rows])
+        if len(results) != len(rows):
+            raise ValueError(f"analyze returned {len(results)} results for {len(rows)} texts")
+        
+        updates = [
+            {'id': row.id, **{field: result[field] for field in cls.ENRICHMENT_FIELDS if field in result}}
+            for row, result in zip(rows, results)
+        ]
+        session.execute(db.update(cls), updates)
+        return len(updates)
 
 
-class APIIntegration(db.Model):
+class APIIntegration(BulkInsertMixin, db.Model):
     """Track and manage API integrations for continuous data collection"""
     __tablename__ = 'api_integrations'
     
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = db.Column(db.Uuid, primary_key=True, default=uuid7)
     org_id = db.Column(db.String(100), db.ForeignKey('organizations.id'), nullable=False)
     
     # Integration Details
-    integration_type = db.Column(db.String(50))  # erp, accounting, ecommerce, customs, logistics
+    integration_type = db.Column(CodedString(INTEGRATION_TYPES))
     provider_name = db.Column(db.String(100))  # SAP, QuickBooks, Shopify, etc.
     api_endpoint = db.Column(db.String(255))
     api_version = db.Column(db.String(20))
     
     # Authentication
     auth_type = db.Column(db.String(50))  # oauth2, api_key, basic
-    credentials_encrypted = db.Column(db.Text)  # Encrypted credentials
+    credentials_encrypted = db.Column(db.LargeBinary)  # AES-GCM nonce || ciphertext, see set_credentials()
     
     # Data Flow
     sync_frequency = db.Column(db.String(20))  # real_time, hourly, daily, weekly
@@ -325,31 +894,47 @@ class APIIntegration(db.Model):
     data_volume = db.Column(db.Integer)  # Records per sync
     
     # Data Mapping
-    field_mappings = db.Column(db.JSON)  # How external fields map to our models
-    data_transformations = db.Column(db.JSON)  # Any transformations applied
+    field_mappings = db.Column(JSONDocument)  # How external fields map to our models
+    data_transformations = db.Column(JSONDocument)  # Any transformations applied
     
     # Intelligence Value
-    data_quality_score = db.Column(db.Float)
-    intelligence_types = db.Column(db.JSON)  # What intelligence we extract
-    business_value_score = db.Column(db.Float)
+    data_quality_score = db.Column(ScoreFloat)
+    intelligence_types = db.Column(JSONDocument)  # What intelligence we extract
+    business_value_score = db.Column(ScoreFloat)
     
     # Status
-    status = db.Column(db.String(50))  # active, paused, error, pending
+    status = db.Column(CodedString(INTEGRATION_STATUSES))
     error_message = db.Column(db.Text)
     error_count = db.Column(db.Integer, default=0)
     
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = db.Column(db.DateTime, server_default=db.func.now())
+    updated_at = db.Column(db.DateTime, server_default=db.func.now(), onupdate=db.func.now())
     
     # Relationships
-    organization = db.relationship('Organization', backref=db.backref('api_integrations', lazy=True))
+    organization = db.relationship('Organization', backref=db.backref('api_integrations', lazy='raise'))
+    
+    def set_credentials(self, credentials: Dict):
+        """Encrypt and store the integration's credentials.
+        
+        The ciphertext is bound to this integration's id, so it cannot be
+        copied onto another row and decrypted there.
+        """
+        if self.id is None:
+            self.id = uuid7()
+        self.credentials_encrypted = crypto.encrypt(orjson.dumps(credentials), self.id.bytes)
+    
+    def get_credentials(self) -> Optional[Dict]:
+        """Decrypt the stored credentials, or None if none are set"""
+        if self.credentials_encrypted is None:
+            return None
+        return orjson.loads(crypto.decrypt(self.credentials_encrypted, self.id.bytes))
 
 
-class CompetitorIntelligence(db.Model):
+class CompetitorIntelligence(BulkInsertMixin, db.Model):
     """Track competitor activities and market positioning"""
     __tablename__ = 'competitor_intelligence'
     
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = db.Column(db.Uuid, primary_key=True, default=uuid7)
     
     # Competitor Profile
     competitor_name = db.Column(db.String(255), nullable=False)
@@ -363,73 +948,79 @@ class CompetitorIntelligence(db.Model):
     growth_rate_estimate = db.Column(db.Float)
     
     # Product Intelligence
-    key_features = db.Column(db.JSON)
-    pricing_model = db.Column(db.JSON)
-    target_customers = db.Column(db.JSON)
-    unique_selling_points = db.Column(db.JSON)
+    key_features = db.Column(JSONDocument)
+    pricing_model = db.Column(JSONDocument)
+    target_customers = db.Column(JSONDocument)
+    unique_selling_points = db.Column(JSONDocument)
     
     # Competitive Analysis
-    strengths = db.Column(db.JSON)
-    weaknesses = db.Column(db.JSON)
-    opportunities = db.Column(db.JSON)
-    threats = db.Column(db.JSON)
+    strengths = db.Column(JSONDocument)
+    weaknesses = db.Column(JSONDocument)
+    opportunities = db.Column(JSONDocument)
+    threats = db.Column(JSONDocument)
     
     # Customer Feedback
     customer_satisfaction = db.Column(db.Float)
-    common_complaints = db.Column(db.JSON)
-    switching_triggers = db.Column(db.JSON)  # Why customers leave them
+    common_complaints = db.Column(JSONDocument)
+    switching_triggers = db.Column(JSONDocument)  # Why customers leave them
     
     # Intelligence Sources
-    data_sources = db.Column(db.JSON)  # Where we got this info
+    data_sources = db.Column(JSONDocument)  # Where we got this info
     confidence_level = db.Column(db.Float)
     
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = db.Column(db.DateTime, server_default=db.func.now())
+    updated_at = db.Column(db.DateTime, server_default=db.func.now(), onupdate=db.func.now())
+    
+    __table_args__ = (
+        db.Index('idx_competitor_intelligence_key_features_gin', 'key_features', postgresql_using='gin'),
+    )
 
 
-class DataQualityMetrics(db.Model):
+class DataQualityMetrics(BulkInsertMixin, db.Model):
     """Track data quality to ensure marketplace value"""
     __tablename__ = 'data_quality_metrics'
     
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = db.Column(db.Uuid, primary_key=True, default=uuid7)
     org_id = db.Column(db.String(100), db.ForeignKey('organizations.id'), nullable=False)
     
     # Quality Dimensions
-    completeness_score = db.Column(db.Float)  # % of required fields filled
-    accuracy_score = db.Column(db.Float)  # % of accurate data points
-    consistency_score = db.Column(db.Float)  # % following standards
-    timeliness_score = db.Column(db.Float)  # % updated on time
-    uniqueness_score = db.Column(db.Float)  # % without duplicates
+    completeness_score = db.Column(ScoreFloat)  # % of required fields filled
+    accuracy_score = db.Column(ScoreFloat)  # % of accurate data points
+    consistency_score = db.Column(ScoreFloat)  # % following standards
+    timeliness_score = db.Column(ScoreFloat)  # % updated on time
+    uniqueness_score = db.Column(ScoreFloat)  # % without duplicates
     
     # Overall Score
-    overall_quality_score = db.Column(db.Float)
-    quality_tier = db.Column(db.String(20))  # gold, silver, bronze
+    overall_quality_score = db.Column(ScoreFloat)
+    quality_tier = db.Column(CodedString(QUALITY_TIERS))
     
     # Contribution Metrics
     data_points_contributed = db.Column(db.Integer)
     unique_insights_contributed = db.Column(db.Integer)
-    marketplace_value_score = db.Column(db.Float)
+    marketplace_value_score = db.Column(ScoreFloat)
     
     # Incentive Tracking
     credits_earned = db.Column(db.Integer)
     discount_percentage = db.Column(db.Float)
-    premium_features_unlocked = db.Column(db.JSON)
+    premium_features_unlocked = db.Column(JSONDocument)
     
     period_start = db.Column(db.Date)
     period_end = db.Column(db.Date)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, server_default=db.func.now())
     
     # Relationships
-    organization = db.relationship('Organization', backref=db.backref('data_quality_metrics', lazy=True))
+    organization = db.relationship('Organization', backref=db.backref('data_quality_metrics', lazy='raise'))
 
     def _analyze_demand_trends(self, market_data: List[MarketIntelligence]) -> Dict:
         """Analyze demand trends across markets"""
         if not market_data:
             return {}
         
+        demand, growth = _market_columns(market_data, 'total_market_demand', 'demand_growth_rate')
+        
         # Calculate overall demand growth
-        total_demand = sum(m.total_market_demand for m in market_data if m.total_market_demand)
-        avg_growth = np.mean([m.demand_growth_rate for m in market_data if m.demand_growth_rate])
+        total_demand = np.nansum(demand)
+        avg_growth = np.nanmean(_nonzero(growth))
         
         return {
             'total_demand': total_demand,
@@ -442,8 +1033,9 @@ class DataQualityMetrics(db.Model):
         if not market_data:
             return {}
         
-        avg_price = np.mean([m.average_unit_price for m in market_data if m.average_unit_price])
-        avg_volatility = np.mean([m.price_volatility for m in market_data if m.price_volatility])
+        prices, volatility = _market_columns(market_data, 'average_unit_price', 'price_volatility')
+        avg_price = np.nanmean(_nonzero(prices))
+        avg_volatility = np.nanmean(_nonzero(volatility))
         
         return {
             'average_price': avg_price,
@@ -456,8 +1048,9 @@ class DataQualityMetrics(db.Model):
         if not market_data:
             return {}
         
-        total_suppliers = sum(m.total_suppliers for m in market_data if m.total_suppliers)
-        avg_lead_time = np.mean([m.average_lead_time for m in market_data if m.average_lead_time])
+        suppliers, lead_times = _market_columns(market_data, 'total_suppliers', 'average_lead_time')
+        total_suppliers = np.nansum(suppliers)
+        avg_lead_time = np.nanmean(_nonzero(lead_times))
         
         return {
             'total_suppliers': total_suppliers,
@@ -470,7 +1063,8 @@ class DataQualityMetrics(db.Model):
         if not market_data:
             return {}
         
-        avg_risk = np.mean([m.supply_chain_risk_score for m in market_data if m.supply_chain_risk_score])
+        (risk,) = _market_columns(market_data, 'supply_chain_risk_score')
+        avg_risk = np.nanmean(_nonzero(risk))
         
         return {
             'average_risk_score': avg_risk,
@@ -483,13 +1077,13 @@ class DataQualityMetrics(db.Model):
             return 0.0
         
         # Calculate concentration based on supplier distribution
-        total_suppliers = sum(m.total_suppliers for m in market_data if m.total_suppliers)
+        (suppliers,) = _market_columns(market_data, 'total_suppliers')
+        total_suppliers = np.nansum(suppliers)
         if total_suppliers == 0:
             return 0.0
         
         # Simplified Herfindahl calculation
-        market_shares = [m.total_suppliers / total_suppliers for m in market_data if m.total_suppliers]
-        herfindahl = sum(share ** 2 for share in market_shares)
+        herfindahl = np.nansum((suppliers / total_suppliers) ** 2)
         
         return herfindahl
     
@@ -499,8 +1093,9 @@ class DataQualityMetrics(db.Model):
             return 0.0
         
         # Factors: number of suppliers, new entrants, market maturity
-        avg_suppliers = np.mean([m.total_suppliers for m in market_data if m.total_suppliers])
-        total_new_entrants = sum(m.new_entrants for m in market_data if m.new_entrants)
+        suppliers, new_entrants = _market_columns(market_data, 'total_suppliers', 'new_entrants')
+        avg_suppliers = np.nanmean(_nonzero(suppliers))
+        total_new_entrants = np.nansum(new_entrants)
         
         # Normalize to 0-1 scale
         supplier_intensity = min(avg_suppliers / 100, 1.0)  # Cap at 100 suppliers
@@ -510,12 +1105,36 @@ class DataQualityMetrics(db.Model):
     
     def _identify_market_opportunities(self, market_data: List[MarketIntelligence]) -> List[Dict]:
         """Identify market opportunities based on intelligence"""
-        opportunities = []
+        if not market_data:
+            return []
+        
+        growth, suppliers, lead_time, risk = _market_columns(
+            market_data, 'demand_growth_rate', 'total_suppliers', 'average_lead_time', 'supply_chain_risk_score'
+        )
         
-        for market in market_data:
+        # Candidate scores, interleaved per market as (growth opportunity, supply
+        # chain opportunity) so that ties keep the per-market order
+        scores = np.full((len(market_data), 2), -np.inf)
+        with np.errstate(divide='ignore', invalid='ignore'):
             # High growth, low competition opportunity
-            if (market.demand_growth_rate and market.demand_growth_rate > 0.15 and
-                market.total_suppliers and market.total_suppliers < 20):
+            high_growth = (growth > 0.15) & (suppliers != 0) & (suppliers < 20)
+            scores[:, 0] = np.where(high_growth, growth * (1 / suppliers), -np.inf)
+            # Supply chain optimization opportunity
+            slow_risky = (lead_time > 45) & (risk > 0.6)
+            scores[:, 1] = np.where(slow_risky, lead_time * risk, -np.inf)
+        scores = scores.ravel()
+        
+        candidates = np.flatnonzero(scores > -np.inf)
+        if len(candidates) > 5:
+            # Keep everything tied with the 5th best, then order those stably
+            fifth_best = np.partition(scores[candidates], -5)[-5]
+            candidates = candidates[scores[candidates] >= fifth_best]
+        top = candidates[np.argsort(-scores[candidates], kind='stable')][:5]
+        
+        opportunities = []
+        for index in top:
+            market = market_data[index // 2]
+            if index % 2 == 0:
                 opportunities.append({
                     'market': f"{market.product_category} - {market.geographic_region}",
                     'type': 'high_growth_low_competition',
@@ -523,10 +1142,7 @@ class DataQualityMetrics(db.Model):
                     'supplier_count': market.total_suppliers,
                     'opportunity_score': market.demand_growth_rate * (1 / market.total_suppliers)
                 })
-            
-            # Supply chain optimization opportunity
-            if (market.average_lead_time and market.average_lead_time > 45 and
-                market.supply_chain_risk_score and market.supply_chain_risk_score > 0.6):
+            else:
                 opportunities.append({
                     'market': f"{market.product_category} - {market.geographic_region}",
                     'type': 'supply_chain_optimization',
@@ -535,103 +1151,77 @@ class DataQualityMetrics(db.Model):
                     'opportunity_score': market.average_lead_time * market.supply_chain_risk_score
                 })
         
-        # Sort by opportunity score
-        opportunities.sort(key=lambda x: x['opportunity_score'], reverse=True)
-        return opportunities[:5]  # Top 5 opportunities
+        return opportunities
     
     def _calculate_market_intelligence_score(self, market_data: List[MarketIntelligence]) -> float:
         """Calculate market intelligence score"""
         if not market_data:
             return 0.0
         
-        # Score based on data completeness and quality
-        scores = []
-        for market in market_data:
-            score = 0.0
-            
-            # Data completeness
-            if market.total_market_demand:
-                score += 20
-            if market.demand_growth_rate is not None:
-                score += 15
-            if market.average_unit_price:
-                score += 15
-            if market.total_suppliers:
-                score += 15
-            if market.average_lead_time:
-                score += 15
-            if market.supply_chain_risk_score is not None:
-                score += 20
-            
-            # Quality bonus
-            if market.confidence_score:
-                score *= market.confidence_score
-            
-            scores.append(score)
+        demand, growth, price, suppliers, lead_time, risk, confidence = _market_columns(
+            market_data, 'total_market_demand', 'demand_growth_rate', 'average_unit_price',
+            'total_suppliers', 'average_lead_time', 'supply_chain_risk_score', 'confidence_score'
+        )
         
-        return np.mean(scores) if scores else 0.0
+        # Score based on data completeness and quality: one row per market,
+        # one column per field in _COMPLETENESS_WEIGHTS order
+        presence = np.column_stack([
+            _is_truthy(demand),
+            ~np.isnan(growth),
+            _is_truthy(price),
+            _is_truthy(suppliers),
+            _is_truthy(lead_time),
+            ~np.isnan(risk),
+        ])
+        scores = presence @ _COMPLETENESS_WEIGHTS
+        
+        # Quality bonus
+        scores *= np.where(_is_truthy(confidence), confidence, 1.0)
+        
+        return float(scores.mean())
     
     def _calculate_compliance_score(self, document_results: List[Dict]) -> float:
         """Calculate compliance score from document processing"""
         if not document_results:
             return 0.0
         
-        compliance_scores = []
-        for doc in document_results:
-            if 'compliance_status' in doc:
-                status = doc['compliance_status']
-                if status == 'compliant':
-                    compliance_scores.append(1.0)
-                elif status == 'at_risk':
-                    compliance_scores.append(0.5)
-                else:
-                    compliance_scores.append(0.0)
+        compliance_scores = _document_column(document_results, 'compliance_status', _compliance_points)
         
-        return np.mean(compliance_scores) * 100 if compliance_scores else 0.0
+        return np.nanmean(compliance_scores) * 100 if _any_present(compliance_scores) else 0.0
     
     def _calculate_cost_accuracy(self, document_results: List[Dict]) -> float:
         """Calculate cost accuracy from document processing"""
         if not document_results:
             return 0.0
         
-        accuracy_scores = []
-        for doc in document_results:
-            if 'cost_variance_percentage' in doc:
-                variance = abs(doc['cost_variance_percentage'])
-                # Lower variance = higher accuracy
-                accuracy = max(0, 100 - variance)
-                accuracy_scores.append(accuracy)
+        variance = _document_column(document_results, 'cost_variance_percentage')
+        # Lower variance = higher accuracy
+        accuracy_scores = np.maximum(0, 100 - np.abs(variance))
         
-        return np.mean(accuracy_scores) if accuracy_scores else 0.0
+        return np.nanmean(accuracy_scores) if _any_present(accuracy_scores) else 0.0
     
     def _calculate_timeline_efficiency(self, document_results: List[Dict]) -> float:
         """Calculate timeline efficiency from document processing"""
         if not document_results:
             return 0.0
         
-        efficiency_scores = []
-        for doc in document_results:
-            if 'timeline_variance' in doc:
-                variance = doc['timeline_variance']
-                # Lower variance = higher efficiency
-                efficiency = max(0, 100 - abs(variance))
-                efficiency_scores.append(efficiency)
+        variance = _document_column(document_results, 'timeline_variance')
+        # Lower variance = higher efficiency
+        efficiency_scores = np.maximum(0, 100 - np.abs(variance))
         
-        return np.mean(efficiency_scores) if efficiency_scores else 0.0
+        return np.nanmean(efficiency_scores) if _any_present(efficiency_scores) else 0.0
     
     def _calculate_risk_detection(self, document_results: List[Dict]) -> float:
         """Calculate risk detection effectiveness"""
         if not document_results:
             return 0.0
         
-        risk_detected = 0
-        total_docs = len(document_results)
+        risk_detected = np.fromiter(
+            (bool(doc.get('anomaly_flags')) or doc.get('risk_score', 0) > 0.5 for doc in document_results),
+            dtype=bool, count=len(document_results)
+        )
         
-        for doc in document_results:
-            if doc.get('anomaly_flags') or doc.get('risk_score', 0) > 0.5:
-                risk_detected += 1
-        
-        return (risk_detected / total_docs) * 100 if total_docs > 0 else 0.0
+        return risk_detected.mean() * 100
     
     def _calculate_processing_efficiency(self, document_results: List[Dict]) -> float:
         """Calculate document processing efficiency"""
@@ -639,17 +1229,11 @@ class DataQualityMetrics(db.Model):
             return 0.0
         
         # Calculate average processing time and accuracy
-        processing_times = []
-        confidence_scores = []
-        
-        for doc in document_results:
-            if 'processing_time' in doc:
-                processing_times.append(doc['processing_time'])
-            if 'confidence' in doc:
-                confidence_scores.append(doc['confidence'])
+        processing_times = _document_column(document_results, 'processing_time')
+        confidence_scores = _document_column(document_results, 'confidence')
         
-        avg_time = np.mean(processing_times) if processing_times else 0
-        avg_confidence = np.mean(confidence_scores) if confidence_scores else 0
+        avg_time = np.nanmean(processing_times) if _any_present(processing_times) else 0
+        avg_confidence = np.nanmean(confidence_scores) if _any_present(confidence_scores) else 0
         
         # Efficiency = confidence / time (normalized)
         efficiency = (avg_confidence * 100) / max(avg_time, 1)
@@ -659,33 +1243,35 @@ class DataQualityMetrics(db.Model):
         """Identify opportunities from document processing"""
         opportunities = []
         
-        # Cost variance opportunities
-        high_variance_docs = [
-            doc for doc in document_results 
-            if doc.get('cost_variance_percentage', 0) > 10
-        ]
+        # One pass for both the cost variance and the compliance statistics
+        variance_total = 0.0
+        high_variance_count = 0
+        violation_count = 0
+        for doc in document_results:
+            variance = doc.get('cost_variance_percentage', 0)
+            if variance > 10:
+                variance_total += variance
+                high_variance_count += 1
+            if doc.get('compliance_status') == 'violated':
+                violation_count += 1
         
-        if high_variance_docs:
-            avg_variance = np.mean([doc['cost_variance_percentage'] for doc in high_variance_docs])
+        # Cost variance opportunities
+        if high_variance_count:
+            avg_variance = variance_total / high_variance_count
             opportunities.append({
                 'type': 'cost_optimization',
                 'description': f'Reduce cost variance (avg: {avg_variance:.1f}%)',
-                'documents_affected': len(high_variance_docs),
+                'documents_affected': high_variance_count,
                 'potential_savings': avg_variance * 0.5  # Assume 50% improvement potential
             })
         
         # Compliance opportunities
-        non_compliant_docs = [
-            doc for doc in document_results 
-            if doc.get('compliance_status') == 'violated'
-        ]
-        
-        if non_compliant_docs:
+        if violation_count:
             opportunities.append({
                 'type': 'compliance_improvement',
                 'description': 'Address compliance violations',
-                'documents_affected': len(non_compliant_docs),
-                'risk_reduction': len(non_compliant_docs) * 0.1  # 10% risk reduction per doc
+                'documents_affected': violation_count,
+                'risk_reduction': violation_count * 0.1  # 10% risk reduction per doc
             })
         
         return opportunities
@@ -708,14 +1294,14 @@ class DataQualityMetrics(db.Model):
 
 # Phase 2: Unified Document Intelligence Models
 
-class UnifiedTransaction(db.Model):
+class UnifiedTransaction(BulkInsertMixin, db.Model):
     """Enhanced unified transaction model with document intelligence and cross-referencing capabilities"""
     __tablename__ = 'unified_transactions'
     
     # Core identification
     transaction_id = db.Column(db.String(50), primary_key=True)
     org_id = db.Column(db.String(100), db.ForeignKey('organizations.id'), nullable=False)
-    transaction_type = db.Column(db.String(20))  # SALE, PURCHASE, INVENTORY, DOCUMENT
+    transaction_type = db.Column(CodedString(UNIFIED_TRANSACTION_TYPES))
     
     # Document linkage
     source_document_id = db.Column(db.String(36), db.ForeignKey('trade_documents.id'))
@@ -742,7 +1328,7 @@ class UnifiedTransaction(db.Model):
     received_quantity = db.Column(db.Float)  # From receipts
     available_stock = db.Column(db.Float)
     in_transit_stock = db.Column(db.Float)
-    inventory_status = db.Column(db.String(50))  # available, committed, in_transit, compromised
+    inventory_status = db.Column(CodedString(INVENTORY_STATUSES))
     
     # Supply chain timeline
     transaction_date = db.Column(db.Date)
@@ -752,9 +1338,9 @@ class UnifiedTransaction(db.Model):
     received_date = db.Column(db.Date)  # Actual receipt
     
     # Risk and compliance
-    compliance_status = db.Column(db.String(50))  # compliant, at_risk, violated
-    risk_score = db.Column(db.Float)  # 0-100
-    anomaly_flags = db.Column(db.JSON)  # List of detected anomalies
+    compliance_status = db.Column(CodedString(COMPLIANCE_STATUSES))
+    risk_score = db.Column(ScoreFloat)  # 0-100
+    anomaly_flags = db.Column(JSONDocument)  # List of detected anomalies
     
     # Supplier/Customer info
     supplier_name = db.Column(db.String(255))
@@ -773,58 +1359,85 @@ class UnifiedTransaction(db.Model):
     
     # Metadata
     upload_id = db.Column(db.Integer, db.ForeignKey('uploads.id'))
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = db.Column(db.DateTime, server_default=db.func.now())
+    updated_at = db.Column(db.DateTime, server_default=db.func.now(), onupdate=db.func.now())
     
     # Relationships
-    organization = db.relationship('Organization', backref=db.backref('unified_transactions', lazy=True))
-    source_document = db.relationship('TradeDocument', backref='unified_transactions')
-    upload = db.relationship('Upload', backref='unified_transactions')
+    organization = db.relationship('Organization', backref=db.backref('unified_transactions', lazy='raise'))
+    source_document = db.relationship('TradeDocument', backref=db.backref('unified_transactions', lazy='raise'))
+    upload = db.relationship('Upload', backref=db.backref('unified_transactions', lazy='raise'))
     
-    def to_dict(self):
-        return {
-            'transaction_id': self.transaction_id,
-            'org_id': self.org_id,
-            'transaction_type': self.transaction_type,
-            'source_document_id': self.source_document_id,
-            'document_confidence': self.document_confidence,
-            'sku': self.sku,
-            'product_description': self.product_description,
-            'product_category': self.product_category,
-            'unit_cost': self.unit_cost,
-            'total_cost': self.total_cost,
-            'actual_cost': self.actual_cost,
-            'planned_cost': self.planned_cost,
-            'cost_variance': self.cost_variance,
-            'cost_variance_percentage': self.cost_variance_percentage,
-            'quantity': self.quantity,
-            'committed_quantity': self.committed_quantity,
-            'received_quantity': self.received_quantity,
-            'available_stock': self.available_stock,
-            'in_transit_stock': self.in_transit_stock,
-            'inventory_status': self.inventory_status,
-            'transaction_date': self.transaction_date.isoformat() if self.transaction_date else None,
-            'po_date': self.po_date.isoformat() if self.po_date else None,
-            'ship_date': self.ship_date.isoformat() if self.ship_date else None,
-            'eta_date': self.eta_date.isoformat() if self.eta_date else None,
-            'received_date': self.received_date.isoformat() if self.received_date else None,
-            'compliance_status': self.compliance_status,
-            'risk_score': self.risk_score,
-            'anomaly_flags': self.anomaly_flags,
-            'supplier_name': self.supplier_name,
-            'customer_name': self.customer_name,
-            'city': self.city,
-            'country': self.country,
-            'currency': self.currency,
-            'created_at': self.created_at.isoformat() if self.created_at else None
-        }
+    __table_args__ = (
+        # Related transactions for one SKU, optionally over a date range
+        db.Index('idx_unified_transactions_org_sku_date', 'org_id', 'sku', 'transaction_date'),
+        # Inventory by status (e.g. compromised) per org
+        db.Index('idx_unified_transactions_org_status', 'org_id', 'inventory_status'),
+        # Per-supplier history; supplier_name is what document extraction fills in
+        db.Index('idx_unified_transactions_org_supplier', 'org_id', 'supplier_name'),
+    )
+    
+    # Columns exposed by to_dict(), in output order
+    LIST_FIELDS = (
+        'transaction_id', 'org_id', 'transaction_type', 'source_document_id',
+        'document_confidence', 'sku', 'product_description', 'product_category',
+        'unit_cost', 'total_cost', 'actual_cost', 'planned_cost', 'cost_variance',
+        'cost_variance_percentage', 'quantity', 'committed_quantity',
+        'received_quantity', 'available_stock', 'in_transit_stock',
+        'inventory_status', 'transaction_date', 'po_date', 'ship_date', 'eta_date',
+        'received_date', 'compliance_status', 'risk_score', 'anomaly_flags',
+        'supplier_name', 'customer_name', 'city', 'country', 'currency',
+        'created_at'
+    )
+    _list_values = operator.attrgetter(*LIST_FIELDS)
+    
+    _LIST_FIELD_SET = frozenset(LIST_FIELDS)
+    
+    def to_dict(self, fields: Optional[Iterable[str]] = None):
+        """The LIST_FIELDS columns as a dict, or only ``fields`` when given.
+        
+        Dates stay date/datetime objects; orjson formats them when encoding.
+        """
+        if fields is None:
+            return dict(zip(self.LIST_FIELDS, self._list_values(self)))
+        fields = list(fields)
+        unknown = set(fields) - self._LIST_FIELD_SET
+        if unknown:
+            raise ValueError(f"Unknown unified transaction fields: {', '.join(sorted(unknown))}")
+        return {field: getattr(self, field) for field in fields}
 
 
-class DocumentInventoryLink(db.Model):
+class UnifiedTransactionSupplierRollup(db.Model):
+    """Monthly unified transaction totals per org and supplier.
+    
+    Read-only mapping of the ``unified_transaction_supplier_rollup`` materialized
+    view (PostgreSQL only). The table lives in its own MetaData so that
+    ``db.create_all()`` never creates it.
+    """
+    __table__ = db.Table(
+        'unified_transaction_supplier_rollup',
+        db.MetaData(),
+        db.Column('org_id', db.String(100), primary_key=True),
+        db.Column('supplier_name', db.String(255), primary_key=True),
+        db.Column('month', db.Date, primary_key=True),
+        db.Column('transaction_count', db.Integer),
+        db.Column('total_quantity', db.Float),
+        db.Column('total_cost', db.Float),
+        db.Column('total_cost_variance', db.Float),
+        db.Column('average_risk_score', ScoreFloat),
+        info={'is_view': True},
+    )
+    
+    @classmethod
+    def refresh(cls, session):
+        """Recompute the view without blocking concurrent readers"""
+        session.execute(db.text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {cls.__table__.name}"))
+
+
+class DocumentInventoryLink(BulkInsertMixin, db.Model):
     """Cross-reference model linking documents to inventory for compromise detection"""
     __tablename__ = 'document_inventory_links'
     
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = db.Column(db.Uuid, primary_key=True, default=uuid7)
     org_id = db.Column(db.String(100), db.ForeignKey('organizations.id'), nullable=False)
     
     # Document linkage
@@ -849,7 +1462,7 @@ class DocumentInventoryLink(db.Model):
     
     # Status and alerts
     inventory_status = db.Column(db.String(50), default='normal')  # normal, compromised, at_risk
-    compromise_reasons = db.Column(db.JSON)  # List of issues
+    compromise_reasons = db.Column(JSONDocument)  # List of issues
     
     # Timeline
     po_date = db.Column(db.Date)
@@ -857,36 +1470,34 @@ class DocumentInventoryLink(db.Model):
     eta_date = db.Column(db.Date)
     received_date = db.Column(db.Date)
     
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = db.Column(db.DateTime, server_default=db.func.now())
+    updated_at = db.Column(db.DateTime, server_default=db.func.now(), onupdate=db.func.now())
     
     # Relationships
-    organization = db.relationship('Organization', backref=db.backref('document_inventory_links', lazy=True))
-    po_document = db.relationship('TradeDocument', foreign_keys=[po_document_id], backref='po_links')
-    invoice_document = db.relationship('TradeDocument', foreign_keys=[invoice_document_id], backref='invoice_links')
-    bol_document = db.relationship('TradeDocument', foreign_keys=[bol_document_id], backref='bol_links')
+    organization = db.relationship('Organization', backref=db.backref('document_inventory_links', lazy='raise'))
+    po_document = db.relationship('TradeDocument', foreign_keys=[po_document_id], backref=db.backref('po_links', lazy='raise'))
+    invoice_document = db.relationship('TradeDocument', foreign_keys=[invoice_document_id], backref=db.backref('invoice_links', lazy='raise'))
+    bol_document = db.relationship('TradeDocument', foreign_keys=[bol_document_id], backref=db.backref('bol_links', lazy='raise'))
+    
+    __table_args__ = (
+        # Compromise dashboards: only compromised and at-risk links are indexed,
+        # so the index stays small as normal links pile up
+        db.Index('idx_document_inventory_links_flagged', 'org_id', 'sku',
+                 postgresql_where=inventory_status != 'normal',
+                 sqlite_where=inventory_status != 'normal'),
+    )
+    
+    # Columns exposed by to_dict(), in output order
+    LIST_FIELDS = (
+        'id', 'org_id', 'po_document_id', 'invoice_document_id', 'bol_document_id',
+        'sku', 'product_description', 'po_quantity', 'shipped_quantity',
+        'received_quantity', 'available_inventory', 'po_unit_cost',
+        'invoice_unit_cost', 'landed_cost', 'inventory_status',
+        'compromise_reasons', 'po_date', 'ship_date', 'eta_date', 'received_date',
+        'created_at'
+    )
+    _list_values = operator.attrgetter(*LIST_FIELDS)
     
     def to_dict(self):
-        return {
-            'id': self.id,
-            'org_id': self.org_id,
-            'po_document_id': self.po_document_id,
-            'invoice_document_id': self.invoice_document_id,
-            'bol_document_id': self.bol_document_id,
-            'sku': self.sku,
-            'product_description': self.product_description,
-            'po_quantity': self.po_quantity,
-            'shipped_quantity': self.shipped_quantity,
-            'received_quantity': self.received_quantity,
-            'available_inventory': self.available_inventory,
-            'po_unit_cost': self.po_unit_cost,
-            'invoice_unit_cost': self.invoice_unit_cost,
-            'landed_cost': self.landed_cost,
-            'inventory_status': self.inventory_status,
-            'compromise_reasons': self.compromise_reasons,
-            'po_date': self.po_date.isoformat() if self.po_date else None,
-            'ship_date': self.ship_date.isoformat() if self.ship_date else None,
-            'eta_date': self.eta_date.isoformat() if self.eta_date else None,
-            'received_date': self.received_date.isoformat() if self.received_date else None,
-            'created_at': self.created_at.isoformat() if self.created_at else None
-        }
\ No newline at end of file
+        # Dates stay date/datetime objects; orjson formats them when encoding
+        return dict(zip(self.LIST_FIELDS, self._list_values(self)))
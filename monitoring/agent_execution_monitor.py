@@ -4,20 +4,58 @@ Tracks execution lifecycle, performance, and provides detailed insights.
 """
 
 import asyncio
+import heapq
+import itertools
+import queue
+import re
 import threading
 import time
 import json
+import os
+import sys
 from datetime import datetime, timezone, timedelta
-from typing import Dict, List, Optional, Any, Callable
+from typing import Dict, List, Optional, Any, Callable, Set, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 import uuid
-from collections import defaultdict, deque
+from collections import Counter, defaultdict, deque
 import logging
 
 from ..agent_protocol.monitoring.agent_logger import get_agent_logger
 from ..agent_protocol.monitoring.metrics_collector import get_metrics_collector
 
+# Per-execution records drop their __dict__ where dataclasses support
+# slots (Python 3.10+)
+DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+# Active executions are spread over this many independently locked shards
+EXECUTION_LOCK_STRIPES = 32
+
+# Performance history entries kept per agent type
+PERFORMANCE_HISTORY_SIZE = 100
+
+# Completed executions averaged into avg_execution_time_ms
+RECENT_DURATIONS_SIZE = 50
+
+# Lifecycle events are handed to a background thread and logged in batches
+LOG_QUEUE_SIZE = 10000
+LOG_BATCH_SIZE = 256
+
+# Error classes in priority order; when a message matches several, the
+# earliest class wins
+ERROR_CLASS_RE = re.compile(
+    r'(?P<timeout>timeout)'
+    r'|(?P<permission>permission|unauthorized)'
+    r'|(?P<rate_limit>rate limit|quota)'
+    r'|(?P<network>network|connection)'
+    r'|(?P<validation>validation|invalid)'
+    r'|(?P<llm_error>llm|model)'
+    r'|(?P<tool_error>tool)',
+    re.IGNORECASE
+)
+ERROR_CLASS_RANK = {name: rank for rank, name in enumerate(ERROR_CLASS_RE.groupindex)}
+ERROR_CLASSES = (*ERROR_CLASS_RANK, 'unknown')
+
 
 class ExecutionStatus(Enum):
     """Agent execution status."""
@@ -42,7 +80,7 @@ class ExecutionPriority(Enum):
     CRITICAL = 5
 
 
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
 class ExecutionContext:
     """Context information for agent execution."""
     execution_id: str
@@ -59,7 +97,7 @@ class ExecutionContext:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
 class ExecutionStep:
     """Individual step in agent execution."""
     step_id: str
@@ -76,9 +114,11 @@ class ExecutionStep:
     cost: float = 0.0
     tokens_used: int = 0
     confidence_score: Optional[float] = None
+    # Monotonic start time; durations are measured from here
+    _start_ns: int = field(default_factory=time.monotonic_ns, repr=False)
 
 
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
 class ExecutionTrace:
     """Complete trace of agent execution."""
     context: ExecutionContext
@@ -96,6 +136,11 @@ class ExecutionTrace:
     llm_requests: int = 0
     confidence_score: Optional[float] = None
     performance_metrics: Dict[str, Any] = field(default_factory=dict)
+    # Lookup indexes over steps and tools_called
+    _steps_by_id: Dict[str, ExecutionStep] = field(default_factory=dict, repr=False)
+    _tools_called_set: Set[str] = field(default_factory=set, repr=False)
+    # Monotonic start time; durations are measured from here
+    _start_ns: int = field(default_factory=time.monotonic_ns, repr=False)
 
 
 class AgentExecutionMonitor:
@@ -106,12 +151,25 @@ class AgentExecutionMonitor:
         self.logger = get_agent_logger()
         self.metrics_collector = get_metrics_collector()
         
-        # Execution tracking
-        self.active_executions: Dict[str, ExecutionTrace] = {}
+        # Execution tracking: active executions are sharded by execution id,
+        # each shard guarded by its own lock, so independent executions
+        # never wait on each other
+        self._stripes = [threading.RLock() for _ in range(EXECUTION_LOCK_STRIPES)]
+        self._shards: List[Dict[str, ExecutionTrace]] = [{} for _ in range(EXECUTION_LOCK_STRIPES)]
         self.completed_executions: deque = deque(maxlen=1000)
-        self.execution_queue: Dict[ExecutionPriority, deque] = {
-            priority: deque() for priority in ExecutionPriority
-        }
+        # Completed traces by execution id, kept in step with the deque
+        self._completed_index: Dict[str, ExecutionTrace] = {}
+        # Queued executions: a heap ordered by priority, then arrival. Entries
+        # that leave the queue are only dropped from _queued; their heap
+        # entries are skipped when popped and purged when they pile up.
+        self._queue_heap: List[Tuple[int, int, str]] = []
+        self._queue_seq = itertools.count()
+        self._queued: Dict[str, ExecutionPriority] = {}
+        
+        # Execution ids: a per-monitor prefix that differs across processes,
+        # then a counter
+        self._id_prefix = f"{os.getpid():x}{uuid.uuid4().hex[:6]}"
+        self._id_counter = itertools.count()
         
         # Real-time statistics
         self.stats = {
@@ -122,29 +180,40 @@ class AgentExecutionMonitor:
             'avg_execution_time_ms': 0.0,
             'total_cost_today': 0.0,
             'total_tokens_today': 0,
-            'queue_size': 0
+            'queue_size': 0,
+            'dropped_log_events': 0
         }
         
         # Performance tracking
-        self.performance_history = defaultdict(list)
-        self.error_patterns = defaultdict(int)
+        self._recent_durations: deque = deque(maxlen=RECENT_DURATIONS_SIZE)
+        self._recent_duration_sum = 0
+        self.performance_history: Dict[str, deque] = defaultdict(lambda: deque(maxlen=PERFORMANCE_HISTORY_SIZE))
+        self.error_patterns = Counter(dict.fromkeys(ERROR_CLASSES, 0))
         
         # Monitoring configuration
         self.monitoring_enabled = True
         self.real_time_updates = True
         self.detailed_logging = True
         
-        # Event callbacks
-        self.execution_callbacks: List[Callable[[ExecutionTrace], None]] = []
-        self.step_callbacks: List[Callable[[ExecutionStep], None]] = []
-        self.error_callbacks: List[Callable[[ExecutionTrace, str], None]] = []
+        # Event callbacks; tuples are replaced, never mutated, so they can be
+        # iterated without a lock
+        self._callbacks_lock = threading.Lock()
+        self.execution_callbacks: Tuple[Callable[[ExecutionTrace], None], ...] = ()
+        self.step_callbacks: Tuple[Callable[[ExecutionStep], None], ...] = ()
+        self.error_callbacks: Tuple[Callable[[ExecutionTrace, str], None], ...] = ()
         
-        # Threading
-        self.monitor_lock = threading.RLock()
+        # Threading: lock order is stripe, then completed, then queue, then stats
+        self._completed_lock = threading.Lock()
+        self._queue_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
         self.stats_thread = None
         self.cleanup_thread = None
         self.monitoring_active = False
         
+        # Lifecycle events waiting to be written by the log thread
+        self._log_queue: queue.Queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+        self.log_thread = None
+        
         # Initialize monitoring
         self._start_monitoring()
     
@@ -166,12 +235,90 @@ class AgentExecutionMonitor:
         )
         self.cleanup_thread.start()
         
+        # Start log thread
+        self.log_thread = threading.Thread(
+            target=self._log_loop,
+            daemon=True
+        )
+        self.log_thread.start()
+        
         self.logger.log_custom_event(
             "monitoring_started",
             "Agent execution monitoring started",
             {"component": "execution_monitor"}
         )
     
+    def _log_event(self, event_type: str, message: str, context: Dict[str, Any]):
+        """Queue a lifecycle event for the log thread; drop it if the queue is full."""
+        try:
+            self._log_queue.put_nowait((event_type, message, context))
+        except queue.Full:
+            with self._stats_lock:
+                self.stats['dropped_log_events'] += 1
+    
+    def _log_loop(self):
+        """Write queued lifecycle events in batches until monitoring stops."""
+        while self.monitoring_active or not self._log_queue.empty():
+            try:
+                batch = [self._log_queue.get(timeout=1)]
+            except queue.Empty:
+                continue
+            
+            while len(batch) < LOG_BATCH_SIZE:
+                try:
+                    batch.append(self._log_queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            for event_type, message, context in batch:
+                try:
+                    self.logger.log_custom_event(event_type, message, context)
+                except Exception as e:
+                    self.logger.log_error(
+                        "Error in log loop",
+                        error=str(e),
+                        error_type="monitoring_error"
+                    )
+    
+    def _shard(self, execution_id: str):
+        """The lock and active-execution shard that own an execution id."""
+        index = hash(execution_id) % EXECUTION_LOCK_STRIPES
+        return self._stripes[index], self._shards[index]
+    
+    def _active_snapshot(self) -> List[ExecutionTrace]:
+        """All active executions, copied shard by shard without taking the locks."""
+        return [trace for shard in self._shards for trace in list(shard.values())]
+    
+    def _add_completed(self, trace: ExecutionTrace):
+        """Append a finished trace, dropping the oldest from the index once the deque is full."""
+        with self._completed_lock:
+            completed = self.completed_executions
+            evicted = completed[0] if len(completed) == completed.maxlen else None
+            completed.append(trace)
+            self._completed_index[trace.context.execution_id] = trace
+            if evicted is not None and self._completed_index.get(evicted.context.execution_id) is evicted:
+                del self._completed_index[evicted.context.execution_id]
+    
+    def _dequeue(self, execution_id: str):
+        """Take an execution out of the queue, if it is still waiting."""
+        with self._queue_lock:
+            if self._queued.pop(execution_id, None) is None:
+                return
+            # Rebuild once most heap entries are stale, so the heap stays
+            # proportional to the executions actually waiting
+            if len(self._queue_heap) > 2 * len(self._queued) + 64:
+                self._queue_heap = [entry for entry in self._queue_heap if entry[2] in self._queued]
+                heapq.heapify(self._queue_heap)
+    
+    def pop_next_queued(self) -> Optional[str]:
+        """Remove and return the highest-priority, longest-waiting execution id."""
+        with self._queue_lock:
+            while self._queue_heap:
+                _, _, execution_id = heapq.heappop(self._queue_heap)
+                if self._queued.pop(execution_id, None) is not None:
+                    return execution_id
+            return None
+    
     def create_execution_context(
         self,
         agent_id: str,
@@ -186,7 +333,7 @@ class AgentExecutionMonitor:
         metadata: Optional[Dict[str, Any]] = None
     ) -> ExecutionContext:
         """Create execution context for monitoring."""
-        execution_id = f"exec_{agent_id}_{int(time.time() * 1000)}_{uuid.uuid4().hex[:8]}"
+        execution_id = f"exec_{agent_id}_{self._id_prefix}_{next(self._id_counter):x}"
         
         context = ExecutionContext(
             execution_id=execution_id,
@@ -206,7 +353,8 @@ class AgentExecutionMonitor:
     
     def start_execution(self, context: ExecutionContext) -> ExecutionTrace:
         """Start monitoring an agent execution."""
-        with self.monitor_lock:
+        lock, shard = self._shard(context.execution_id)
+        with lock:
             # Create execution trace
             trace = ExecutionTrace(
                 context=context,
@@ -215,18 +363,23 @@ class AgentExecutionMonitor:
             )
             
             # Add to active executions
-            self.active_executions[context.execution_id] = trace
+            shard[context.execution_id] = trace
             
             # Add to queue
-            self.execution_queue[context.priority].append(context.execution_id)
+            with self._queue_lock:
+                self._queued[context.execution_id] = context.priority
+                heapq.heappush(
+                    self._queue_heap,
+                    (-context.priority.value, next(self._queue_seq), context.execution_id)
+                )
             
             # Update statistics
-            self.stats['total_executions'] += 1
-            self.stats['active_executions'] += 1
-            self.stats['queue_size'] = sum(len(q) for q in self.execution_queue.values())
+            with self._stats_lock:
+                self.stats['total_executions'] += 1
+                self.stats['active_executions'] += 1
             
             # Log execution start
-            self.logger.log_custom_event(
+            self._log_event(
                 "execution_started",
                 f"Agent execution started: {context.execution_id}",
                 {
@@ -239,19 +392,19 @@ class AgentExecutionMonitor:
                     "timeout_seconds": context.timeout_seconds
                 }
             )
-            
-            # Trigger callbacks
-            for callback in self.execution_callbacks:
-                try:
-                    callback(trace)
-                except Exception as e:
-                    self.logger.log_error(
-                        "Error in execution callback",
-                        error=str(e),
-                        error_type="callback_error"
-                    )
-            
-            return trace
+        
+        # Trigger callbacks outside the lock
+        for callback in self.execution_callbacks:
+            try:
+                callback(trace)
+            except Exception as e:
+                self.logger.log_error(
+                    "Error in execution callback",
+                    error=str(e),
+                    error_type="callback_error"
+                )
+        
+        return trace
     
     def update_execution_status(
         self,
@@ -260,11 +413,18 @@ class AgentExecutionMonitor:
         metadata: Optional[Dict[str, Any]] = None
     ):
         """Update execution status."""
-        with self.monitor_lock:
-            if execution_id not in self.active_executions:
+        finished = status in (ExecutionStatus.COMPLETED, ExecutionStatus.FAILED,
+                              ExecutionStatus.TIMEOUT, ExecutionStatus.CANCELLED)
+        if finished:
+            end_ns = time.monotonic_ns()
+            completed_at = datetime.now(timezone.utc)
+        
+        lock, shard = self._shard(execution_id)
+        with lock:
+            trace = shard.get(execution_id)
+            if trace is None:
                 return
             
-            trace = self.active_executions[execution_id]
             previous_status = trace.status
             trace.status = status
             
@@ -275,33 +435,36 @@ class AgentExecutionMonitor:
             # Handle status-specific logic
             if status == ExecutionStatus.RUNNING:
                 # Remove from queue
-                for priority_queue in self.execution_queue.values():
-                    if execution_id in priority_queue:
-                        priority_queue.remove(execution_id)
-                        break
-                
-                self.stats['queue_size'] = sum(len(q) for q in self.execution_queue.values())
+                self._dequeue(execution_id)
             
-            elif status in [ExecutionStatus.COMPLETED, ExecutionStatus.FAILED, 
-                          ExecutionStatus.TIMEOUT, ExecutionStatus.CANCELLED]:
+            elif finished:
                 # Execution finished
-                trace.completed_at = datetime.now(timezone.utc)
-                if trace.started_at:
-                    trace.duration_ms = int((trace.completed_at - trace.started_at).total_seconds() * 1000)
+                trace.completed_at = completed_at
+                trace.duration_ms = (end_ns - trace._start_ns) // 1_000_000
                 
-                # Update daily statistics
-                if status == ExecutionStatus.COMPLETED:
-                    self.stats['completed_today'] += 1
-                else:
-                    self.stats['failed_today'] += 1
+                # Move to completed executions; executions that finish
+                # without ever running leave the queue here
+                self._add_completed(trace)
+                del shard[execution_id]
+                self._dequeue(execution_id)
                 
-                # Move to completed executions
-                self.completed_executions.append(trace)
-                del self.active_executions[execution_id]
-                self.stats['active_executions'] -= 1
+                # Update daily statistics
+                with self._stats_lock:
+                    if status == ExecutionStatus.COMPLETED:
+                        self.stats['completed_today'] += 1
+                    else:
+                        self.stats['failed_today'] += 1
+                    self.stats['active_executions'] -= 1
+                    
+                    # Running sum over the most recent durations
+                    recent = self._recent_durations
+                    if len(recent) == recent.maxlen:
+                        self._recent_duration_sum -= recent[0]
+                    recent.append(trace.duration_ms)
+                    self._recent_duration_sum += trace.duration_ms
             
             # Log status change
-            self.logger.log_custom_event(
+            self._log_event(
                 "execution_status_changed",
                 f"Execution {execution_id} status: {previous_status.value} -> {status.value}",
                 {
@@ -321,12 +484,12 @@ class AgentExecutionMonitor:
         input_data: Optional[Dict[str, Any]] = None
     ) -> Optional[str]:
         """Start a new execution step."""
-        with self.monitor_lock:
-            if execution_id not in self.active_executions:
+        lock, shard = self._shard(execution_id)
+        with lock:
+            trace = shard.get(execution_id)
+            if trace is None:
                 return None
             
-            trace = self.active_executions[execution_id]
-            
             # Create step
             step_id = f"step_{len(trace.steps)}_{uuid.uuid4().hex[:6]}"
             step = ExecutionStep(
@@ -340,15 +503,15 @@ class AgentExecutionMonitor:
             )
             
             # Complete previous step if exists
-            if trace.current_step and trace.current_step.status == "running":
-                self.complete_execution_step(execution_id, trace.current_step.step_id)
+            pending_error = self._complete_running_step_locked(trace)
             
             # Add step to trace
             trace.steps.append(step)
+            trace._steps_by_id[step_id] = step
             trace.current_step = step
             
             # Log step start
-            self.logger.log_custom_event(
+            self._log_event(
                 "execution_step_started",
                 f"Step started: {step_name}",
                 {
@@ -359,19 +522,22 @@ class AgentExecutionMonitor:
                     "agent_id": trace.context.agent_id
                 }
             )
-            
-            # Trigger callbacks
-            for callback in self.step_callbacks:
-                try:
-                    callback(step)
-                except Exception as e:
-                    self.logger.log_error(
-                        "Error in step callback",
-                        error=str(e),
-                        error_type="callback_error"
-                    )
-            
-            return step_id
+        
+        # Report errors and trigger callbacks outside the lock
+        if pending_error:
+            self._notify_error(*pending_error)
+        
+        for callback in self.step_callbacks:
+            try:
+                callback(step)
+            except Exception as e:
+                self.logger.log_error(
+                    "Error in step callback",
+                    error=str(e),
+                    error_type="callback_error"
+                )
+        
+        return step_id
     
     def complete_execution_step(
         self,
@@ -384,67 +550,106 @@ class AgentExecutionMonitor:
         confidence_score: Optional[float] = None
     ):
         """Complete an execution step."""
-        with self.monitor_lock:
-            if execution_id not in self.active_executions:
-                return
-            
-            trace = self.active_executions[execution_id]
-            
-            # Find step
-            step = None
-            for s in trace.steps:
-                if s.step_id == step_id:
-                    step = s
-                    break
-            
-            if not step:
+        end_ns = time.monotonic_ns()
+        completed_at = datetime.now(timezone.utc)
+        
+        lock, shard = self._shard(execution_id)
+        with lock:
+            trace = shard.get(execution_id)
+            if trace is None:
                 return
             
-            # Complete step
-            step.completed_at = datetime.now(timezone.utc)
-            step.duration_ms = int((step.completed_at - step.started_at).total_seconds() * 1000)
-            step.status = "failed" if error_message else "completed"
-            step.output_data = output_data
-            step.error_message = error_message
-            step.cost = cost
-            step.tokens_used = tokens_used
-            step.confidence_score = confidence_score
-            
-            # Update trace totals
-            trace.total_cost += cost
-            trace.total_tokens += tokens_used
-            
-            if step.step_type == "tool_call":
-                tool_name = step.step_name.replace("tool_call_", "")
-                if tool_name not in trace.tools_called:
-                    trace.tools_called.append(tool_name)
-            elif step.step_type == "llm_request":
-                trace.llm_requests += 1
-            
-            # Update daily statistics
+            pending_error = self._complete_step_locked(
+                trace, step_id, end_ns, completed_at, output_data,
+                error_message, cost, tokens_used, confidence_score
+            )
+        
+        if pending_error:
+            self._notify_error(*pending_error)
+    
+    def _complete_step_locked(
+        self,
+        trace: ExecutionTrace,
+        step_id: str,
+        end_ns: int,
+        completed_at: datetime,
+        output_data: Optional[Dict[str, Any]] = None,
+        error_message: Optional[str] = None,
+        cost: float = 0.0,
+        tokens_used: int = 0,
+        confidence_score: Optional[float] = None
+    ) -> Optional[Tuple[ExecutionTrace, str, Dict[str, Any]]]:
+        """Complete a step while holding the execution's lock.
+        
+        Returns the error to report through _notify_error once the lock is
+        released, if the step failed.
+        """
+        execution_id = trace.context.execution_id
+        
+        # Find step
+        step = trace._steps_by_id.get(step_id)
+        if not step:
+            return None
+        
+        # Complete step
+        step.completed_at = completed_at
+        step.duration_ms = (end_ns - step._start_ns) // 1_000_000
+        step.status = "failed" if error_message else "completed"
+        step.output_data = output_data
+        step.error_message = error_message
+        step.cost = cost
+        step.tokens_used = tokens_used
+        step.confidence_score = confidence_score
+        
+        # Update trace totals
+        trace.total_cost += cost
+        trace.total_tokens += tokens_used
+        
+        if step.step_type == "tool_call":
+            tool_name = step.step_name.replace("tool_call_", "")
+            if tool_name not in trace._tools_called_set:
+                trace._tools_called_set.add(tool_name)
+                trace.tools_called.append(tool_name)
+        elif step.step_type == "llm_request":
+            trace.llm_requests += 1
+        
+        # Update daily statistics
+        with self._stats_lock:
             self.stats['total_cost_today'] += cost
             self.stats['total_tokens_today'] += tokens_used
-            
-            # Log step completion
-            self.logger.log_custom_event(
-                "execution_step_completed",
-                f"Step completed: {step.step_name}",
-                {
-                    "execution_id": execution_id,
-                    "step_id": step_id,
-                    "step_name": step.step_name,
-                    "duration_ms": step.duration_ms,
-                    "status": step.status,
-                    "cost": cost,
-                    "tokens_used": tokens_used,
-                    "confidence_score": confidence_score,
-                    "error": error_message
-                }
+        
+        # Log step completion
+        self._log_event(
+            "execution_step_completed",
+            f"Step completed: {step.step_name}",
+            {
+                "execution_id": execution_id,
+                "step_id": step_id,
+                "step_name": step.step_name,
+                "duration_ms": step.duration_ms,
+                "status": step.status,
+                "cost": cost,
+                "tokens_used": tokens_used,
+                "confidence_score": confidence_score,
+                "error": error_message
+            }
+        )
+        
+        # Handle errors
+        if error_message:
+            return trace, error_message, self._record_error_locked(trace, error_message, step_id)
+        return None
+    
+    def _complete_running_step_locked(
+        self,
+        trace: ExecutionTrace
+    ) -> Optional[Tuple[ExecutionTrace, str, Dict[str, Any]]]:
+        """Complete the trace's current step, if it is still running, under the execution's lock."""
+        if trace.current_step and trace.current_step.status == "running":
+            return self._complete_step_locked(
+                trace, trace.current_step.step_id, time.monotonic_ns(), datetime.now(timezone.utc)
             )
-            
-            # Handle errors
-            if error_message:
-                self.record_error(execution_id, error_message, step_id)
+        return None
     
     def record_error(
         self,
@@ -453,43 +658,59 @@ class AgentExecutionMonitor:
         step_id: Optional[str] = None
     ):
         """Record an error during execution."""
-        with self.monitor_lock:
-            if execution_id not in self.active_executions:
+        lock, shard = self._shard(execution_id)
+        with lock:
+            trace = shard.get(execution_id)
+            if trace is None:
                 return
             
-            trace = self.active_executions[execution_id]
-            
-            # Update trace error
-            if not trace.error:
-                trace.error = error_message
-            
-            # Track error patterns
-            error_type = self._classify_error(error_message)
+            context = self._record_error_locked(trace, error_message, step_id)
+        
+        self._notify_error(trace, error_message, context)
+    
+    def _record_error_locked(
+        self,
+        trace: ExecutionTrace,
+        error_message: str,
+        step_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Record an error on a trace while holding the execution's lock; returns the log context."""
+        # Update trace error
+        if not trace.error:
+            trace.error = error_message
+        
+        # Track error patterns
+        error_type = self._classify_error(error_message)
+        with self._stats_lock:
+            if error_type not in self.error_patterns:
+                error_type = 'unknown'
             self.error_patterns[error_type] += 1
-            
-            # Log error
-            self.logger.log_error(
-                f"Execution error: {error_message}",
-                error=error_message,
-                error_type="execution_error",
-                context={
-                    "execution_id": execution_id,
-                    "agent_id": trace.context.agent_id,
-                    "step_id": step_id,
-                    "error_type": error_type
-                }
-            )
-            
-            # Trigger error callbacks
-            for callback in self.error_callbacks:
-                try:
-                    callback(trace, error_message)
-                except Exception as e:
-                    self.logger.log_error(
-                        "Error in error callback",
-                        error=str(e),
-                        error_type="callback_error"
-                    )
+        
+        return {
+            "execution_id": trace.context.execution_id,
+            "agent_id": trace.context.agent_id,
+            "step_id": step_id,
+            "error_type": error_type
+        }
+    
+    def _notify_error(self, trace: ExecutionTrace, error_message: str, context: Dict[str, Any]):
+        """Log an execution error and trigger error callbacks; call without holding any lock."""
+        self.logger.log_error(
+            f"Execution error: {error_message}",
+            error=error_message,
+            error_type="execution_error",
+            context=context
+        )
+        
+        for callback in self.error_callbacks:
+            try:
+                callback(trace, error_message)
+            except Exception as e:
+                self.logger.log_error(
+                    "Error in error callback",
+                    error=str(e),
+                    error_type="callback_error"
+                )
     
     def complete_execution(
         self,
@@ -499,15 +720,14 @@ class AgentExecutionMonitor:
         performance_metrics: Optional[Dict[str, Any]] = None
     ):
         """Complete an execution."""
-        with self.monitor_lock:
-            if execution_id not in self.active_executions:
+        lock, shard = self._shard(execution_id)
+        with lock:
+            trace = shard.get(execution_id)
+            if trace is None:
                 return
             
-            trace = self.active_executions[execution_id]
-            
             # Complete current step if running
-            if trace.current_step and trace.current_step.status == "running":
-                self.complete_execution_step(execution_id, trace.current_step.step_id)
+            pending_error = self._complete_running_step_locked(trace)
             
             # Update trace
             trace.result = result
@@ -522,20 +742,21 @@ class AgentExecutionMonitor:
             
             # Record performance metrics
             self._record_performance_metrics(trace)
+        
+        if pending_error:
+            self._notify_error(*pending_error)
     
     def get_execution_trace(self, execution_id: str) -> Optional[ExecutionTrace]:
         """Get execution trace by ID."""
-        with self.monitor_lock:
-            # Check active executions
-            if execution_id in self.active_executions:
-                return self.active_executions[execution_id]
-            
-            # Check completed executions
-            for trace in self.completed_executions:
-                if trace.context.execution_id == execution_id:
-                    return trace
-            
-            return None
+        # Check active executions
+        lock, shard = self._shard(execution_id)
+        with lock:
+            trace = shard.get(execution_id)
+            if trace is not None:
+                return trace
+        
+        # Check completed executions
+        return self._completed_index.get(execution_id)
     
     def get_active_executions(
         self,
@@ -543,55 +764,58 @@ class AgentExecutionMonitor:
         organization_id: Optional[str] = None
     ) -> List[ExecutionTrace]:
         """Get list of active executions."""
-        with self.monitor_lock:
-            executions = list(self.active_executions.values())
-            
-            if agent_id:
-                executions = [e for e in executions if e.context.agent_id == agent_id]
-            
-            if organization_id:
-                executions = [e for e in executions if e.context.organization_id == organization_id]
-            
-            return executions
+        executions = self._active_snapshot()
+        
+        if agent_id:
+            executions = [e for e in executions if e.context.agent_id == agent_id]
+        
+        if organization_id:
+            executions = [e for e in executions if e.context.organization_id == organization_id]
+        
+        return executions
     
     def get_execution_statistics(
         self,
         time_range: Optional[timedelta] = None
     ) -> Dict[str, Any]:
         """Get execution statistics."""
-        with self.monitor_lock:
+        with self._stats_lock:
             stats = self.stats.copy()
             
-            # Add queue information
-            stats['queue_details'] = {
-                priority.name.lower(): len(queue)
-                for priority, queue in self.execution_queue.items()
-            }
-            
             # Add error patterns
             stats['error_patterns'] = dict(self.error_patterns)
-            
-            # Add performance history
-            if time_range:
-                cutoff_time = datetime.now(timezone.utc) - time_range
-                recent_executions = [
-                    trace for trace in self.completed_executions
-                    if trace.completed_at and trace.completed_at >= cutoff_time
-                ]
+        
+        # Add queue information
+        # Queue size is read here rather than kept up to date on every event
+        with self._queue_lock:
+            queued = Counter(self._queued.values())
+        stats['queue_size'] = sum(queued.values())
+        stats['queue_details'] = {
+            priority.name.lower(): queued[priority]
+            for priority in ExecutionPriority
+        }
+        
+        # Add performance history
+        if time_range:
+            cutoff_time = datetime.now(timezone.utc) - time_range
+            recent_executions = [
+                trace for trace in list(self.completed_executions)
+                if trace.completed_at and trace.completed_at >= cutoff_time
+            ]
+            
+            if recent_executions:
+                total_duration = sum(trace.duration_ms or 0 for trace in recent_executions)
+                avg_duration = total_duration / len(recent_executions)
+                total_cost = sum(trace.total_cost for trace in recent_executions)
                 
-                if recent_executions:
-                    total_duration = sum(trace.duration_ms or 0 for trace in recent_executions)
-                    avg_duration = total_duration / len(recent_executions)
-                    total_cost = sum(trace.total_cost for trace in recent_executions)
-                    
-                    stats['recent_stats'] = {
-                        'count': len(recent_executions),
-                        'avg_duration_ms': avg_duration,
-                        'total_cost': total_cost,
-                        'success_rate': len([t for t in recent_executions if t.status == ExecutionStatus.COMPLETED]) / len(recent_executions) * 100
-                    }
-            
-            return stats
+                stats['recent_stats'] = {
+                    'count': len(recent_executions),
+                    'avg_duration_ms': avg_duration,
+                    'total_cost': total_cost,
+                    'success_rate': len([t for t in recent_executions if t.status == ExecutionStatus.COMPLETED]) / len(recent_executions) * 100
+                }
+        
+        return stats
     
     def get_agent_performance(
         self,
@@ -604,17 +828,16 @@ class AgentExecutionMonitor:
         # Get relevant executions
         executions = []
         
-        with self.monitor_lock:
-            # Check active executions
-            for trace in self.active_executions.values():
-                if trace.context.agent_id == agent_id:
-                    executions.append(trace)
-            
-            # Check completed executions
-            for trace in self.completed_executions:
-                if (trace.context.agent_id == agent_id and
-                    trace.started_at and trace.started_at >= cutoff_time):
-                    executions.append(trace)
+        # Check active executions
+        for trace in self._active_snapshot():
+            if trace.context.agent_id == agent_id:
+                executions.append(trace)
+        
+        # Check completed executions
+        for trace in list(self.completed_executions):
+            if (trace.context.agent_id == agent_id and
+                trace.started_at and trace.started_at >= cutoff_time):
+                executions.append(trace)
         
         if not executions:
             return {
@@ -629,16 +852,25 @@ class AgentExecutionMonitor:
                 'success_rate': 0
             }
         
-        # Calculate metrics
-        active_count = len([e for e in executions if e.status not in [ExecutionStatus.COMPLETED, ExecutionStatus.FAILED]])
-        completed_count = len([e for e in executions if e.status == ExecutionStatus.COMPLETED])
-        failed_count = len([e for e in executions if e.status == ExecutionStatus.FAILED])
-        
-        completed_executions = [e for e in executions if e.duration_ms is not None]
-        avg_duration = sum(e.duration_ms for e in completed_executions) / len(completed_executions) if completed_executions else 0
+        # Calculate metrics in one pass
+        active_count = completed_count = failed_count = 0
+        duration_sum = duration_count = 0
+        total_cost = 0.0
+        total_tokens = 0
+        for e in executions:
+            if e.status is ExecutionStatus.COMPLETED:
+                completed_count += 1
+            elif e.status is ExecutionStatus.FAILED:
+                failed_count += 1
+            else:
+                active_count += 1
+            if e.duration_ms is not None:
+                duration_sum += e.duration_ms
+                duration_count += 1
+            total_cost += e.total_cost
+            total_tokens += e.total_tokens
         
-        total_cost = sum(e.total_cost for e in executions)
-        total_tokens = sum(e.total_tokens for e in executions)
+        avg_duration = duration_sum / duration_count if duration_count else 0
         
         success_rate = (completed_count / (completed_count + failed_count) * 100) if (completed_count + failed_count) > 0 else 0
         
@@ -655,45 +887,44 @@ class AgentExecutionMonitor:
             'time_range_hours': time_range.total_seconds() / 3600 if time_range else 24
         }
     
+    def get_performance_history(self, agent_type: str) -> List[Dict[str, Any]]:
+        """Get recent performance metrics for an agent type, oldest first."""
+        with self._stats_lock:
+            history = list(self.performance_history.get(agent_type, ()))
+        
+        return [{**entry, 'timestamp': entry['timestamp'].isoformat()} for entry in history]
+    
     def add_execution_callback(self, callback: Callable[[ExecutionTrace], None]):
         """Add callback for execution events."""
-        self.execution_callbacks.append(callback)
+        with self._callbacks_lock:
+            self.execution_callbacks = (*self.execution_callbacks, callback)
     
     def add_step_callback(self, callback: Callable[[ExecutionStep], None]):
         """Add callback for step events."""
-        self.step_callbacks.append(callback)
+        with self._callbacks_lock:
+            self.step_callbacks = (*self.step_callbacks, callback)
     
     def add_error_callback(self, callback: Callable[[ExecutionTrace, str], None]):
         """Add callback for error events."""
-        self.error_callbacks.append(callback)
+        with self._callbacks_lock:
+            self.error_callbacks = (*self.error_callbacks, callback)
     
     def _classify_error(self, error_message: str) -> str:
         """Classify error type based on message."""
-        error_lower = error_message.lower()
-        
-        if 'timeout' in error_lower:
-            return 'timeout'
-        elif 'permission' in error_lower or 'unauthorized' in error_lower:
-            return 'permission'
-        elif 'rate limit' in error_lower or 'quota' in error_lower:
-            return 'rate_limit'
-        elif 'network' in error_lower or 'connection' in error_lower:
-            return 'network'
-        elif 'validation' in error_lower or 'invalid' in error_lower:
-            return 'validation'
-        elif 'llm' in error_lower or 'model' in error_lower:
-            return 'llm_error'
-        elif 'tool' in error_lower:
-            return 'tool_error'
-        else:
-            return 'unknown'
+        best = 'unknown'
+        for match in ERROR_CLASS_RE.finditer(error_message):
+            if best == 'unknown' or ERROR_CLASS_RANK[match.lastgroup] < ERROR_CLASS_RANK[best]:
+                best = match.lastgroup
+                if best == 'timeout':
+                    break
+        return best
     
     def _record_performance_metrics(self, trace: ExecutionTrace):
         """Record performance metrics for analysis."""
         if trace.duration_ms:
             agent_type = trace.context.agent_type
-            self.performance_history[agent_type].append({
-                'timestamp': trace.completed_at.isoformat(),
+            entry = {
+                'timestamp': trace.completed_at,
                 'duration_ms': trace.duration_ms,
                 'cost': trace.total_cost,
                 'tokens': trace.total_tokens,
@@ -701,26 +932,20 @@ class AgentExecutionMonitor:
                 'confidence': trace.confidence_score,
                 'tools_count': len(trace.tools_called),
                 'llm_requests': trace.llm_requests
-            })
+            }
             
-            # Keep only last 100 entries per agent type
-            if len(self.performance_history[agent_type]) > 100:
-                self.performance_history[agent_type] = self.performance_history[agent_type][-100:]
+            # History is shared by every execution of the agent type
+            with self._stats_lock:
+                self.performance_history[agent_type].append(entry)
     
     def _update_stats_loop(self):
         """Update statistics periodically."""
         while self.monitoring_active:
             try:
-                with self.monitor_lock:
-                    # Update average execution time
-                    recent_completed = [
-                        trace for trace in self.completed_executions
-                        if trace.duration_ms is not None
-                    ]
-                    
-                    if recent_completed:
-                        total_duration = sum(trace.duration_ms for trace in recent_completed[-50:])
-                        self.stats['avg_execution_time_ms'] = total_duration / len(recent_completed[-50:])
+                # Update average execution time
+                with self._stats_lock:
+                    if self._recent_durations:
+                        self.stats['avg_execution_time_ms'] = self._recent_duration_sum / len(self._recent_durations)
                 
                 # Sleep for 30 seconds
                 time.sleep(30)
@@ -740,7 +965,7 @@ class AgentExecutionMonitor:
                 # Sleep for 1 hour
                 time.sleep(3600)
                 
-                with self.monitor_lock:
+                with self._stats_lock:
                     # Reset daily stats at midnight
                     now = datetime.now(timezone.utc)
                     if now.hour == 0 and now.minute < 5:
@@ -766,6 +991,9 @@ class AgentExecutionMonitor:
         if self.cleanup_thread and self.cleanup_thread.is_alive():
             self.cleanup_thread.join(timeout=5)
         
+        if self.log_thread and self.log_thread.is_alive():
+            self.log_thread.join(timeout=5)
+        
         self.logger.log_custom_event(
             "monitoring_stopped",
             "Agent execution monitoring stopped",
@@ -3,7 +3,6 @@
 from flask import Blueprint, request, jsonify, g
 from flask_cors import cross_origin
 from functools import wraps
-import json
 import asyncio
 from datetime import datetime, timezone
 from typing import Dict, Any, List, Optional
@@ -104,7 +103,7 @@ def list_agents():
                 'created_at': agent.created_at.isoformat(),
                 'updated_at': agent.updated_at.isoformat(),
                 'description': agent.description,
-                'config': json.loads(agent.configuration) if agent.configuration else {},
+                'config': agent.configuration or {},
                 'metrics': {
                     'total_executions': metrics.total_executions if metrics else 0,
                     'success_rate': (
@@ -162,7 +161,7 @@ def create_agent():
             description=data['description'],
             org_id=g.org_id,
             user_id=g.user_id,
-            configuration=json.dumps(data.get('config', {})),
+            configuration=data.get('config', {}),
             status='active'
         )
         
@@ -252,7 +251,7 @@ def get_agent(agent_id: str):
             'type': agent.agent_type,
             'status': agent.status,
             'description': agent.description,
-            'config': json.loads(agent.configuration) if agent.configuration else {},
+            'config': agent.configuration or {},
             'created_at': agent.created_at.isoformat(),
             'updated_at': agent.updated_at.isoformat(),
             'created_by': agent.created_by,
@@ -309,7 +308,7 @@ def update_agent(agent_id: str):
         if 'description' in data:
             agent.description = data['description']
         if 'config' in data:
-            agent.configuration = json.dumps(data['config'])
+            agent.configuration = data['config']
         if 'status' in data and data['status'] in ['active', 'paused', 'disabled']:
             agent.status = data['status']
         
@@ -550,7 +549,7 @@ def get_agent_config(agent_id: str):
         if not check_agent_permission(agent_id, PermissionLevel.READ):
             return jsonify({'error': 'Permission denied'}), 403
         
-        config = json.loads(agent.configuration) if agent.configuration else {}
+        config = agent.configuration or {}
         
         # Get runtime config from agent instance
         agent_instance = agent_executor.get_agent(agent_id)
@@ -620,9 +619,9 @@ def update_agent_config(agent_id: str):
             valid_keys = ['forecast_methods', 'seasonality_detection', 'confidence_threshold']
         
         # Update config
-        current_config = json.loads(agent.configuration) if agent.configuration else {}
+        current_config = dict(agent.configuration or {})
         current_config.update(new_config)
-        agent.configuration = json.dumps(current_config)
+        agent.configuration = current_config
         agent.updated_at = datetime.now(timezone.utc)
         db.session.commit()
         
@@ -3,7 +3,6 @@
 from flask import Blueprint, request, jsonify, current_app
 from datetime import datetime
 import logging
-import json
 import uuid
 
 from agent_protocol.executors.agent_executor import get_global_executor
@@ -116,7 +115,7 @@ def create_agent():
             name=data['name'],
             description=data['description'],
             agent_type=data['type'],
-            configuration=json.dumps(data.get('configuration', {})),
+            configuration=data.get('configuration', {}),
             status='active'
         )
         
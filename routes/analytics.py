@@ -1,7 +1,6 @@
 from flask import Blueprint, request, jsonify, g
 from flask_cors import cross_origin
 from functools import wraps
-import json
 import pandas as pd
 from datetime import datetime, timedelta
 from models import db, Upload, ProcessedData
@@ -55,19 +54,19 @@ def get_dashboard_data(org_id):
         latest_upload = uploads[0]
         
         # Get processed data for the latest upload
-        analytics_data = ProcessedData.query.filter_by(
+        analytics_data = ProcessedData.query_with_payload().filter_by(
             upload_id=latest_upload.id,
             data_type='supply_chain_analytics'
         ).first()
         
-        agent_data = ProcessedData.query.filter_by(
+        agent_data = ProcessedData.query_with_payload().filter_by(
             upload_id=latest_upload.id,
             data_type='agent_insights'
         ).first()
         
         # Parse analytics and agent insights
-        analytics = json.loads(analytics_data.processed_data) if analytics_data else None
-        agent_insights = json.loads(agent_data.processed_data) if agent_data else None
+        analytics = analytics_data.processed_data if analytics_data else None
+        agent_insights = agent_data.processed_data if agent_data else None
         
         # Calculate aggregate metrics
         metrics = calculate_aggregate_metrics(uploads)
@@ -108,14 +107,14 @@ def get_upload_analytics(upload_id):
     """Get detailed analytics for a specific upload"""
     try:
         upload = Upload.query.get_or_404(upload_id)
-        processed_data = ProcessedData.query.filter_by(upload_id=upload_id).first()
+        processed_data = ProcessedData.query_with_payload().filter_by(upload_id=upload_id).first()
         
         if not processed_data:
             return jsonify({'error': 'No processed data found'}), 404
         
         # Parse the data summary
-        data_summary = json.loads(upload.data_summary) if upload.data_summary else {}
-        processed_records = json.loads(processed_data.processed_data) if processed_data.processed_data else []
+        data_summary = upload.data_summary or {}
+        processed_records = processed_data.processed_data or []
         
         # Generate specific analytics based on data type
         analytics = generate_upload_analytics(data_summary, processed_records, processed_data.data_type)
@@ -138,7 +137,7 @@ def calculate_aggregate_metrics(uploads):
     
     for upload in uploads:
         if upload.data_summary:
-            summary = json.loads(upload.data_summary)
+            summary = upload.data_summary
             analytics = summary.get('analytics', {})
             
             # Aggregate inventory data
@@ -210,7 +209,7 @@ def get_recent_activity(uploads):
     
     for upload in uploads[-10:]:  # Last 10 uploads
         if upload.data_summary:
-            summary = json.loads(upload.data_summary)
+            summary = upload.data_summary
             data_type = summary.get('data_type', 'unknown')
             
             # Generate activity based on data type
@@ -2,7 +2,6 @@ from flask import Blueprint, request, jsonify
 from insights_engine import SupplyChainInsightsEngine
 from supply_chain_engine import SupplyChainAnalyticsEngine
 from models import db, Upload, ProcessedData
-import json
 
 insights_bp = Blueprint('insights', __name__)
 insights_engine = SupplyChainInsightsEngine()
@@ -22,7 +21,7 @@ def get_user_insights(user_id):
             }), 404
         
         # Get processed data
-        processed_data = ProcessedData.query.filter_by(upload_id=latest_upload.id).first()
+        processed_data = ProcessedData.query_with_payload().filter_by(upload_id=latest_upload.id).first()
         
         if not processed_data:
             return jsonify({
@@ -31,7 +30,7 @@ def get_user_insights(user_id):
             }), 202
         
         # Parse analytics data
-        analytics_data = json.loads(processed_data.processed_data)
+        analytics_data = processed_data.processed_data
         
         # Generate comprehensive insights
         insights = insights_engine.generate_comprehensive_insights(analytics_data)
@@ -71,7 +70,7 @@ def get_role_specific_insights(user_id, role):
             }), 404
         
         # Get processed data
-        processed_data = ProcessedData.query.filter_by(upload_id=latest_upload.id).first()
+        processed_data = ProcessedData.query_with_payload().filter_by(upload_id=latest_upload.id).first()
         
         if not processed_data:
             return jsonify({
@@ -80,7 +79,7 @@ def get_role_specific_insights(user_id, role):
             }), 202
         
         # Parse analytics data
-        analytics_data = json.loads(processed_data.processed_data)
+        analytics_data = processed_data.processed_data
         
         # Generate role-specific insights
         role_insights = getattr(insights_engine, f'_generate_{role}_insights')(analytics_data)
@@ -114,7 +113,7 @@ def get_action_items(user_id):
             }), 404
         
         # Get processed data
-        processed_data = ProcessedData.query.filter_by(upload_id=latest_upload.id).first()
+        processed_data = ProcessedData.query_with_payload().filter_by(upload_id=latest_upload.id).first()
         
         if not processed_data:
             return jsonify({
@@ -123,7 +122,7 @@ def get_action_items(user_id):
             }), 202
         
         # Parse analytics data
-        analytics_data = json.loads(processed_data.processed_data)
+        analytics_data = processed_data.processed_data
         
         # Generate action items
         action_items = insights_engine._generate_action_items(analytics_data)
@@ -160,7 +159,7 @@ def get_insights_summary(user_id):
             }), 404
         
         # Get processed data
-        processed_data = ProcessedData.query.filter_by(upload_id=latest_upload.id).first()
+        processed_data = ProcessedData.query_with_payload().filter_by(upload_id=latest_upload.id).first()
         
         if not processed_data:
             return jsonify({
@@ -169,7 +168,7 @@ def get_insights_summary(user_id):
             }), 202
         
         # Parse analytics data
-        analytics_data = json.loads(processed_data.processed_data)
+        analytics_data = processed_data.processed_data
         
         # Generate comprehensive insights
         all_insights = insights_engine.generate_comprehensive_insights(analytics_data)
@@ -233,7 +232,7 @@ def share_insights(user_id):
             }), 404
         
         # Get processed data
-        processed_data = ProcessedData.query.filter_by(upload_id=latest_upload.id).first()
+        processed_data = ProcessedData.query_with_payload().filter_by(upload_id=latest_upload.id).first()
         
         if not processed_data:
             return jsonify({
@@ -242,7 +241,7 @@ def share_insights(user_id):
             }), 202
         
         # Parse analytics data
-        analytics_data = json.loads(processed_data.processed_data)
+        analytics_data = processed_data.processed_data
         
         # Generate shareable report
         share_data = {
@@ -3,7 +3,6 @@ from werkzeug.utils import secure_filename
 import os
 import pandas as pd
 from datetime import datetime
-import json
 from models import db, Upload, ProcessedData
 from supply_chain_engine import SupplyChainAnalyticsEngine
 from agent_protocol.executors.agent_executor import AgentExecutor
@@ -97,7 +96,7 @@ def upload_file():
                     'sample_data': df.head(5).to_dict(orient='records'),
                     'processing_type': 'analytics'
                 }
-                upload.data_summary = json.dumps(summary)
+                upload.data_summary = summary
                 
                 # Process with Enhanced Document Intelligence Service
                 csv_data = df.to_dict(orient='records')
@@ -130,7 +129,7 @@ def upload_file():
                     'processing_type': 'document_intelligence',
                     'status': 'ready_for_astra'
                 }
-                upload.data_summary = json.dumps(summary)
+                upload.data_summary = summary
                 
                 # Process with Enhanced Document Processor
                 from services.enhanced_document_processor import EnhancedDocumentProcessor
@@ -155,7 +154,7 @@ def upload_file():
                     upload_id=upload.id,
                     org_id=org_id,
                     data_type='unified_intelligence',
-                    processed_data=json.dumps(unified_results)
+                    processed_data=unified_results
                 )
                 db.session.add(processed_data)
                 
@@ -195,7 +194,7 @@ def upload_file():
                         upload_id=upload.id,
                         org_id=org_id,
                         data_type='unified_agent_insights',
-                        processed_data=json.dumps(agent_result.to_dict())
+                        processed_data=agent_result.to_dict()
                     )
                     db.session.add(agent_data)
                     
@@ -117,7 +117,7 @@ fi
 print_status "Step 4: Running enhanced model migration..."
 
 # Check if migration file exists
-if [ -f "migrations/002_create_enhanced_models.sql" ]; then
+if [ -f "migrations/002_create_enhanced_models.sqlite.sql" ]; then
     print_status "Found enhanced models migration, applying..."
     
     # Apply migration (this would typically use a migration tool)
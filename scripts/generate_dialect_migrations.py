@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Generate PostgreSQL migration files from the canonical SQLite migrations.
+
+Every ``migrations/<version>_<name>.sqlite.sql`` file gets a sibling
+``<version>_<name>.postgresql.sql``. The migration runner picks the file that
+matches its database type, so no SQL is rewritten at deploy time.
+
+Usage:
+    python scripts/generate_dialect_migrations.py           # (re)generate files
+    python scripts/generate_dialect_migrations.py --check   # fail if any file is stale
+"""
+
+import argparse
+import re
+import sys
+from pathlib import Path
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent.parent / 'migrations'
+
+SOURCE_SUFFIX = '.sqlite.sql'
+TARGET_SUFFIX = '.postgresql.sql'
+
+# SQLite -> PostgreSQL literal conversions
+PG_CONVERSIONS = {
+    'INTEGER PRIMARY KEY AUTOINCREMENT': 'SERIAL PRIMARY KEY',
+    'DATETIME': 'TIMESTAMP',
+    'DECIMAL(10,4)': 'NUMERIC(10,4)',
+    'DECIMAL(3,2)': 'NUMERIC(3,2)',
+    'DECIMAL(5,2)': 'NUMERIC(5,2)',
+    'DECIMAL(10,2)': 'NUMERIC(10,2)',
+    'JSON': 'JSONB',
+}
+
+# Longest keys first so that e.g. DECIMAL(10,4) wins over a shorter prefix
+PG_RE = re.compile('|'.join(
+    re.escape(key) for key in sorted(PG_CONVERSIONS, key=len, reverse=True)
+))
+
+CREATE_TABLE_RE = re.compile(r'CREATE TABLE IF NOT EXISTS (\w+)')
+INLINE_INDEX_RE = re.compile(r'^\s*INDEX (idx_\w+)\s*\(([^)\n]+)\)')
+UNIQUE_KEY_RE = re.compile(r'\bUNIQUE KEY (\w+)\s*\(')
+UNIQUE_RE = re.compile(r'\bUNIQUE\(([^)\n]+)\)')
+TRAILING_COMMA_RE = re.compile(r',(\s*(?:--.*)?)$')
+
+# PostgreSQL silently truncates longer identifiers
+PG_MAX_IDENTIFIER_LENGTH = 63
+
+
+def _drop_trailing_comma(lines: list):
+    """Remove the comma after the last column/constraint of a table body."""
+    for i in range(len(lines) - 1, -1, -1):
+        stripped = lines[i].strip()
+        if not stripped or stripped.startswith('--'):
+            continue
+        lines[i] = TRAILING_COMMA_RE.sub(r'\1', lines[i], count=1)
+        return
+
+
+def _unique_name(table: str, columns: str) -> str:
+    """Name a table's UNIQUE(...) constraint after the table and its columns."""
+    name = f"unique_{table}_{'_'.join(col.strip() for col in columns.split(','))}"
+    return name[:PG_MAX_IDENTIFIER_LENGTH]
+
+
+def convert_sql_for_postgresql(sql_content: str) -> str:
+    """Convert a SQLite migration to PostgreSQL.
+
+    Inline ``INDEX`` definitions are moved out of the table body into
+    ``CREATE INDEX`` statements after it, and anonymous ``UNIQUE(...)``
+    constraints are named ``unique_<table>_<columns>`` so that names do not
+    collide across tables.
+    """
+    output = []
+    current_table = None
+    pending_indexes = []
+
+    for line in PG_RE.sub(lambda m: PG_CONVERSIONS[m.group(0)], sql_content).split('\n'):
+        table_match = CREATE_TABLE_RE.search(line)
+        if table_match:
+            current_table = table_match.group(1)
+
+        if current_table is not None:
+            index_match = INLINE_INDEX_RE.match(line)
+            if index_match:
+                pending_indexes.append(
+                    f"CREATE INDEX IF NOT EXISTS {index_match.group(1)} "
+                    f"ON {current_table} ({index_match.group(2)});"
+                )
+                continue
+
+            line = UNIQUE_KEY_RE.sub(r'CONSTRAINT \1 UNIQUE (', line)
+            line = UNIQUE_RE.sub(
+                lambda m: f"CONSTRAINT {_unique_name(current_table, m.group(1))} UNIQUE({m.group(1)})",
+                line
+            )
+
+            if line.startswith(')'):
+                _drop_trailing_comma(output)
+                output.append(line)
+                output.extend(pending_indexes)
+                pending_indexes = []
+                current_table = None
+                continue
+
+        output.append(line)
+
+    return '\n'.join(output)
+
+
+def render(source: Path) -> str:
+    """Render the PostgreSQL file contents for a canonical migration."""
+    header = (
+        f"-- Generated from {source.name} by scripts/generate_dialect_migrations.py.\n"
+        f"-- Do not edit by hand; edit the SQLite file and regenerate.\n"
+    )
+    return header + convert_sql_for_postgresql(source.read_text())
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate PostgreSQL migration files')
+    parser.add_argument('--check', action='store_true',
+                        help='Exit non-zero if any generated file is missing or stale')
+    parser.add_argument('--migrations-dir', type=Path, default=MIGRATIONS_DIR)
+    args = parser.parse_args()
+
+    stale = []
+    for source in sorted(args.migrations_dir.glob(f'*{SOURCE_SUFFIX}')):
+        target = source.with_name(source.name[:-len(SOURCE_SUFFIX)] + TARGET_SUFFIX)
+        content = render(source)
+        if target.exists() and target.read_text() == content:
+            continue
+        if args.check:
+            stale.append(target.name)
+        else:
+            target.write_text(content)
+            print(f"Wrote {target.name}")
+
+    if stale:
+        print(f"Stale PostgreSQL migrations: {', '.join(stale)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
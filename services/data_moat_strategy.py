@@ -3,16 +3,18 @@ Finkargo Data Moat Strategy Service
 The ultimate competitive advantage through unified document intelligence
 """
 
+import heapq
 import json
 import numpy as np
 from datetime import datetime, timedelta
+from operator import itemgetter
 from typing import Dict, List, Any, Optional
 from sqlalchemy import func, and_, desc
 from models import db
 from models_enhanced import (
     TradeFinanceTransaction, CustomerIntelligence, MarketIntelligence,
     MarketplaceIntelligence, FeedbackCollection, CompetitorIntelligence,
-    DataQualityMetrics, APIIntegration
+    DataQualityMetrics, APIIntegration, cached_intelligence
 )
 from services.intelligence_extraction import IntelligenceExtractionService
 from services.unified_document_intelligence_service import UnifiedDocumentIntelligenceService
@@ -20,6 +22,9 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# The market moat is the same for every organization; bump the version when its shape changes
+MARKET_MOAT_CACHE_KEY = 'market_moat:v1'
+
 
 class DataMoatStrategyService:
     """
@@ -97,10 +102,16 @@ class DataMoatStrategyService:
     def _build_market_intelligence_moat(self, org_id: str) -> Dict[str, Any]:
         """
         Build market intelligence moat through cross-customer data aggregation
+        
+        The result only depends on the market tables, so it is served from the
+        intelligence cache until the next aggregation invalidates it.
         """
+        return cached_intelligence(MARKET_MOAT_CACHE_KEY, self._compute_market_intelligence_moat)
+    
+    def _compute_market_intelligence_moat(self) -> Dict[str, Any]:
+        """Market trends, concentration and opportunities across all market intelligence"""
         # Get market intelligence data
-        market_data = MarketIntelligence.query.all()
-        marketplace_data = MarketplaceIntelligence.query.all()
+        market_data = MarketIntelligence.analysis_rows()
         
         if not market_data:
             return {'status': 'building', 'data_points': 0}
@@ -289,16 +300,17 @@ class DataMoatStrategyService:
             if txn.product_category:
                 category_totals[txn.product_category] = category_totals.get(txn.product_category, 0) + txn.amount_usd
         
-        # Sort by total amount
-        sorted_categories = sorted(category_totals.items(), key=lambda x: x[1], reverse=True)
+        # Top 5 categories by total amount
+        top_categories = heapq.nlargest(5, category_totals.items(), key=itemgetter(1))
+        total_amount = sum(category_totals.values())
         
         return [
             {
                 'category': category,
                 'total_amount': amount,
-                'percentage': (amount / sum(category_totals.values())) * 100
+                'percentage': (amount / total_amount) * 100
             }
-            for category, amount in sorted_categories[:5]  # Top 5 categories
+            for category, amount in top_categories
         ]
     
     def _analyze_seasonal_patterns(self, transactions: List[TradeFinanceTransaction]) -> Dict:
@@ -185,17 +185,29 @@ class EnhancedDocumentProcessor(TradeDocumentProcessor):
             'timeline_updates': []
         }
         
+        # Load the existing transactions for every SKU in the document in one
+        # query. The new transactions are saved later with bulk_insert and are
+        # never in the session, so there is nothing to autoflush first.
+        skus = {transaction.sku for transaction in new_transactions if transaction.sku}
+        related_by_sku = defaultdict(list)
+        if skus:
+            with db.session.no_autoflush:
+                existing = UnifiedTransaction.query.filter(
+                    UnifiedTransaction.org_id == org_id,
+                    UnifiedTransaction.sku.in_(skus)
+                )
+                for related in existing:
+                    related_by_sku[related.sku].append(related)
+        
         for transaction in new_transactions:
             if not transaction.sku:
                 continue
             
-            # Find related transactions for same SKU
-            related_transactions = UnifiedTransaction.query.filter_by(
-                org_id=org_id,
-                sku=transaction.sku
-            ).filter(
-                UnifiedTransaction.transaction_id != transaction.transaction_id
-            ).all()
+            # Related transactions for same SKU
+            related_transactions = [
+                related for related in related_by_sku[transaction.sku]
+                if related.transaction_id != transaction.transaction_id
+            ]
             
             for related in related_transactions:
                 # Check for cost variances
@@ -272,13 +284,15 @@ class EnhancedDocumentProcessor(TradeDocumentProcessor):
                 })
         
         # Update transaction statuses
+        compromised_by_sku = defaultdict(list)
+        for item in inventory_updates['compromised_items']:
+            compromised_by_sku[item['sku']].append(item)
+        
         for transaction in transactions:
-            if transaction.sku in [item['sku'] for item in inventory_updates['compromised_items']]:
+            flags = compromised_by_sku.get(transaction.sku)
+            if flags:
                 transaction.inventory_status = 'compromised'
-                transaction.anomaly_flags = [
-                    item for item in inventory_updates['compromised_items'] 
-                    if item['sku'] == transaction.sku
-                ]
+                transaction.anomaly_flags = list(flags)
         
         return inventory_updates
     
@@ -319,8 +333,7 @@ class EnhancedDocumentProcessor(TradeDocumentProcessor):
     def _save_transactions_to_db(self, transactions: List[UnifiedTransaction]):
         """Save unified transactions to database"""
         try:
-            for transaction in transactions:
-                db.session.add(transaction)
+            UnifiedTransaction.bulk_insert_instances(db.session, transactions)
             db.session.commit()
         except Exception as e:
             db.session.rollback()
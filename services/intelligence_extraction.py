@@ -3,15 +3,18 @@ Intelligence Extraction Service for Finkargo Data Moat
 Extracts maximum value from every user interaction and transaction
 """
 
+import heapq
 import json
 from datetime import datetime, timedelta
+from operator import itemgetter
 from typing import Dict, List, Any, Optional
 import numpy as np
 from sqlalchemy import func, and_
 from models import db
 from models_enhanced import (
     TradeFinanceTransaction, CustomerIntelligence, MarketIntelligence,
-    MarketplaceIntelligence, FeedbackCollection, CompetitorIntelligence, APIIntegration
+    MarketplaceIntelligence, MarketplaceTransactionAggregate, FeedbackCollection,
+    CompetitorIntelligence, APIIntegration, invalidate_intelligence_cache
 )
 import logging
 
@@ -158,6 +161,10 @@ class IntelligenceExtractionService:
     def aggregate_market_intelligence(self, time_period: datetime) -> None:
         """Aggregate individual transactions into market intelligence"""
         try:
+            if self._use_aggregate_view():
+                # Aggregate every category/region/month in one pass inside PostgreSQL
+                MarketplaceTransactionAggregate.refresh(db.session)
+            
             # Get all product categories and regions
             categories = db.session.query(
                 TradeFinanceTransaction.product_category,
@@ -186,6 +193,7 @@ class IntelligenceExtractionService:
                         )
             
             db.session.commit()
+            invalidate_intelligence_cache()
             logger.info(f"Successfully aggregated market intelligence for {time_period}")
             
         except Exception as e:
@@ -196,8 +204,10 @@ class IntelligenceExtractionService:
                                       time_period: datetime) -> Dict:
         """Aggregate data for specific category and region"""
         # Get transactions for the period
-        start_date = time_period.replace(day=1)
-        end_date = (start_date + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+        start_date, end_date = self._month_bounds(time_period)
+        
+        if self._use_aggregate_view():
+            return self._read_category_region_aggregate(category, region, start_date)
         
         transactions = TradeFinanceTransaction.query.filter(
             and_(
@@ -230,6 +240,40 @@ class IntelligenceExtractionService:
         
         return aggregated
     
+    def _month_bounds(self, time_period: datetime):
+        """First and last day of time_period's month"""
+        start_date = time_period.replace(day=1)
+        end_date = (start_date + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+        return start_date, end_date
+    
+    def _use_aggregate_view(self) -> bool:
+        """The aggregate materialized view only exists on PostgreSQL"""
+        return db.session.get_bind().dialect.name == 'postgresql'
+    
+    def _read_category_region_aggregate(self, category: str, region: str,
+                                        start_date: datetime) -> Dict:
+        """Read precomputed aggregates for a category, region and month"""
+        row = MarketplaceTransactionAggregate.query.filter_by(
+            product_category=category,
+            supplier_region=region,
+            time_period=start_date.date()
+        ).first()
+        
+        if not row:
+            return {'data_points': 0}
+        
+        return {
+            'data_points': row.transaction_count,
+            'total_volume': row.total_volume,
+            'average_transaction': row.average_transaction,
+            'price_volatility': row.amount_stddev / row.average_transaction if row.average_transaction else 0,
+            'average_lead_time': row.average_lead_time,
+            'average_risk_score': row.average_risk_score,
+            'unique_suppliers': row.unique_suppliers,
+            'unique_importers': row.unique_importers,
+            'confidence': min(row.transaction_count / 100, 1.0)
+        }
+    
     def _update_market_intelligence_record(self, category: str, region: str,
                                          time_period: datetime, data: Dict) -> None:
         """Update or create market intelligence record"""
@@ -515,12 +559,12 @@ class IntelligenceExtractionService:
             'supplier_intelligence': {
                 'total_suppliers': len(supplier_volumes),
                 'supplier_concentration': supplier_concentration,
-                'top_suppliers': sorted(supplier_volumes.items(), key=lambda x: x[1], reverse=True)[:5],
+                'top_suppliers': heapq.nlargest(5, supplier_volumes.items(), key=itemgetter(1)),
                 'geographic_distribution': supplier_countries
             },
             'product_intelligence': {
                 'product_categories': len(product_volumes),
-                'top_categories': sorted(product_volumes.items(), key=lambda x: x[1], reverse=True)[:5],
+                'top_categories': heapq.nlargest(5, product_volumes.items(), key=itemgetter(1)),
                 'category_concentration': sum((vol/total_volume)**2 for vol in product_volumes.values()) if total_volume > 0 else 0
             }
         }
@@ -636,12 +680,12 @@ class IntelligenceExtractionService:
                 'total_categories': len(product_demand),
                 'market_concentration': market_concentration,
                 'category_breakdown': product_demand,
-                'top_categories': sorted(product_demand.items(), key=lambda x: x[1]['total_volume'], reverse=True)[:5]
+                'top_categories': heapq.nlargest(5, product_demand.items(), key=lambda x: x[1]['total_volume'])
             },
             'geographic_market_intelligence': {
                 'total_regions': len(geographic_markets),
                 'regional_breakdown': geographic_markets,
-                'top_regions': sorted(geographic_markets.items(), key=lambda x: x[1], reverse=True)[:5]
+                'top_regions': heapq.nlargest(5, geographic_markets.items(), key=itemgetter(1))
             },
             'market_efficiency': {
                 'average_supplier_diversity': np.mean([data['supplier_diversity'] for data in product_demand.values()]),
@@ -915,7 +959,7 @@ class IntelligenceExtractionService:
         # Market positioning analysis
         market_positioning = {
             'competitor_count': len(competitor_mentions),
-            'top_competitors': sorted(competitor_mentions.items(), key=lambda x: x[1]['mention_count'], reverse=True)[:5],
+            'top_competitors': heapq.nlargest(5, competitor_mentions.items(), key=lambda x: x[1]['mention_count']),
             'competitive_landscape': {
                 'direct_competitors': [c for c, d in competitor_mentions.items() if d['average_sentiment'] < 0],
                 'indirect_competitors': [c for c, d in competitor_mentions.items() if d['average_sentiment'] >= 0],
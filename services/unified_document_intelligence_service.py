@@ -106,8 +106,7 @@ class UnifiedDocumentIntelligenceService:
             )
             
             # 3. Store unified transactions
-            for transaction in unified_transactions:
-                db.session.add(transaction)
+            UnifiedTransaction.bulk_insert_instances(db.session, unified_transactions)
             
             # 4. Cross-reference with existing CSV data
             csv_cross_reference = await self._cross_reference_document_with_csv(
@@ -68,8 +68,8 @@ class AgentSystemStartup:
         
         try:
             migration_runner = MigrationRunner()
-            migration_runner.run_migrations()
-            logger.info("Database migrations completed successfully")
+            migration_runner.start()
+            logger.info(f"Database migrations handled (mode: {migration_runner.mode})")
             return True
         except Exception as e:
             logger.error(f"Database migration failed: {e}")
@@ -0,0 +1,13 @@
+-- Migration: Convert JSON text columns to JSONB
+-- Description: Store uploads.data_summary, processed_data.processed_data and
+--              agents.configuration as JSONB so PostgreSQL parses them once on write
+-- Date: 2026-10-18
+
+ALTER TABLE "public"."uploads"
+    ALTER COLUMN "data_summary" TYPE jsonb USING "data_summary"::jsonb;
+
+ALTER TABLE "public"."agents"
+    ALTER COLUMN "configuration" TYPE jsonb USING "configuration"::jsonb;
+
+ALTER TABLE IF EXISTS "public"."processed_data"
+    ALTER COLUMN "processed_data" TYPE jsonb USING "processed_data"::jsonb;
@@ -0,0 +1,10 @@
+-- Migration: Add composite org/time indexes for analytics tables
+-- Description: Support "latest per org" and "recent alerts per org" reads with index range scans.
+--              financial_metrics and document_analytics are already covered by their
+--              UNIQUE (org_id, period_date) constraints.
+-- Date: 2026-10-18
+
+CREATE INDEX IF NOT EXISTS "idx_triangle_scores_org_calculated" ON "public"."triangle_scores" ("org_id", "calculated_at");
+CREATE INDEX IF NOT EXISTS "idx_product_analytics_org_updated" ON "public"."product_analytics" ("org_id", "last_updated");
+CREATE INDEX IF NOT EXISTS "idx_supplier_performance_org_evaluated" ON "public"."supplier_performance" ("org_id", "last_evaluated");
+CREATE INDEX IF NOT EXISTS "idx_alert_instances_org_status_created" ON "public"."alert_instances" ("org_id", "status", "created_at");
@@ -0,0 +1,19 @@
+-- Migration: Convert analytics primary keys to native UUID
+-- Description: Store analytics ids as 16-byte uuid values instead of varchar(36) text.
+--              trade_documents keeps varchar ids because its document ids are referenced
+--              as strings by unified_transactions, document_inventory_links and shipment_tracking.
+-- Date: 2026-10-18
+
+ALTER TABLE IF EXISTS "public"."alert_instances" DROP CONSTRAINT IF EXISTS "alert_instances_alert_rule_id_fkey";
+
+ALTER TABLE IF EXISTS "public"."triangle_scores" ALTER COLUMN "id" TYPE uuid USING "id"::uuid;
+ALTER TABLE IF EXISTS "public"."product_analytics" ALTER COLUMN "id" TYPE uuid USING "id"::uuid;
+ALTER TABLE IF EXISTS "public"."supplier_performance" ALTER COLUMN "id" TYPE uuid USING "id"::uuid;
+ALTER TABLE IF EXISTS "public"."financial_metrics" ALTER COLUMN "id" TYPE uuid USING "id"::uuid;
+ALTER TABLE IF EXISTS "public"."alert_rules" ALTER COLUMN "id" TYPE uuid USING "id"::uuid;
+ALTER TABLE IF EXISTS "public"."alert_instances" ALTER COLUMN "id" TYPE uuid USING "id"::uuid;
+ALTER TABLE IF EXISTS "public"."alert_instances" ALTER COLUMN "alert_rule_id" TYPE uuid USING "alert_rule_id"::uuid;
+ALTER TABLE IF EXISTS "public"."document_analytics" ALTER COLUMN "id" TYPE uuid USING "id"::uuid;
+ALTER TABLE IF EXISTS "public"."shipment_tracking" ALTER COLUMN "id" TYPE uuid USING "id"::uuid;
+
+ALTER TABLE IF EXISTS "public"."alert_instances" ADD CONSTRAINT "alert_instances_alert_rule_id_fkey" FOREIGN KEY ("alert_rule_id") REFERENCES "public"."alert_rules"("id");
@@ -0,0 +1,73 @@
+-- Migration: Convert data moat JSON columns to JSONB
+-- Description: Store the models_enhanced JSON columns as JSONB and add GIN
+--              indexes for the columns queried by containment (@>, ?)
+-- Date: 2026-10-18
+
+ALTER TABLE IF EXISTS "public"."customer_intelligence"
+    ALTER COLUMN "preferred_suppliers" TYPE jsonb USING "preferred_suppliers"::jsonb,
+    ALTER COLUMN "seasonal_patterns" TYPE jsonb USING "seasonal_patterns"::jsonb,
+    ALTER COLUMN "product_preferences" TYPE jsonb USING "product_preferences"::jsonb,
+    ALTER COLUMN "feature_usage_pattern" TYPE jsonb USING "feature_usage_pattern"::jsonb,
+    ALTER COLUMN "pain_points" TYPE jsonb USING "pain_points"::jsonb,
+    ALTER COLUMN "feature_requests" TYPE jsonb USING "feature_requests"::jsonb,
+    ALTER COLUMN "competitors_used" TYPE jsonb USING "competitors_used"::jsonb;
+
+ALTER TABLE IF EXISTS "public"."market_intelligence"
+    ALTER COLUMN "top_importers" TYPE jsonb USING "top_importers"::jsonb,
+    ALTER COLUMN "market_share_distribution" TYPE jsonb USING "market_share_distribution"::jsonb;
+
+ALTER TABLE IF EXISTS "public"."marketplace_intelligence"
+    ALTER COLUMN "top_quartile_metrics" TYPE jsonb USING "top_quartile_metrics"::jsonb,
+    ALTER COLUMN "median_metrics" TYPE jsonb USING "median_metrics"::jsonb,
+    ALTER COLUMN "bottom_quartile_metrics" TYPE jsonb USING "bottom_quartile_metrics"::jsonb,
+    ALTER COLUMN "supplier_performance_scores" TYPE jsonb USING "supplier_performance_scores"::jsonb,
+    ALTER COLUMN "demand_trends" TYPE jsonb USING "demand_trends"::jsonb,
+    ALTER COLUMN "pricing_trends" TYPE jsonb USING "pricing_trends"::jsonb,
+    ALTER COLUMN "supply_chain_trends" TYPE jsonb USING "supply_chain_trends"::jsonb,
+    ALTER COLUMN "demand_forecast" TYPE jsonb USING "demand_forecast"::jsonb,
+    ALTER COLUMN "price_forecast" TYPE jsonb USING "price_forecast"::jsonb,
+    ALTER COLUMN "risk_forecast" TYPE jsonb USING "risk_forecast"::jsonb;
+
+ALTER TABLE IF EXISTS "public"."feedback_collection"
+    ALTER COLUMN "emotion_tags" TYPE jsonb USING "emotion_tags"::jsonb,
+    ALTER COLUMN "key_topics" TYPE jsonb USING "key_topics"::jsonb,
+    ALTER COLUMN "entities_mentioned" TYPE jsonb USING "entities_mentioned"::jsonb,
+    ALTER COLUMN "action_items" TYPE jsonb USING "action_items"::jsonb,
+    ALTER COLUMN "pain_points" TYPE jsonb USING "pain_points"::jsonb,
+    ALTER COLUMN "competitor_mentions" TYPE jsonb USING "competitor_mentions"::jsonb,
+    ALTER COLUMN "feature_requests" TYPE jsonb USING "feature_requests"::jsonb,
+    ALTER COLUMN "pricing_feedback" TYPE jsonb USING "pricing_feedback"::jsonb;
+
+ALTER TABLE IF EXISTS "public"."api_integrations"
+    ALTER COLUMN "field_mappings" TYPE jsonb USING "field_mappings"::jsonb,
+    ALTER COLUMN "data_transformations" TYPE jsonb USING "data_transformations"::jsonb,
+    ALTER COLUMN "intelligence_types" TYPE jsonb USING "intelligence_types"::jsonb;
+
+ALTER TABLE IF EXISTS "public"."competitor_intelligence"
+    ALTER COLUMN "key_features" TYPE jsonb USING "key_features"::jsonb,
+    ALTER COLUMN "pricing_model" TYPE jsonb USING "pricing_model"::jsonb,
+    ALTER COLUMN "target_customers" TYPE jsonb USING "target_customers"::jsonb,
+    ALTER COLUMN "unique_selling_points" TYPE jsonb USING "unique_selling_points"::jsonb,
+    ALTER COLUMN "strengths" TYPE jsonb USING "strengths"::jsonb,
+    ALTER COLUMN "weaknesses" TYPE jsonb USING "weaknesses"::jsonb,
+    ALTER COLUMN "opportunities" TYPE jsonb USING "opportunities"::jsonb,
+    ALTER COLUMN "threats" TYPE jsonb USING "threats"::jsonb,
+    ALTER COLUMN "common_complaints" TYPE jsonb USING "common_complaints"::jsonb,
+    ALTER COLUMN "switching_triggers" TYPE jsonb USING "switching_triggers"::jsonb,
+    ALTER COLUMN "data_sources" TYPE jsonb USING "data_sources"::jsonb;
+
+ALTER TABLE IF EXISTS "public"."data_quality_metrics"
+    ALTER COLUMN "premium_features_unlocked" TYPE jsonb USING "premium_features_unlocked"::jsonb;
+
+ALTER TABLE IF EXISTS "public"."unified_transactions"
+    ALTER COLUMN "anomaly_flags" TYPE jsonb USING "anomaly_flags"::jsonb;
+
+ALTER TABLE IF EXISTS "public"."document_inventory_links"
+    ALTER COLUMN "compromise_reasons" TYPE jsonb USING "compromise_reasons"::jsonb;
+
+CREATE INDEX IF NOT EXISTS idx_customer_intelligence_preferred_suppliers_gin ON customer_intelligence USING gin (preferred_suppliers);
+CREATE INDEX IF NOT EXISTS idx_customer_intelligence_pain_points_gin ON customer_intelligence USING gin (pain_points);
+CREATE INDEX IF NOT EXISTS idx_feedback_collection_key_topics_gin ON feedback_collection USING gin (key_topics);
+CREATE INDEX IF NOT EXISTS idx_feedback_collection_entities_mentioned_gin ON feedback_collection USING gin (entities_mentioned);
+CREATE INDEX IF NOT EXISTS idx_feedback_collection_competitor_mentions_gin ON feedback_collection USING gin (competitor_mentions);
+CREATE INDEX IF NOT EXISTS idx_competitor_intelligence_key_features_gin ON competitor_intelligence USING gin (key_features);
@@ -0,0 +1,14 @@
+-- Migration: Convert data moat primary keys to native UUID
+-- Description: Store models_enhanced ids as 16-byte uuid values instead of varchar(36) text.
+--              New ids are time-ordered (UUIDv7) and generated by the application.
+-- Date: 2026-10-18
+
+ALTER TABLE IF EXISTS "public"."trade_finance_transactions" ALTER COLUMN "id" TYPE uuid USING "id"::uuid;
+ALTER TABLE IF EXISTS "public"."customer_intelligence" ALTER COLUMN "id" TYPE uuid USING "id"::uuid;
+ALTER TABLE IF EXISTS "public"."market_intelligence" ALTER COLUMN "id" TYPE uuid USING "id"::uuid;
+ALTER TABLE IF EXISTS "public"."marketplace_intelligence" ALTER COLUMN "id" TYPE uuid USING "id"::uuid;
+ALTER TABLE IF EXISTS "public"."feedback_collection" ALTER COLUMN "id" TYPE uuid USING "id"::uuid;
+ALTER TABLE IF EXISTS "public"."api_integrations" ALTER COLUMN "id" TYPE uuid USING "id"::uuid;
+ALTER TABLE IF EXISTS "public"."competitor_intelligence" ALTER COLUMN "id" TYPE uuid USING "id"::uuid;
+ALTER TABLE IF EXISTS "public"."data_quality_metrics" ALTER COLUMN "id" TYPE uuid USING "id"::uuid;
+ALTER TABLE IF EXISTS "public"."document_inventory_links" ALTER COLUMN "id" TYPE uuid USING "id"::uuid;
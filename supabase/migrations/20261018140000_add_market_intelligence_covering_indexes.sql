@@ -0,0 +1,13 @@
+-- Migration: Add covering indexes for market intelligence dashboards
+-- Description: Region dashboards filter market_intelligence and marketplace_intelligence
+--              by region, order by time_period and aggregate a few numeric columns.
+--              INCLUDE those columns so the aggregates are served by index-only scans.
+-- Date: 2026-10-18
+
+CREATE INDEX IF NOT EXISTS idx_market_intelligence_region_period
+    ON market_intelligence (geographic_region, time_period, product_category)
+    INCLUDE (average_unit_price, total_market_demand, demand_growth_rate);
+
+CREATE INDEX IF NOT EXISTS idx_marketplace_intelligence_region_period
+    ON marketplace_intelligence (geographic_region, time_period, intelligence_type)
+    INCLUDE (total_transaction_volume, transaction_count);
@@ -0,0 +1,118 @@
+-- Migration: Partition market intelligence tables by month
+-- Description: Rebuild market_intelligence and marketplace_intelligence as tables
+--              range-partitioned on time_period, one partition per month, so
+--              time-windowed queries only scan the months they touch.
+--              The partition key has to be part of every unique constraint, so the
+--              primary keys become (id, time_period). The single-column time_period
+--              indexes are not recreated; partition pruning and the unique constraints,
+--              which now lead with time_period, cover those lookups.
+-- Date: 2026-10-18
+
+-- Creates the monthly partitions of a table for every month from from_month
+-- through to_month. Existing partitions are left alone.
+CREATE OR REPLACE FUNCTION public.create_monthly_partitions(parent_table text, from_month date, to_month date)
+RETURNS void
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    month_start date := date_trunc('month', from_month)::date;
+BEGIN
+    WHILE month_start <= to_month LOOP
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS public.%I PARTITION OF public.%I FOR VALUES FROM (%L) TO (%L)',
+            parent_table || '_' || to_char(month_start, 'YYYY_MM'),
+            parent_table,
+            month_start,
+            (month_start + interval '1 month')::date
+        );
+        month_start := (month_start + interval '1 month')::date;
+    END LOOP;
+END;
+$$;
+
+-- Keeps partitions for the current and next three months in place
+CREATE OR REPLACE FUNCTION public.create_upcoming_market_intelligence_partitions()
+RETURNS void
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    PERFORM public.create_monthly_partitions('market_intelligence', current_date, (current_date + interval '3 months')::date);
+    PERFORM public.create_monthly_partitions('marketplace_intelligence', current_date, (current_date + interval '3 months')::date);
+END;
+$$;
+
+-- market_intelligence
+ALTER TABLE public.market_intelligence RENAME TO market_intelligence_unpartitioned;
+
+CREATE TABLE public.market_intelligence (
+    LIKE public.market_intelligence_unpartitioned INCLUDING DEFAULTS
+) PARTITION BY RANGE (time_period);
+
+CREATE TABLE public.market_intelligence_default PARTITION OF public.market_intelligence DEFAULT;
+
+SELECT public.create_monthly_partitions(
+    'market_intelligence',
+    COALESCE((SELECT min(time_period) FROM public.market_intelligence_unpartitioned), current_date),
+    (current_date + interval '3 months')::date
+);
+
+INSERT INTO public.market_intelligence SELECT * FROM public.market_intelligence_unpartitioned;
+DROP TABLE public.market_intelligence_unpartitioned;
+
+ALTER TABLE public.market_intelligence ADD PRIMARY KEY (id, time_period);
+ALTER TABLE public.market_intelligence
+    ADD CONSTRAINT market_intelligence_period_scope_key
+    UNIQUE (time_period, product_category, geographic_region, country);
+
+CREATE INDEX IF NOT EXISTS idx_market_intelligence_category ON public.market_intelligence (product_category);
+CREATE INDEX IF NOT EXISTS idx_market_intelligence_region ON public.market_intelligence (geographic_region);
+CREATE INDEX IF NOT EXISTS idx_market_intelligence_region_period
+    ON public.market_intelligence (geographic_region, time_period, product_category)
+    INCLUDE (average_unit_price, total_market_demand, demand_growth_rate);
+
+COMMENT ON TABLE public.market_intelligence IS 'Aggregated market data for specific product categories and regions';
+
+-- marketplace_intelligence
+ALTER TABLE public.marketplace_intelligence RENAME TO marketplace_intelligence_unpartitioned;
+
+CREATE TABLE public.marketplace_intelligence (
+    LIKE public.marketplace_intelligence_unpartitioned INCLUDING DEFAULTS
+) PARTITION BY RANGE (time_period);
+
+CREATE TABLE public.marketplace_intelligence_default PARTITION OF public.marketplace_intelligence DEFAULT;
+
+SELECT public.create_monthly_partitions(
+    'marketplace_intelligence',
+    COALESCE((SELECT min(time_period) FROM public.marketplace_intelligence_unpartitioned), current_date),
+    (current_date + interval '3 months')::date
+);
+
+INSERT INTO public.marketplace_intelligence SELECT * FROM public.marketplace_intelligence_unpartitioned;
+DROP TABLE public.marketplace_intelligence_unpartitioned;
+
+ALTER TABLE public.marketplace_intelligence ADD PRIMARY KEY (id, time_period);
+ALTER TABLE public.marketplace_intelligence
+    ADD CONSTRAINT marketplace_intelligence_period_scope_key
+    UNIQUE (time_period, intelligence_type, product_category, geographic_region);
+
+CREATE INDEX IF NOT EXISTS idx_marketplace_intelligence_type ON public.marketplace_intelligence (intelligence_type);
+CREATE INDEX IF NOT EXISTS idx_marketplace_intelligence_category ON public.marketplace_intelligence (product_category);
+CREATE INDEX IF NOT EXISTS idx_marketplace_intelligence_region ON public.marketplace_intelligence (geographic_region);
+CREATE INDEX IF NOT EXISTS idx_marketplace_intelligence_region_period
+    ON public.marketplace_intelligence (geographic_region, time_period, intelligence_type)
+    INCLUDE (total_transaction_volume, transaction_count);
+
+COMMENT ON TABLE public.marketplace_intelligence IS 'Anonymized and aggregated data for the marketplace';
+
+-- Create next months' partitions ahead of time when pg_cron is available
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_cron') THEN
+        PERFORM cron.schedule(
+            'create-market-intelligence-partitions',
+            '0 3 1 * *',
+            'SELECT public.create_upcoming_market_intelligence_partitions()'
+        );
+    END IF;
+END;
+$$;
@@ -0,0 +1,59 @@
+-- Migration: Store narrow-domain string columns as SMALLINT codes
+-- Description: Each value is stored as its 1-based position in the matching tuple in
+--              models_enhanced.py (e.g. FEEDBACK_STATUSES). Values outside the domain
+--              become NULL. Indexes on these columns are rebuilt by ALTER COLUMN TYPE.
+-- Date: 2026-10-18
+
+ALTER TABLE IF EXISTS "public"."trade_finance_transactions"
+    ALTER COLUMN "transaction_type" TYPE smallint USING CASE "transaction_type"
+        WHEN 'LC' THEN 1
+        WHEN 'factoring' THEN 2
+        WHEN 'credit_insurance' THEN 3
+        WHEN 'trade_loan' THEN 4
+    END;
+
+ALTER TABLE IF EXISTS "public"."market_intelligence"
+    ALTER COLUMN "price_trend" TYPE smallint USING CASE "price_trend"
+        WHEN 'increasing' THEN 1
+        WHEN 'decreasing' THEN 2
+        WHEN 'stable' THEN 3
+    END;
+
+ALTER TABLE IF EXISTS "public"."marketplace_intelligence"
+    ALTER COLUMN "tier_required" TYPE smallint USING CASE "tier_required"
+        WHEN 'free' THEN 1
+        WHEN 'basic' THEN 2
+        WHEN 'premium' THEN 3
+        WHEN 'enterprise' THEN 4
+    END;
+
+ALTER TABLE IF EXISTS "public"."feedback_collection"
+    ALTER COLUMN "status" TYPE smallint USING CASE "status"
+        WHEN 'new' THEN 1
+        WHEN 'in_review' THEN 2
+        WHEN 'actioned' THEN 3
+        WHEN 'closed' THEN 4
+    END;
+
+ALTER TABLE IF EXISTS "public"."feedback_collection"
+    ALTER COLUMN "priority" TYPE smallint USING CASE "priority"
+        WHEN 'low' THEN 1
+        WHEN 'medium' THEN 2
+        WHEN 'high' THEN 3
+        WHEN 'critical' THEN 4
+    END;
+
+ALTER TABLE IF EXISTS "public"."api_integrations"
+    ALTER COLUMN "status" TYPE smallint USING CASE "status"
+        WHEN 'active' THEN 1
+        WHEN 'paused' THEN 2
+        WHEN 'error' THEN 3
+        WHEN 'pending' THEN 4
+    END;
+
+ALTER TABLE IF EXISTS "public"."data_quality_metrics"
+    ALTER COLUMN "quality_tier" TYPE smallint USING CASE "quality_tier"
+        WHEN 'gold' THEN 1
+        WHEN 'silver' THEN 2
+        WHEN 'bronze' THEN 3
+    END;
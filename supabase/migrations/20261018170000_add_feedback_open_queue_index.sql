@@ -0,0 +1,8 @@
+-- Migration: Add partial index for the feedback triage queue
+-- Description: Index only open feedback (status codes 1 = new, 2 = in_review) by
+--              priority and age, so the triage queue stays small as closed rows pile up
+-- Date: 2026-10-18
+
+CREATE INDEX IF NOT EXISTS idx_feedback_collection_open_queue
+    ON feedback_collection (priority DESC, created_at)
+    WHERE status IN (1, 2);
@@ -0,0 +1,41 @@
+-- Migration: Materialize monthly trade finance aggregates
+-- Description: Aggregate trade_finance_transactions per product category, supplier
+--              region and month inside PostgreSQL. The market intelligence job reads
+--              these rows instead of loading every transaction into Python.
+--              Falsy lead times and risk scores are ignored, as in the Python path.
+-- Date: 2026-10-18
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS public.marketplace_transaction_aggregates AS
+SELECT
+    product_category,
+    supplier_region,
+    date_trunc('month', transaction_date)::date AS time_period,
+    count(*)::integer AS transaction_count,
+    sum(amount_usd) AS total_volume,
+    avg(amount_usd) AS average_transaction,
+    stddev_pop(amount_usd) AS amount_stddev,
+    avg(NULLIF(cash_conversion_days, 0)) AS average_lead_time,
+    avg(NULLIF(transaction_risk_score, 0)) AS average_risk_score,
+    count(DISTINCT supplier_name)::integer AS unique_suppliers,
+    count(DISTINCT importer_org_id)::integer AS unique_importers
+FROM public.trade_finance_transactions
+WHERE product_category IS NOT NULL AND supplier_region IS NOT NULL
+GROUP BY 1, 2, 3
+WITH DATA;
+
+-- Required by REFRESH MATERIALIZED VIEW CONCURRENTLY
+CREATE UNIQUE INDEX IF NOT EXISTS idx_marketplace_transaction_aggregates_scope
+    ON public.marketplace_transaction_aggregates (product_category, supplier_region, time_period);
+
+-- Refresh nightly when pg_cron is available
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_cron') THEN
+        PERFORM cron.schedule(
+            'refresh-marketplace-transaction-aggregates',
+            '30 2 * * *',
+            'REFRESH MATERIALIZED VIEW CONCURRENTLY public.marketplace_transaction_aggregates'
+        );
+    END IF;
+END;
+$$;
@@ -0,0 +1,25 @@
+-- Migration: Store marketplace forecast and trend blobs compressed
+-- Description: These documents are always read and written whole, so the application
+--              stores them as zlib-compressed bytea (models.CompressedJSON). Existing
+--              values are converted to uncompressed JSON bytes, which the application
+--              still reads, and are compressed when next written. STORAGE EXTERNAL stops
+--              PostgreSQL from compressing already-compressed values again in TOAST.
+-- Date: 2026-10-18
+
+ALTER TABLE IF EXISTS "public"."marketplace_intelligence"
+    ALTER COLUMN "supplier_performance_scores" TYPE bytea USING convert_to("supplier_performance_scores"::text, 'UTF8'),
+    ALTER COLUMN "demand_trends" TYPE bytea USING convert_to("demand_trends"::text, 'UTF8'),
+    ALTER COLUMN "pricing_trends" TYPE bytea USING convert_to("pricing_trends"::text, 'UTF8'),
+    ALTER COLUMN "supply_chain_trends" TYPE bytea USING convert_to("supply_chain_trends"::text, 'UTF8'),
+    ALTER COLUMN "demand_forecast" TYPE bytea USING convert_to("demand_forecast"::text, 'UTF8'),
+    ALTER COLUMN "price_forecast" TYPE bytea USING convert_to("price_forecast"::text, 'UTF8'),
+    ALTER COLUMN "risk_forecast" TYPE bytea USING convert_to("risk_forecast"::text, 'UTF8');
+
+ALTER TABLE IF EXISTS "public"."marketplace_intelligence"
+    ALTER COLUMN "supplier_performance_scores" SET STORAGE EXTERNAL,
+    ALTER COLUMN "demand_trends" SET STORAGE EXTERNAL,
+    ALTER COLUMN "pricing_trends" SET STORAGE EXTERNAL,
+    ALTER COLUMN "supply_chain_trends" SET STORAGE EXTERNAL,
+    ALTER COLUMN "demand_forecast" SET STORAGE EXTERNAL,
+    ALTER COLUMN "price_forecast" SET STORAGE EXTERNAL,
+    ALTER COLUMN "risk_forecast" SET STORAGE EXTERNAL;
@@ -0,0 +1,15 @@
+-- Migration: Store integration credentials as bytea
+-- Description: APIIntegration.set_credentials() stores AES-256-GCM ciphertext
+--              (12-byte nonce followed by ciphertext and tag) as raw bytes instead
+--              of base64 text. No application code wrote the old TEXT column and
+--              its format cannot be decrypted with the new scheme, so existing
+--              values are cleared; affected integrations must be re-authorised.
+--              STORAGE EXTERNAL skips TOAST compression, which cannot shrink
+--              ciphertext.
+-- Date: 2026-10-18
+
+ALTER TABLE IF EXISTS "public"."api_integrations"
+    ALTER COLUMN "credentials_encrypted" TYPE bytea USING NULL;
+
+ALTER TABLE IF EXISTS "public"."api_integrations"
+    ALTER COLUMN "credentials_encrypted" SET STORAGE EXTERNAL;
@@ -0,0 +1,76 @@
+-- Migration: Keep trade finance scores in a narrow side table
+-- Description: Score aggregations (risk by category and region) only need a few
+--              floats per transaction but had to read the wide
+--              trade_finance_transactions rows. trade_finance_scores holds just the
+--              grouping keys and scores, about 100 bytes per row, and is kept in step
+--              by a trigger. Rows go away with their transaction through the
+--              cascading foreign key.
+-- Date: 2026-10-18
+
+CREATE TABLE IF NOT EXISTS public.trade_finance_scores (
+    id uuid PRIMARY KEY REFERENCES public.trade_finance_transactions (id) ON DELETE CASCADE,
+    org_id varchar(100) NOT NULL,
+    transaction_date date NOT NULL,
+    product_category varchar(100),
+    supplier_region varchar(100),
+    country_risk_score double precision,
+    supplier_risk_score double precision,
+    transaction_risk_score double precision,
+    currency_risk_score double precision,
+    market_demand_score double precision
+);
+
+CREATE INDEX IF NOT EXISTS idx_trade_finance_scores_date
+    ON public.trade_finance_scores (transaction_date);
+
+COMMENT ON TABLE public.trade_finance_scores IS 'Trigger-maintained copy of trade_finance_transactions scores for aggregation';
+
+CREATE OR REPLACE FUNCTION public.sync_trade_finance_scores()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    INSERT INTO public.trade_finance_scores (
+        id, org_id, transaction_date, product_category, supplier_region,
+        country_risk_score, supplier_risk_score, transaction_risk_score,
+        currency_risk_score, market_demand_score
+    ) VALUES (
+        NEW.id, NEW.org_id, NEW.transaction_date, NEW.product_category, NEW.supplier_region,
+        NEW.country_risk_score, NEW.supplier_risk_score, NEW.transaction_risk_score,
+        NEW.currency_risk_score, NEW.market_demand_score
+    )
+    ON CONFLICT (id) DO UPDATE SET
+        org_id = EXCLUDED.org_id,
+        transaction_date = EXCLUDED.transaction_date,
+        product_category = EXCLUDED.product_category,
+        supplier_region = EXCLUDED.supplier_region,
+        country_risk_score = EXCLUDED.country_risk_score,
+        supplier_risk_score = EXCLUDED.supplier_risk_score,
+        transaction_risk_score = EXCLUDED.transaction_risk_score,
+        currency_risk_score = EXCLUDED.currency_risk_score,
+        market_demand_score = EXCLUDED.market_demand_score;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trade_finance_scores_sync ON public.trade_finance_transactions;
+CREATE TRIGGER trade_finance_scores_sync
+    AFTER INSERT OR UPDATE OF org_id, transaction_date, product_category, supplier_region,
+        country_risk_score, supplier_risk_score, transaction_risk_score,
+        currency_risk_score, market_demand_score
+    ON public.trade_finance_transactions
+    FOR EACH ROW
+    EXECUTE FUNCTION public.sync_trade_finance_scores();
+
+-- Backfill existing transactions
+INSERT INTO public.trade_finance_scores (
+    id, org_id, transaction_date, product_category, supplier_region,
+    country_risk_score, supplier_risk_score, transaction_risk_score,
+    currency_risk_score, market_demand_score
+)
+SELECT
+    id, org_id, transaction_date, product_category, supplier_region,
+    country_risk_score, supplier_risk_score, transaction_risk_score,
+    currency_risk_score, market_demand_score
+FROM public.trade_finance_transactions
+ON CONFLICT (id) DO NOTHING;
@@ -0,0 +1,25 @@
+-- Migration: Add composite indexes for data moat aggregation queries
+-- Description: Per-org reads of trade finance transactions and feedback filter on org_id
+--              and a date, and the monthly market aggregation filters transactions on
+--              category, region and a date range. Composite indexes turn these into
+--              single index range scans. The (org_id, ...) indexes make the org_id-only
+--              indexes redundant, so those are dropped.
+--              market_intelligence gains a (category, region, period) index for trend
+--              reads across periods, which also covers the category-only index. It is
+--              range-partitioned on time_period, so partition pruning already handles
+--              period-only filters and no separate time_period (e.g. BRIN) index is added.
+-- Date: 2026-10-18
+
+CREATE INDEX IF NOT EXISTS "idx_trade_finance_transactions_org_date"
+    ON "public"."trade_finance_transactions" ("org_id", "transaction_date");
+CREATE INDEX IF NOT EXISTS "idx_trade_finance_transactions_scope_date"
+    ON "public"."trade_finance_transactions" ("product_category", "supplier_region", "transaction_date");
+DROP INDEX IF EXISTS "public"."idx_trade_finance_transactions_org_id";
+
+CREATE INDEX IF NOT EXISTS "idx_feedback_collection_org_created"
+    ON "public"."feedback_collection" ("org_id", "created_at");
+DROP INDEX IF EXISTS "public"."idx_feedback_collection_org_id";
+
+CREATE INDEX IF NOT EXISTS "idx_market_intelligence_scope_period"
+    ON "public"."market_intelligence" ("product_category", "geographic_region", "time_period");
+DROP INDEX IF EXISTS "public"."idx_market_intelligence_category";
@@ -0,0 +1,108 @@
+-- Migration: Partition trade finance transactions by month
+-- Description: Rebuild trade_finance_transactions as a table range-partitioned on
+--              transaction_date, one partition per month. Every aggregation reads a
+--              date window, so scans only touch the months they need, each partition
+--              keeps its own smaller indexes, and old months can be detached whole.
+--              The partition key has to be part of every unique constraint, so the
+--              primary key becomes (id, transaction_date) and trade_finance_scores
+--              references both columns. The single-column transaction_date index is
+--              not recreated; partition pruning covers date-only filters.
+--              The aggregates view and the scores trigger depend on the old table and
+--              are recreated on the new one.
+-- Date: 2026-10-18
+
+-- Keeps partitions for the current and next three months in place
+CREATE OR REPLACE FUNCTION public.create_upcoming_trade_finance_partitions()
+RETURNS void
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    PERFORM public.create_monthly_partitions('trade_finance_transactions', current_date, (current_date + interval '3 months')::date);
+END;
+$$;
+
+-- Objects that depend on the old table
+ALTER TABLE public.trade_finance_scores DROP CONSTRAINT IF EXISTS trade_finance_scores_id_fkey;
+DROP MATERIALIZED VIEW IF EXISTS public.marketplace_transaction_aggregates;
+
+-- trade_finance_transactions
+ALTER TABLE public.trade_finance_transactions RENAME TO trade_finance_transactions_unpartitioned;
+
+CREATE TABLE public.trade_finance_transactions (
+    LIKE public.trade_finance_transactions_unpartitioned INCLUDING DEFAULTS
+) PARTITION BY RANGE (transaction_date);
+
+CREATE TABLE public.trade_finance_transactions_default PARTITION OF public.trade_finance_transactions DEFAULT;
+
+SELECT public.create_monthly_partitions(
+    'trade_finance_transactions',
+    COALESCE((SELECT min(transaction_date) FROM public.trade_finance_transactions_unpartitioned), current_date),
+    (current_date + interval '3 months')::date
+);
+
+INSERT INTO public.trade_finance_transactions SELECT * FROM public.trade_finance_transactions_unpartitioned;
+DROP TABLE public.trade_finance_transactions_unpartitioned;
+
+ALTER TABLE public.trade_finance_transactions ADD PRIMARY KEY (id, transaction_date);
+ALTER TABLE public.trade_finance_transactions
+    ADD CONSTRAINT trade_finance_transactions_org_id_fkey
+    FOREIGN KEY (org_id) REFERENCES public.organizations (id);
+
+CREATE INDEX IF NOT EXISTS idx_trade_finance_transactions_type ON public.trade_finance_transactions (transaction_type);
+CREATE INDEX IF NOT EXISTS idx_trade_finance_transactions_supplier ON public.trade_finance_transactions (supplier_name);
+CREATE INDEX IF NOT EXISTS idx_trade_finance_transactions_category ON public.trade_finance_transactions (product_category);
+CREATE INDEX IF NOT EXISTS idx_trade_finance_transactions_org_date
+    ON public.trade_finance_transactions (org_id, transaction_date);
+CREATE INDEX IF NOT EXISTS idx_trade_finance_transactions_scope_date
+    ON public.trade_finance_transactions (product_category, supplier_region, transaction_date);
+
+COMMENT ON TABLE public.trade_finance_transactions IS 'Detailed trade finance transactions for intelligence extraction';
+
+-- trade_finance_scores
+CREATE TRIGGER trade_finance_scores_sync
+    AFTER INSERT OR UPDATE OF org_id, transaction_date, product_category, supplier_region,
+        country_risk_score, supplier_risk_score, transaction_risk_score,
+        currency_risk_score, market_demand_score
+    ON public.trade_finance_transactions
+    FOR EACH ROW
+    EXECUTE FUNCTION public.sync_trade_finance_scores();
+
+ALTER TABLE public.trade_finance_scores
+    ADD CONSTRAINT trade_finance_scores_transaction_fkey
+    FOREIGN KEY (id, transaction_date) REFERENCES public.trade_finance_transactions (id, transaction_date)
+    ON DELETE CASCADE ON UPDATE CASCADE;
+
+-- marketplace_transaction_aggregates
+CREATE MATERIALIZED VIEW IF NOT EXISTS public.marketplace_transaction_aggregates AS
+SELECT
+    product_category,
+    supplier_region,
+    date_trunc('month', transaction_date)::date AS time_period,
+    count(*)::integer AS transaction_count,
+    sum(amount_usd) AS total_volume,
+    avg(amount_usd) AS average_transaction,
+    stddev_pop(amount_usd) AS amount_stddev,
+    avg(NULLIF(cash_conversion_days, 0)) AS average_lead_time,
+    avg(NULLIF(transaction_risk_score, 0)) AS average_risk_score,
+    count(DISTINCT supplier_name)::integer AS unique_suppliers,
+    count(DISTINCT importer_org_id)::integer AS unique_importers
+FROM public.trade_finance_transactions
+WHERE product_category IS NOT NULL AND supplier_region IS NOT NULL
+GROUP BY 1, 2, 3
+WITH DATA;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_marketplace_transaction_aggregates_scope
+    ON public.marketplace_transaction_aggregates (product_category, supplier_region, time_period);
+
+-- Create next months' partitions ahead of time when pg_cron is available
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_cron') THEN
+        PERFORM cron.schedule(
+            'create-trade-finance-partitions',
+            '0 3 1 * *',
+            'SELECT public.create_upcoming_trade_finance_partitions()'
+        );
+    END IF;
+END;
+$$;
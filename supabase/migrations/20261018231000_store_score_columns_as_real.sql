@@ -0,0 +1,88 @@
+-- Migration: Store heuristic score columns as REAL
+-- Description: The *_score columns hold heuristic values in 0-1, -1 to 1 or 0-100 with a few
+--              significant digits. Storing them as 4-byte REAL instead of double
+--              precision halves their size on disk, in shared buffers and on the wire.
+--              Amounts, prices and rates stay double precision.
+--              marketplace_transaction_aggregates reads transaction_risk_score, so it is
+--              dropped before the type change and recreated afterwards.
+-- Date: 2026-10-18
+
+DROP MATERIALIZED VIEW IF EXISTS public.marketplace_transaction_aggregates;
+
+ALTER TABLE IF EXISTS "public"."trade_finance_transactions"
+    ALTER COLUMN "country_risk_score" TYPE real,
+    ALTER COLUMN "supplier_risk_score" TYPE real,
+    ALTER COLUMN "transaction_risk_score" TYPE real,
+    ALTER COLUMN "currency_risk_score" TYPE real,
+    ALTER COLUMN "market_demand_score" TYPE real,
+    ALTER COLUMN "competitive_pricing_score" TYPE real;
+
+ALTER TABLE IF EXISTS "public"."trade_finance_scores"
+    ALTER COLUMN "country_risk_score" TYPE real,
+    ALTER COLUMN "supplier_risk_score" TYPE real,
+    ALTER COLUMN "transaction_risk_score" TYPE real,
+    ALTER COLUMN "currency_risk_score" TYPE real,
+    ALTER COLUMN "market_demand_score" TYPE real;
+
+ALTER TABLE IF EXISTS "public"."customer_intelligence"
+    ALTER COLUMN "payment_history_score" TYPE real,
+    ALTER COLUMN "financial_health_score" TYPE real,
+    ALTER COLUMN "platform_engagement_score" TYPE real,
+    ALTER COLUMN "satisfaction_score" TYPE real,
+    ALTER COLUMN "churn_risk_score" TYPE real,
+    ALTER COLUMN "upsell_potential_score" TYPE real;
+
+ALTER TABLE IF EXISTS "public"."market_intelligence"
+    ALTER COLUMN "average_quality_score" TYPE real,
+    ALTER COLUMN "supply_chain_risk_score" TYPE real,
+    ALTER COLUMN "currency_risk_score" TYPE real,
+    ALTER COLUMN "political_risk_score" TYPE real,
+    ALTER COLUMN "logistics_risk_score" TYPE real,
+    ALTER COLUMN "confidence_score" TYPE real;
+
+ALTER TABLE IF EXISTS "public"."marketplace_intelligence"
+    ALTER COLUMN "supplier_diversity_score" TYPE real,
+    ALTER COLUMN "market_maturity_score" TYPE real,
+    ALTER COLUMN "confidence_score" TYPE real;
+
+ALTER TABLE IF EXISTS "public"."feedback_collection"
+    ALTER COLUMN "sentiment_score" TYPE real,
+    ALTER COLUMN "urgency_score" TYPE real;
+
+ALTER TABLE IF EXISTS "public"."api_integrations"
+    ALTER COLUMN "data_quality_score" TYPE real,
+    ALTER COLUMN "business_value_score" TYPE real;
+
+ALTER TABLE IF EXISTS "public"."data_quality_metrics"
+    ALTER COLUMN "completeness_score" TYPE real,
+    ALTER COLUMN "accuracy_score" TYPE real,
+    ALTER COLUMN "consistency_score" TYPE real,
+    ALTER COLUMN "timeliness_score" TYPE real,
+    ALTER COLUMN "uniqueness_score" TYPE real,
+    ALTER COLUMN "overall_quality_score" TYPE real,
+    ALTER COLUMN "marketplace_value_score" TYPE real;
+
+ALTER TABLE IF EXISTS "public"."unified_transactions"
+    ALTER COLUMN "risk_score" TYPE real;
+
+-- marketplace_transaction_aggregates
+CREATE MATERIALIZED VIEW IF NOT EXISTS public.marketplace_transaction_aggregates AS
+SELECT
+    product_category,
+    supplier_region,
+    date_trunc('month', transaction_date)::date AS time_period,
+    count(*)::integer AS transaction_count,
+    sum(amount_usd) AS total_volume,
+    avg(amount_usd) AS average_transaction,
+    stddev_pop(amount_usd) AS amount_stddev,
+    avg(NULLIF(cash_conversion_days, 0)) AS average_lead_time,
+    avg(NULLIF(transaction_risk_score, 0)) AS average_risk_score,
+    count(DISTINCT supplier_name)::integer AS unique_suppliers,
+    count(DISTINCT importer_org_id)::integer AS unique_importers
+FROM public.trade_finance_transactions
+WHERE product_category IS NOT NULL AND supplier_region IS NOT NULL
+GROUP BY 1, 2, 3
+WITH DATA;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_marketplace_transaction_aggregates_scope
+    ON public.marketplace_transaction_aggregates (product_category, supplier_region, time_period);
@@ -0,0 +1,39 @@
+-- Migration: Default core table timestamps to now()
+-- Description: The core models in models.py no longer compute creation and update
+--              timestamps in Python; the database fills them in. Tables created
+--              outside these migrations may not declare a default yet, so every such
+--              column gets DEFAULT now(). Existing rows are unchanged.
+-- Date: 2026-10-18
+
+ALTER TABLE IF EXISTS "public"."organizations"
+    ALTER COLUMN "created_date" SET DEFAULT now(),
+    ALTER COLUMN "updated_date" SET DEFAULT now();
+
+ALTER TABLE IF EXISTS "public"."agents"
+    ALTER COLUMN "created_date" SET DEFAULT now(),
+    ALTER COLUMN "updated_date" SET DEFAULT now();
+
+ALTER TABLE IF EXISTS "public"."uploads"
+    ALTER COLUMN "upload_date" SET DEFAULT now();
+
+ALTER TABLE IF EXISTS "public"."processed_data"
+    ALTER COLUMN "created_date" SET DEFAULT now();
+
+ALTER TABLE IF EXISTS "public"."triangle_scores"
+    ALTER COLUMN "calculated_at" SET DEFAULT now(),
+    ALTER COLUMN "created_at" SET DEFAULT now();
+
+ALTER TABLE IF EXISTS "public"."product_analytics"
+    ALTER COLUMN "last_updated" SET DEFAULT now();
+
+ALTER TABLE IF EXISTS "public"."supplier_performance"
+    ALTER COLUMN "last_evaluated" SET DEFAULT now();
+
+ALTER TABLE IF EXISTS "public"."financial_metrics"
+    ALTER COLUMN "created_at" SET DEFAULT now();
+
+ALTER TABLE IF EXISTS "public"."alert_rules"
+    ALTER COLUMN "created_at" SET DEFAULT now();
+
+ALTER TABLE IF EXISTS "public"."alert_instances"
+    ALTER COLUMN "created_at" SET DEFAULT now();
@@ -0,0 +1,57 @@
+-- Migration: Store more narrow-domain string columns as SMALLINT codes
+-- Description: Same encoding as 20261018160000: each value is stored as its 1-based
+--              position in the matching tuple in models_enhanced.py (e.g.
+--              FEEDBACK_TYPES). Values outside the domain become NULL. Indexes on
+--              these columns are rebuilt by ALTER COLUMN TYPE.
+-- Date: 2026-10-18
+
+ALTER TABLE IF EXISTS "public"."customer_intelligence"
+    ALTER COLUMN "customer_type" TYPE smallint USING CASE "customer_type"
+        WHEN 'importer' THEN 1
+        WHEN 'distributor' THEN 2
+        WHEN 'retailer' THEN 3
+        WHEN 'manufacturer' THEN 4
+    END;
+
+ALTER TABLE IF EXISTS "public"."customer_intelligence"
+    ALTER COLUMN "company_size" TYPE smallint USING CASE "company_size"
+        WHEN 'small' THEN 1
+        WHEN 'medium' THEN 2
+        WHEN 'large' THEN 3
+        WHEN 'enterprise' THEN 4
+    END;
+
+ALTER TABLE IF EXISTS "public"."customer_intelligence"
+    ALTER COLUMN "annual_revenue_range" TYPE smallint USING CASE "annual_revenue_range"
+        WHEN '<1M' THEN 1
+        WHEN '1-10M' THEN 2
+        WHEN '10-50M' THEN 3
+        WHEN '50-100M' THEN 4
+        WHEN '>100M' THEN 5
+    END;
+
+ALTER TABLE IF EXISTS "public"."feedback_collection"
+    ALTER COLUMN "feedback_type" TYPE smallint USING CASE "feedback_type"
+        WHEN 'feature_request' THEN 1
+        WHEN 'bug_report' THEN 2
+        WHEN 'satisfaction' THEN 3
+        WHEN 'competitor_info' THEN 4
+        WHEN 'market_insight' THEN 5
+    END;
+
+ALTER TABLE IF EXISTS "public"."feedback_collection"
+    ALTER COLUMN "feedback_source" TYPE smallint USING CASE "feedback_source"
+        WHEN 'in_app' THEN 1
+        WHEN 'email' THEN 2
+        WHEN 'support_ticket' THEN 3
+        WHEN 'sales_call' THEN 4
+    END;
+
+ALTER TABLE IF EXISTS "public"."api_integrations"
+    ALTER COLUMN "integration_type" TYPE smallint USING CASE "integration_type"
+        WHEN 'erp' THEN 1
+        WHEN 'accounting' THEN 2
+        WHEN 'ecommerce' THEN 3
+        WHEN 'customs' THEN 4
+        WHEN 'logistics' THEN 5
+    END;
@@ -0,0 +1,17 @@
+-- Migration: Add composite indexes for unified transaction analytics
+-- Description: Unified transaction reads are per org: related transactions for one SKU
+--              (optionally over a date range), inventory by status, and per-supplier
+--              history. Composite (org_id, ...) indexes turn these into index range
+--              scans instead of scans of the wide table. The supplier index is on
+--              supplier_name, the column document extraction fills in; supplier_id is
+--              never populated. The (org_id, ...) indexes make the org_id-only index
+--              redundant, so it is dropped.
+-- Date: 2026-10-18
+
+CREATE INDEX IF NOT EXISTS "idx_unified_transactions_org_sku_date"
+    ON "public"."unified_transactions" ("org_id", "sku", "transaction_date");
+CREATE INDEX IF NOT EXISTS "idx_unified_transactions_org_status"
+    ON "public"."unified_transactions" ("org_id", "inventory_status");
+CREATE INDEX IF NOT EXISTS "idx_unified_transactions_org_supplier"
+    ON "public"."unified_transactions" ("org_id", "supplier_name");
+DROP INDEX IF EXISTS "public"."idx_unified_transactions_org_id";
@@ -0,0 +1,40 @@
+-- Migration: Materialize monthly unified transaction totals per supplier
+-- Description: Aggregate unified_transactions per org, supplier and month inside
+--              PostgreSQL, so supplier cost and risk dashboards read one row per
+--              supplier-month instead of summing the wide transaction rows on every
+--              request. Suppliers are keyed by supplier_name, the column document
+--              extraction fills in. Rows without a supplier or transaction date are left
+--              out, which keeps the unique index usable for concurrent refreshes.
+-- Date: 2026-10-18
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS public.unified_transaction_supplier_rollup AS
+SELECT
+    org_id,
+    supplier_name,
+    date_trunc('month', transaction_date)::date AS month,
+    count(*)::integer AS transaction_count,
+    sum(quantity) AS total_quantity,
+    sum(total_cost) AS total_cost,
+    sum(cost_variance) AS total_cost_variance,
+    avg(risk_score) AS average_risk_score
+FROM public.unified_transactions
+WHERE supplier_name IS NOT NULL AND transaction_date IS NOT NULL
+GROUP BY 1, 2, 3
+WITH DATA;
+
+-- Required by REFRESH MATERIALIZED VIEW CONCURRENTLY
+CREATE UNIQUE INDEX IF NOT EXISTS idx_unified_transaction_supplier_rollup_scope
+    ON public.unified_transaction_supplier_rollup (org_id, supplier_name, month);
+
+-- Refresh nightly when pg_cron is available
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_cron') THEN
+        PERFORM cron.schedule(
+            'refresh-unified-transaction-supplier-rollup',
+            '45 2 * * *',
+            'REFRESH MATERIALIZED VIEW CONCURRENTLY public.unified_transaction_supplier_rollup'
+        );
+    END IF;
+END;
+$$;
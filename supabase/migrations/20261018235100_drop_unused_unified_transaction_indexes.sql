@@ -0,0 +1,18 @@
+-- Migration: Drop unused unified_transactions indexes
+-- Description: Every read of unified_transactions is scoped to one org and served by
+--              the (org_id, ...) composite indexes. The single-column indexes on sku,
+--              transaction_date, transaction_type, inventory_status and supplier_name
+--              are never used on their own, but every insert still has to maintain them
+--              and they compete with the table for shared buffers.
+--              The String(255)/String(500) columns are left as they are. PostgreSQL
+--              stores varchar(n) and text the same way, only as wide as the value, and
+--              TOASTs long values either way.
+-- Date: 2026-10-18
+
+DROP INDEX IF EXISTS "public"."idx_unified_transactions_sku";
+DROP INDEX IF EXISTS "public"."idx_unified_transactions_transaction_date";
+DROP INDEX IF EXISTS "public"."idx_unified_transactions_date";
+DROP INDEX IF EXISTS "public"."idx_unified_transactions_type";
+DROP INDEX IF EXISTS "public"."idx_unified_transactions_inventory_status";
+DROP INDEX IF EXISTS "public"."idx_unified_transactions_status";
+DROP INDEX IF EXISTS "public"."idx_unified_transactions_supplier";
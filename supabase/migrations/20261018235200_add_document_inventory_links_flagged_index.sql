@@ -0,0 +1,12 @@
+-- Migration: Add partial index for flagged document inventory links
+-- Description: Index only compromised and at-risk links by org and SKU, so the compromise
+--              dashboards read a small index while normal links pile up. The
+--              single-column inventory_status indexes are dropped: with three values
+--              they are never selective, and the partial index covers the rare ones.
+-- Date: 2026-10-18
+
+CREATE INDEX IF NOT EXISTS idx_document_inventory_links_flagged
+    ON document_inventory_links (org_id, sku)
+    WHERE inventory_status <> 'normal';
+DROP INDEX IF EXISTS "public"."idx_document_inventory_links_inventory_status";
+DROP INDEX IF EXISTS "public"."idx_document_inventory_links_status";
@@ -0,0 +1,37 @@
+-- Migration: Store unified transaction types and statuses as SMALLINT codes
+-- Description: Same encoding as 20261018160000: each value is stored as its 1-based
+--              position in the matching tuple in models_enhanced.py (e.g.
+--              INVENTORY_STATUSES). Values outside the domain become NULL. The
+--              (org_id, inventory_status) index is rebuilt by ALTER COLUMN TYPE.
+--              currency and country are left as text: currency is already three
+--              bytes, and country holds free-form names from extracted documents.
+-- Date: 2026-10-18
+
+ALTER TABLE IF EXISTS "public"."unified_transactions"
+    ALTER COLUMN "transaction_type" TYPE smallint USING CASE "transaction_type"
+        WHEN 'SALE' THEN 1
+        WHEN 'PURCHASE' THEN 2
+        WHEN 'INVENTORY' THEN 3
+        WHEN 'DOCUMENT' THEN 4
+        WHEN 'INVOICE' THEN 5
+        WHEN 'SHIPMENT' THEN 6
+    END;
+
+ALTER TABLE IF EXISTS "public"."unified_transactions"
+    ALTER COLUMN "inventory_status" TYPE smallint USING CASE "inventory_status"
+        WHEN 'available' THEN 1
+        WHEN 'committed' THEN 2
+        WHEN 'in_transit' THEN 3
+        WHEN 'compromised' THEN 4
+        WHEN 'billed' THEN 5
+        WHEN 'received' THEN 6
+    END;
+
+ALTER TABLE IF EXISTS "public"."unified_transactions"
+    ALTER COLUMN "compliance_status" TYPE smallint USING CASE "compliance_status"
+        WHEN 'compliant' THEN 1
+        WHEN 'at_risk' THEN 2
+        WHEN 'violated' THEN 3
+        WHEN 'pending' THEN 4
+        WHEN 'in_progress' THEN 5
+    END;
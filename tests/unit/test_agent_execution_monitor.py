@@ -0,0 +1,185 @@
+"""Unit tests for the agent execution monitor"""
+import importlib.util
+import os
+import queue
+import re
+import sys
+import types
+from collections import deque
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class RecordingLogger:
+    """Agent logger stand-in that records error entries and whether a stripe lock was held"""
+    def __init__(self):
+        self.errors = []
+        self.stripes = []
+
+    def log_error(self, message, **kwargs):
+        self.errors.append((message, any(lock._is_owned() for lock in self.stripes)))
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+def _load_monitor_module():
+    """Import monitoring/agent_execution_monitor.py with its ..agent_protocol imports stubbed"""
+    package = '_execution_monitor_under_test'
+    for name in (package, f'{package}.monitoring', f'{package}.agent_protocol',
+                 f'{package}.agent_protocol.monitoring'):
+        module = types.ModuleType(name)
+        module.__path__ = []
+        sys.modules[name] = module
+
+    agent_logger = types.ModuleType(f'{package}.agent_protocol.monitoring.agent_logger')
+    agent_logger.get_agent_logger = RecordingLogger
+    metrics_collector = types.ModuleType(f'{package}.agent_protocol.monitoring.metrics_collector')
+    metrics_collector.get_metrics_collector = lambda: None
+    sys.modules[agent_logger.__name__] = agent_logger
+    sys.modules[metrics_collector.__name__] = metrics_collector
+
+    spec = importlib.util.spec_from_file_location(
+        f'{package}.monitoring.agent_execution_monitor',
+        os.path.join(ROOT, 'monitoring', 'agent_execution_monitor.py')
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+aem = _load_monitor_module()
+
+
+@pytest.fixture
+def monitor(monkeypatch):
+    # No background threads: queued log events stay on the queue
+    monkeypatch.setattr(aem.AgentExecutionMonitor, '_start_monitoring', lambda self: None)
+    monitor = aem.AgentExecutionMonitor()
+    monitor.logger.stripes = monitor._stripes
+    return monitor
+
+
+def start(monitor, agent_id='agent-1', priority=None):
+    context = monitor.create_execution_context(
+        agent_id, 'inventory', 'org-1', 'user-1', {},
+        priority=priority or aem.ExecutionPriority.NORMAL
+    )
+    monitor.start_execution(context)
+    return context.execution_id
+
+
+def test_executions_are_routed_to_their_stripe(monitor):
+    ids = [start(monitor, f'agent-{i}') for i in range(50)]
+
+    for execution_id in ids:
+        lock, shard = monitor._shard(execution_id)
+        assert monitor._shard(execution_id) == (lock, shard)
+        assert shard[execution_id].context.execution_id == execution_id
+    assert sorted(t.context.execution_id for t in monitor._active_snapshot()) == sorted(ids)
+
+
+def test_queue_pops_by_priority_then_arrival(monitor):
+    low = start(monitor, priority=aem.ExecutionPriority.LOW)
+    high = start(monitor, priority=aem.ExecutionPriority.HIGH)
+    normal = start(monitor, priority=aem.ExecutionPriority.NORMAL)
+    later_high = start(monitor, priority=aem.ExecutionPriority.HIGH)
+    running = start(monitor, priority=aem.ExecutionPriority.URGENT)
+    monitor.update_execution_status(running, aem.ExecutionStatus.RUNNING)
+
+    assert [monitor.pop_next_queued() for _ in range(5)] == [high, later_high, normal, low, None]
+
+
+def test_dequeue_compacts_stale_heap_entries(monitor):
+    ids = [start(monitor) for _ in range(200)]
+    for execution_id in ids[:150]:
+        monitor.update_execution_status(execution_id, aem.ExecutionStatus.RUNNING)
+
+    assert len(monitor._queued) == 50
+    assert len(monitor._queue_heap) <= 2 * 50 + 64
+    assert monitor.get_execution_statistics()['queue_size'] == 50
+
+
+def test_completed_index_follows_deque_evictions(monitor):
+    monitor.completed_executions = deque(maxlen=3)
+    ids = [start(monitor) for _ in range(5)]
+    for execution_id in ids:
+        monitor.complete_execution(execution_id)
+
+    assert set(monitor._completed_index) == set(ids[2:])
+    assert monitor.get_execution_trace(ids[0]) is None
+    assert monitor.get_execution_trace(ids[4]).status is aem.ExecutionStatus.COMPLETED
+
+
+def test_recent_durations_keep_a_running_sum(monitor):
+    monitor._recent_durations = deque(maxlen=2)
+    for duration_ms in (10, 20, 30):
+        execution_id = start(monitor)
+        monitor._shard(execution_id)[1][execution_id]._start_ns -= duration_ms * 1_000_000
+        monitor.complete_execution(execution_id)
+
+    assert [d // 10 for d in monitor._recent_durations] == [2, 3]
+    assert monitor._recent_duration_sum == sum(monitor._recent_durations)
+
+
+@pytest.mark.parametrize('message, error_type', [
+    ('Tool failed: connection TIMEOUT', 'timeout'),
+    ('Unauthorized request', 'permission'),
+    ('Rate limit hit by tool', 'rate_limit'),
+    ('invalid model name', 'validation'),
+    ('LLM returned nothing', 'llm_error'),
+    ('tool crashed', 'tool_error'),
+    ('something else', 'unknown'),
+])
+def test_classify_error_keeps_class_precedence(monitor, message, error_type):
+    assert monitor._classify_error(message) == error_type
+
+
+def test_execution_ids_use_monitor_prefix_and_counter(monitor):
+    first = monitor.create_execution_context('agent-1', 'inventory', 'org-1', 'user-1', {}).execution_id
+    second = monitor.create_execution_context('agent-1', 'inventory', 'org-1', 'user-1', {}).execution_id
+
+    assert re.fullmatch(r'exec_agent-1_[0-9a-f]+_0', first)
+    assert second == first[:-1] + '1'
+
+
+def test_full_log_queue_drops_and_counts_events(monitor):
+    monitor._log_queue = queue.Queue(maxsize=1)
+    monitor._log_event('a', 'first', {})
+    monitor._log_event('b', 'second', {})
+
+    assert monitor._log_queue.qsize() == 1
+    assert monitor.stats['dropped_log_events'] == 1
+
+
+@pytest.mark.skipif(sys.version_info < (3, 10), reason='dataclass slots need Python 3.10')
+def test_execution_records_are_slotted(monitor):
+    execution_id = start(monitor)
+    step_id = monitor.start_execution_step(execution_id, 'tool_call', 'tool_call_lookup')
+    trace = monitor.get_execution_trace(execution_id)
+
+    for record in (trace, trace.context, trace._steps_by_id[step_id]):
+        assert not hasattr(record, '__dict__')
+
+
+def test_errors_are_reported_after_the_lock_is_released(monitor):
+    lock_held = []
+    monitor.add_error_callback(
+        lambda trace, message: lock_held.append(monitor._shard(trace.context.execution_id)[0]._is_owned())
+    )
+    execution_id = start(monitor)
+    step_id = monitor.start_execution_step(execution_id, 'tool_call', 'tool_call_lookup')
+
+    monitor.complete_execution_step(execution_id, step_id, error_message='lookup failed')
+    monitor.record_error(execution_id, 'network unreachable')
+
+    assert lock_held == [False, False]
+    assert monitor.logger.errors == [
+        ('Execution error: lookup failed', False),
+        ('Execution error: network unreachable', False),
+    ]
+    assert monitor.get_execution_trace(execution_id).error == 'lookup failed'
+    assert monitor.error_patterns['network'] == 1
@@ -0,0 +1,46 @@
+"""Unit tests for the PostgreSQL migration generator"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from scripts.generate_dialect_migrations import MIGRATIONS_DIR, convert_sql_for_postgresql, render
+
+
+def test_convert_sql_for_postgresql_literals():
+    sql = "id INTEGER PRIMARY KEY AUTOINCREMENT, at DATETIME, cost DECIMAL(10,4), data JSON"
+    converted = convert_sql_for_postgresql(sql)
+    assert converted == "id SERIAL PRIMARY KEY, at TIMESTAMP, cost NUMERIC(10,4), data JSONB"
+
+
+def test_convert_sql_for_postgresql_moves_inline_indexes_after_table():
+    sql = (
+        "CREATE TABLE IF NOT EXISTS agent_logs (\n"
+        "    agent_id VARCHAR(255), -- owner\n"
+        "    \n"
+        "    INDEX idx_agent_logs_agent_id (agent_id)\n"
+        ");"
+    )
+    assert convert_sql_for_postgresql(sql) == (
+        "CREATE TABLE IF NOT EXISTS agent_logs (\n"
+        "    agent_id VARCHAR(255) -- owner\n"
+        "    \n"
+        ");\n"
+        "CREATE INDEX IF NOT EXISTS idx_agent_logs_agent_id ON agent_logs (agent_id);"
+    )
+
+
+def test_convert_sql_for_postgresql_names_unique_constraints_per_table():
+    sql = (
+        "CREATE TABLE IF NOT EXISTS a (\n    x INTEGER,\n    UNIQUE(x)\n);\n"
+        "CREATE TABLE IF NOT EXISTS b (\n    x INTEGER,\n    y INTEGER,\n    UNIQUE(x, y)\n);"
+    )
+    converted = convert_sql_for_postgresql(sql)
+    assert "CONSTRAINT unique_a_x UNIQUE(x)" in converted
+    assert "CONSTRAINT unique_b_x_y UNIQUE(x, y)" in converted
+
+
+def test_generated_migrations_are_up_to_date():
+    for source in MIGRATIONS_DIR.glob('*.sqlite.sql'):
+        target = source.with_name(source.name.replace('.sqlite.sql', '.postgresql.sql'))
+        assert target.read_text() == render(source), f"{target.name} is stale"
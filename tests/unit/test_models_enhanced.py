@@ -0,0 +1,455 @@
+"""Unit tests for the enhanced data moat models"""
+import base64
+import json
+import os
+import sys
+import uuid
+from datetime import date, datetime
+
+import numpy as np
+import pytest
+from flask import Flask
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import models_enhanced
+from models import CompressedJSON, _json_dumps, db
+from utils.json_provider import OrjsonProvider
+from models_enhanced import (
+    APIIntegration, DataQualityMetrics, FeedbackCollection, MarketIntelligence,
+    MarketplaceIntelligence, TradeFinanceTransaction, UnifiedTransaction, _copy_text
+)
+
+
+@pytest.fixture
+def app():
+    """Minimal app bound to an in-memory database"""
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+
+
+def test_bulk_insert_fills_ids_and_timestamps(app):
+    records = [
+        {'org_id': 'org-1', 'amount_usd': 100.0 + i, 'transaction_date': date(2024, 1, 1)}
+        for i in range(25)
+    ]
+    
+    assert TradeFinanceTransaction.bulk_insert(db.session, records, page_size=10) == 25
+    db.session.commit()
+    
+    rows = TradeFinanceTransaction.query.all()
+    assert len(rows) == 25
+    assert len({row.id for row in rows}) == 25
+    assert {row.id.version for row in rows} == {7}
+    assert all(row.created_at is not None and row.created_at == row.updated_at for row in rows)
+    assert {row.currency for row in rows} == {'USD'}
+
+
+def test_bulk_insert_keeps_explicit_ids(app):
+    feedback_id = uuid.uuid4()
+    FeedbackCollection.bulk_insert(db.session, [{'id': feedback_id, 'org_id': 'org-1', 'user_id': 'u-1'}])
+    db.session.commit()
+    
+    assert db.session.get(FeedbackCollection, feedback_id).user_id == 'u-1'
+    assert FeedbackCollection.bulk_insert(db.session, []) == 0
+
+
+def test_bulk_insert_returning_gives_ids_in_record_order(app):
+    explicit_id = uuid.uuid4()
+    ids = FeedbackCollection.bulk_insert_returning(db.session, [
+        {'org_id': 'org-1', 'user_id': 'first'},
+        {'id': explicit_id, 'org_id': 'org-1', 'user_id': 'second'},
+        {'org_id': 'org-1', 'user_id': 'third'},
+    ])
+    db.session.commit()
+    
+    assert ids[1] == explicit_id
+    assert [db.session.get(FeedbackCollection, key).user_id for key in ids] == ['first', 'second', 'third']
+
+
+def test_bulk_insert_pages_wide_rows_down_to_one_row(app, monkeypatch):
+    monkeypatch.setattr(models_enhanced, 'BULK_INSERT_MAX_PARAMETERS', 2)
+    records = [{'org_id': 'org-1', 'amount_usd': 1.0, 'transaction_date': date(2024, 1, 1)}] * 3
+    
+    assert TradeFinanceTransaction.bulk_insert(db.session, records) == 3
+    assert TradeFinanceTransaction.query.count() == 3
+
+
+def test_bulk_insert_keeps_natural_keys(app):
+    ids = UnifiedTransaction.bulk_insert_returning(db.session, [
+        {'transaction_id': 'PO-1', 'org_id': 'org-1', 'transaction_type': 'PURCHASE'},
+        {'transaction_id': 'PO-2', 'org_id': 'org-1', 'transaction_type': 'PURCHASE'},
+    ])
+    db.session.commit()
+    
+    assert ids == ['PO-1', 'PO-2']
+    assert UnifiedTransaction.query.count() == 2
+
+
+def test_bulk_insert_of_built_instances_keeps_their_defaults(app):
+    transactions = [
+        UnifiedTransaction(transaction_id='INV-1', org_id='org-1', transaction_type='INVOICE',
+                           anomaly_flags=[{'reason': 'cost_variance'}]),
+        UnifiedTransaction(transaction_id='INV-2', org_id='org-1', currency='EUR'),
+    ]
+    records = [UnifiedTransaction.column_values(t) for t in transactions]
+    assert records[1] == {'transaction_id': 'INV-2', 'org_id': 'org-1', 'currency': 'EUR'}
+    
+    UnifiedTransaction.bulk_insert(db.session, records)
+    db.session.commit()
+    
+    first, second = UnifiedTransaction.query.order_by(UnifiedTransaction.transaction_id)
+    assert first.currency == 'USD' and first.anomaly_flags == [{'reason': 'cost_variance'}]
+    assert second.currency == 'EUR' and second.created_at is not None
+
+
+def test_bulk_insert_instances_reads_back_server_defaults(app):
+    set_at = datetime(2024, 1, 31, 12, 0)
+    transactions = [
+        UnifiedTransaction(transaction_id='INV-3', org_id='org-1'),
+        UnifiedTransaction(transaction_id='INV-4', org_id='org-1', currency='EUR', created_at=set_at),
+        UnifiedTransaction(transaction_id='INV-5', org_id='org-1'),
+    ]
+    
+    assert UnifiedTransaction.bulk_insert_instances(db.session, transactions) == 3
+    db.session.commit()
+    
+    stored = {t.transaction_id: t for t in UnifiedTransaction.query}
+    for transaction in transactions:
+        assert isinstance(transaction.to_dict()['created_at'], datetime)
+        assert transaction.created_at == stored[transaction.transaction_id].created_at
+        assert transaction.updated_at == stored[transaction.transaction_id].updated_at
+    assert transactions[1].created_at == set_at
+    
+    feedback = FeedbackCollection(org_id='org-1', user_id='u-1')
+    FeedbackCollection.bulk_insert_instances(db.session, [feedback])
+    assert FeedbackCollection.query.one().id == feedback.id
+
+
+def test_copy_from_falls_back_to_bulk_insert_off_postgres(app):
+    records = [{'org_id': 'org-1', 'amount_usd': 5.0, 'transaction_date': date(2024, 2, 1)}]
+    
+    assert TradeFinanceTransaction.copy_from(db.session, records) == 1
+    assert TradeFinanceTransaction.copy_from(db.session, iter(records), columns=list(records[0])) == 1
+    assert TradeFinanceTransaction.query.count() == 2
+
+
+def test_line_reader_serves_fixed_size_reads():
+    reader = models_enhanced._LineReader(iter(['abc\n', 'de\n', 'fghij\n']))
+    
+    chunks = []
+    while True:
+        chunk = reader.read(4)
+        if not chunk:
+            break
+        chunks.append(chunk)
+    
+    assert chunks == ['abc\n', 'de\nf', 'ghij', '\n']
+
+
+def test_rows_as_json_matches_to_dict(app):
+    TradeFinanceTransaction.bulk_insert(db.session, [
+        {'org_id': 'org-1', 'amount_usd': 10.0, 'transaction_date': date(2024, 3, 1),
+         'transaction_type': 'LC', 'hs_code': '0901'},
+        {'org_id': 'org-1', 'amount_usd': 20.0, 'transaction_date': date(2024, 3, 2)},
+        {'org_id': 'org-2', 'amount_usd': 30.0, 'transaction_date': date(2024, 3, 3)},
+    ])
+    db.session.commit()
+    
+    payload = TradeFinanceTransaction.rows_as_json(
+        TradeFinanceTransaction.org_id == 'org-1',
+        order_by=TradeFinanceTransaction.transaction_date
+    )
+    
+    expected = [
+        dict(tx.to_dict(), id=str(tx.id))
+        for tx in TradeFinanceTransaction.query.filter_by(org_id='org-1')
+        .order_by(TradeFinanceTransaction.transaction_date)
+    ]
+    assert json.loads(payload) == expected
+    assert json.loads(payload)[0]['transaction_type'] == 'LC'
+
+
+def test_orjson_provider_formats_to_dict_dates(app):
+    app.json = OrjsonProvider(app)
+    tx = UnifiedTransaction(
+        transaction_id='T-1', org_id='org-1', transaction_type='PURCHASE',
+        po_date=date(2024, 3, 1), created_at=datetime(2024, 3, 1, 9, 30)
+    )
+    
+    with app.test_request_context():
+        response = app.json.response(transactions=[tx.to_dict()])
+    
+    data = json.loads(response.get_data())['transactions'][0]
+    assert data['po_date'] == '2024-03-01'
+    assert data['created_at'] == '2024-03-01T09:30:00'
+    assert data['ship_date'] is None
+    assert list(data) == sorted(UnifiedTransaction.LIST_FIELDS)
+
+
+def test_to_dict_returns_only_requested_fields():
+    tx = UnifiedTransaction(transaction_id='T-1', org_id='org-1', sku='SKU-1', quantity=5.0)
+    
+    assert tx.to_dict(['sku', 'quantity']) == {'sku': 'SKU-1', 'quantity': 5.0}
+    assert list(tx.to_dict()) == list(UnifiedTransaction.LIST_FIELDS)
+    with pytest.raises(ValueError):
+        tx.to_dict(['sku', 'organization'])
+
+
+def test_copy_text_escapes_copy_format():
+    assert _copy_text(None) == '\\N'
+    assert _copy_text('a\tb\nc\\d') == 'a\\tb\\nc\\\\d'
+    assert _copy_text({'k': [1]}) == '{"k":[1]}'
+    assert _copy_text(False) == 'f'
+    assert _copy_text(date(2024, 1, 31)) == '2024-01-31'
+    assert _copy_text(b'\x01\xff') == '\\\\x01ff'
+
+
+def test_copy_text_encodes_json_like_insert():
+    value = {'n': np.int64(3), 'day': date(2024, 1, 31), 'x': float('nan')}
+    assert _copy_text(value) == '{"n":3,"day":"2024-01-31","x":null}'
+    assert _copy_text(value) == _json_dumps(value)
+
+
+def test_compressed_json_columns_round_trip(app):
+    forecast = {'months': list(range(36)), 'series': [{'p50': 1.5}] * 50}
+    MarketplaceIntelligence.bulk_insert(db.session, [{
+        'intelligence_type': 'demand_forecast', 'product_category': 'coffee',
+        'geographic_region': 'LATAM', 'time_period': date(2024, 3, 1), 'demand_forecast': forecast,
+    }])
+    db.session.commit()
+    
+    stored = db.session.execute(db.text("SELECT demand_forecast FROM marketplace_intelligence")).scalar_one()
+    assert len(stored) < len(str(forecast))
+    assert MarketplaceIntelligence.query.one().demand_forecast == forecast
+
+
+def test_compressed_json_reads_uncompressed_documents():
+    assert CompressedJSON().process_result_value(b'{"a": [1]}', None) == {'a': [1]}
+
+
+def test_coded_columns_round_trip_strings(app):
+    FeedbackCollection.bulk_insert(db.session, [
+        {'org_id': 'org-1', 'user_id': 'u-1', 'status': 'in_review', 'priority': 'high'},
+        {'org_id': 'org-1', 'user_id': 'u-2', 'status': 'closed', 'priority': 'low'},
+    ])
+    db.session.commit()
+    
+    stored = db.session.execute(db.text("SELECT status FROM feedback_collection ORDER BY status")).scalars().all()
+    assert stored == [2, 4]
+    assert FeedbackCollection.query.filter_by(status='in_review').one().priority == 'high'
+
+
+def test_unified_transaction_statuses_are_stored_as_codes(app):
+    UnifiedTransaction.bulk_insert(db.session, [
+        {'transaction_id': 'BOL-1', 'org_id': 'org-1', 'transaction_type': 'SHIPMENT',
+         'inventory_status': 'in_transit', 'compliance_status': 'in_progress'},
+    ])
+    db.session.commit()
+    
+    stored = db.session.execute(db.text(
+        "SELECT transaction_type, inventory_status, compliance_status FROM unified_transactions"
+    )).one()
+    assert tuple(stored) == (6, 3, 5)
+    tx = UnifiedTransaction.query.filter_by(inventory_status='in_transit').one()
+    assert (tx.transaction_type, tx.compliance_status) == ('SHIPMENT', 'in_progress')
+
+
+def test_coded_columns_reject_unknown_values(app):
+    db.session.add(FeedbackCollection(org_id='org-1', user_id='u-1', status='archived'))
+    with pytest.raises(Exception, match='archived'):
+        db.session.flush()
+    db.session.rollback()
+
+
+def test_open_queue_orders_open_feedback_by_priority_then_age(app):
+    FeedbackCollection.bulk_insert(db.session, [
+        {'org_id': 'org-1', 'user_id': 'old-low', 'status': 'new', 'priority': 'low'},
+        {'org_id': 'org-1', 'user_id': 'critical', 'status': 'in_review', 'priority': 'critical'},
+        {'org_id': 'org-1', 'user_id': 'closed', 'status': 'closed', 'priority': 'critical'},
+    ])
+    db.session.commit()
+    
+    assert [f.user_id for f in FeedbackCollection.open_queue()] == ['critical', 'old-low']
+
+
+def test_enrich_batch_scores_unprocessed_feedback_in_one_call(app):
+    FeedbackCollection.bulk_insert(db.session, [
+        {'org_id': 'org-1', 'user_id': f'u-{i}', 'feedback_text': f'text {i}'} for i in range(5)
+    ] + [
+        {'org_id': 'org-1', 'user_id': 'done', 'feedback_text': 'seen', 'sentiment_score': 0.9},
+        {'org_id': 'org-1', 'user_id': 'empty'},
+    ])
+    db.session.commit()
+    calls = []
+    
+    def analyze(texts):
+        calls.append(texts)
+        return [{'sentiment_score': -0.5, 'key_topics': [text], 'ignored': True} for text in texts]
+    
+    assert FeedbackCollection.enrich_batch(db.session, analyze, batch_size=3) == 3
+    assert FeedbackCollection.enrich_batch(db.session, analyze, batch_size=3) == 2
+    assert FeedbackCollection.enrich_batch(db.session, analyze, batch_size=3) == 0
+    db.session.commit()
+    
+    assert [len(texts) for texts in calls] == [3, 2]
+    enriched = FeedbackCollection.query.filter(FeedbackCollection.user_id.like('u-%')).all()
+    assert all(f.sentiment_score == -0.5 and f.key_topics == [f.feedback_text] for f in enriched)
+    assert FeedbackCollection.query.filter_by(user_id='done').one().sentiment_score == 0.9
+
+
+def test_api_integration_bulk_insert_keeps_json_columns(app):
+    records = [
+        {'org_id': 'org-1', 'provider_name': f'erp-{i}', 'status': 'active',
+         'field_mappings': {'sku': 'item_code'}, 'intelligence_types': ['demand']}
+        for i in range(3)
+    ]
+    
+    assert APIIntegration.bulk_insert(db.session, records, page_size=2) == 3
+    db.session.commit()
+    
+    integration = APIIntegration.query.filter_by(provider_name='erp-2').one()
+    assert integration.field_mappings == {'sku': 'item_code'}
+    assert integration.intelligence_types == ['demand']
+
+
+def test_json_columns_accept_numpy_values(app):
+    db.session.add(FeedbackCollection(
+        org_id='org-1', user_id='u-1',
+        emotion_tags={'confidence': np.float64(0.75), 'counts': np.array([1, 2])}
+    ))
+    db.session.commit()
+    
+    assert FeedbackCollection.query.one().emotion_tags == {'confidence': 0.75, 'counts': [1, 2]}
+
+
+def test_api_integration_credentials_round_trip_encrypted(app, monkeypatch):
+    pytest.importorskip('cryptography')
+    from utils import crypto
+    monkeypatch.setattr(crypto.settings, 'CREDENTIALS_ENCRYPTION_KEY', base64.b64encode(b'k' * 32).decode())
+    monkeypatch.setattr(crypto, '_cipher', None)
+    
+    integration = APIIntegration(org_id='org-1')
+    integration.set_credentials({'api_key': 'secret'})
+    db.session.add(integration)
+    db.session.commit()
+    
+    stored = db.session.get(APIIntegration, integration.id)
+    assert b'secret' not in stored.credentials_encrypted
+    assert stored.get_credentials() == {'api_key': 'secret'}
+    
+    other = APIIntegration(org_id='org-1', credentials_encrypted=stored.credentials_encrypted)
+    other.id = uuid.uuid4()
+    with pytest.raises(Exception):
+        other.get_credentials()
+
+
+def test_market_analysis_rows_feed_the_market_analyses(app):
+    MarketIntelligence.bulk_insert(db.session, [
+        {'product_category': 'coffee', 'geographic_region': 'LATAM', 'time_period': date(2024, 3, 1),
+         'demand_growth_rate': 0.3, 'total_suppliers': 5, 'average_lead_time': 20, 'data_points_count': 20},
+        {'product_category': 'cocoa', 'geographic_region': 'LATAM', 'time_period': date(2024, 3, 1),
+         'demand_growth_rate': 0.1, 'total_suppliers': 15, 'average_lead_time': 40, 'data_points_count': 30},
+    ])
+    db.session.commit()
+    
+    rows = MarketIntelligence.analysis_rows(MarketIntelligence.geographic_region == 'LATAM')
+    assert sorted(row.product_category for row in rows) == ['cocoa', 'coffee']
+    
+    metrics = DataQualityMetrics()
+    assert metrics._analyze_supply_trends(rows)['total_suppliers'] == 20
+    [opportunity] = metrics._identify_market_opportunities(rows)
+    assert opportunity['market'] == 'coffee - LATAM'
+
+
+class FakeRedis:
+    """Just enough of the redis client for the intelligence cache"""
+    
+    def __init__(self):
+        self.data = {}
+    
+    def get(self, key):
+        return self.data.get(key)
+    
+    def pipeline(self):
+        return FakePipeline(self)
+    
+    def smembers(self, key):
+        return set(self.data.get(key, ()))
+    
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        return False
+    
+    def set(self, key, value, ex=None):
+        self.client.data[key] = value
+    
+    def sadd(self, key, member):
+        self.client.data.setdefault(key, set()).add(member)
+    
+    def execute(self):
+        pass
+
+
+def test_market_intelligence_get_cached_reads_through_redis(app, monkeypatch):
+    fake = FakeRedis()
+    monkeypatch.setattr(models_enhanced, 'get_redis', lambda: fake)
+    MarketIntelligence.bulk_insert(db.session, [{
+        'product_category': 'coffee', 'geographic_region': 'LATAM',
+        'time_period': date(2024, 3, 1), 'price_trend': 'stable',
+    }])
+    db.session.commit()
+    
+    row = MarketIntelligence.get_cached('coffee', 'LATAM', date(2024, 3, 1))
+    assert row['price_trend'] == 'stable' and row['time_period'] == '2024-03-01'
+    
+    MarketIntelligence.query.delete()
+    db.session.commit()
+    assert MarketIntelligence.get_cached('coffee', 'LATAM', date(2024, 3, 1)) == row
+    
+    models_enhanced.invalidate_intelligence_cache()
+    assert MarketIntelligence.get_cached('coffee', 'LATAM', date(2024, 3, 1)) is None
+
+
+def test_market_intelligence_get_cached_without_redis(app, monkeypatch):
+    monkeypatch.setattr(models_enhanced, 'get_redis', lambda: None)
+    
+    assert MarketIntelligence.get_cached('coffee', 'LATAM', date(2024, 3, 1)) is None
+
+
+def test_cached_intelligence_computes_once_until_invalidated(monkeypatch):
+    fake = FakeRedis()
+    monkeypatch.setattr(models_enhanced, 'get_redis', lambda: fake)
+    calls = []
+    
+    def compute():
+        calls.append(1)
+        return {'period': date(2024, 3, 1), 'score': np.float64(0.5)}
+    
+    first = models_enhanced.cached_intelligence('market_moat:test', compute)
+    assert first == {'period': '2024-03-01', 'score': 0.5}
+    assert models_enhanced.cached_intelligence('market_moat:test', compute) == first
+    assert len(calls) == 1
+    
+    models_enhanced.invalidate_intelligence_cache()
+    models_enhanced.cached_intelligence('market_moat:test', compute)
+    assert len(calls) == 2
+    
+    assert models_enhanced.cached_intelligence('missing', lambda: None) is None
+    assert 'missing' not in fake.data
@@ -0,0 +1,201 @@
+"""Unit tests for the database migration runner"""
+import os
+import sqlite3
+import sys
+
+import pytest
+
+os.environ.setdefault('SECRET_KEY', 'test-secret-key')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from migrations.run_migrations import MigrationRunner, _coalesce_inserts, _iter_statements
+
+
+def make_runner(tmp_path, db_type='sqlite'):
+    """Build a runner pointed at a temporary migration directory"""
+    runner = MigrationRunner.__new__(MigrationRunner)
+    runner.database_url = f"sqlite:///{tmp_path / 'test.db'}"
+    runner.migration_dir = tmp_path
+    runner.db_type = db_type
+    runner.mode = 'sync'
+    runner._migration_files_cache = None
+    runner._migration_dir_mtime = None
+    return runner
+
+
+def test_iter_statements_respects_quotes_and_comments():
+    sql = (
+        "INSERT INTO t VALUES ('a;b');\n"
+        "-- comment; with semicolon\n"
+        "CREATE FUNCTION f() RETURNS void AS $body$ BEGIN; END $body$ LANGUAGE plpgsql;\n"
+        "SELECT \"odd;name\" FROM t"
+    )
+    statements = list(_iter_statements(sql))
+    assert statements == [
+        "INSERT INTO t VALUES ('a;b')",
+        "-- comment; with semicolon\nCREATE FUNCTION f() RETURNS void AS $body$ BEGIN; END $body$ LANGUAGE plpgsql",
+        "SELECT \"odd;name\" FROM t",
+    ]
+
+
+def test_iter_statements_skips_empty_statements():
+    assert list(_iter_statements(";;  ;\n")) == []
+
+
+def test_list_migration_files_rescans_on_directory_change(tmp_path):
+    runner = make_runner(tmp_path)
+    (tmp_path / '001_first.sqlite.sql').write_text('SELECT 1;')
+    (tmp_path / 'notes.sql').write_text('')
+    assert [f[:3] for f in runner._list_migration_files()] == [('001_first.sqlite.sql', '001', '001 first')]
+    
+    (tmp_path / '002_second.sqlite.sql').write_text('SELECT 2;')
+    os.utime(tmp_path, (0, 0))
+    assert [f[0] for f in runner._list_migration_files()] == ['001_first.sqlite.sql', '002_second.sqlite.sql']
+
+
+def test_list_migration_files_selects_dialect(tmp_path):
+    (tmp_path / '001_first.sqlite.sql').write_text('SELECT 1;')
+    (tmp_path / '001_first.postgresql.sql').write_text('SELECT 1;')
+    (tmp_path / '001_rollback.postgresql.sql').write_text('SELECT 1;')
+    
+    runner = make_runner(tmp_path, 'postgresql')
+    assert [f[:3] for f in runner._list_migration_files()] == [('001_first.postgresql.sql', '001', '001 first')]
+
+
+def test_get_applied_migrations_filters_candidates(tmp_path):
+    runner = make_runner(tmp_path)
+    conn = sqlite3.connect(':memory:')
+    cursor = conn.cursor()
+    runner._create_migration_table(cursor)
+    cursor.executemany(
+        "INSERT INTO schema_migrations (version, description) VALUES (?, ?)",
+        [('001', 'first'), ('002', 'second')]
+    )
+    
+    assert runner._get_applied_migrations(cursor) == {'001', '002'}
+    assert runner._get_applied_migrations(cursor, ['002', '003']) == {'002'}
+    assert runner._get_applied_migrations(cursor, []) == set()
+
+
+def test_coalesce_inserts_merges_adjacent_rows():
+    statements = [
+        "CREATE TABLE t (a INTEGER, b TEXT)",
+        "INSERT INTO t (a, b) VALUES (1, 'x')",
+        "insert into t (a, b)  values (2, 'y')",
+        "INSERT INTO other (a) VALUES (3)",
+        "SELECT 1",
+        "INSERT INTO t (a, b) VALUES (4, 'it''s (not) a row')",
+        "INSERT INTO t (a, b) VALUES (5, lower('Z'))",
+    ]
+    assert list(_coalesce_inserts(statements)) == [
+        "CREATE TABLE t (a INTEGER, b TEXT)",
+        "INSERT INTO t (a, b) VALUES (1, 'x'), (2, 'y')",
+        "INSERT INTO other (a) VALUES (3)",
+        "SELECT 1",
+        "INSERT INTO t (a, b) VALUES (4, 'it''s (not) a row'), (5, lower('Z'))",
+    ]
+    
+    # Statements with anything after their rows run as written
+    tails = [
+        "INSERT INTO t (a, b) VALUES (1, 'x') ON CONFLICT (a) DO UPDATE SET b = lower(excluded.b)",
+        "INSERT INTO t (a, b) VALUES (2, 'y') ON CONFLICT (a) DO UPDATE SET b = lower(excluded.b)",
+        "INSERT INTO t (a) VALUES (3) RETURNING (a)",
+        "INSERT INTO t (a) VALUES (4) RETURNING (a)",
+        "INSERT INTO t (a) VALUES (5) -- (comment)",
+        "INSERT INTO t (a) VALUES (6)",
+    ]
+    assert list(_coalesce_inserts(tails)) == tails
+
+
+def test_execute_migration_rolls_back_whole_file(tmp_path):
+    runner = make_runner(tmp_path)
+    conn = sqlite3.connect(':memory:')
+    cursor = conn.cursor()
+    runner._create_migration_table(cursor)
+    conn.commit()
+    
+    with pytest.raises(sqlite3.OperationalError):
+        runner._execute_migration(cursor, "CREATE TABLE t (a INTEGER); SELECT * FROM missing;", '001', 'broken')
+    
+    tables = {row[0] for row in cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert 't' not in tables
+    assert runner._get_applied_migrations(cursor) == set()
+
+
+def test_start_async_runs_migrations_in_background(tmp_path):
+    runner = make_runner(tmp_path)
+    runner.mode = 'async'
+    (tmp_path / '001_create_items.sqlite.sql').write_text('CREATE TABLE items (id INTEGER);')
+    
+    thread = runner.start()
+    thread.join(timeout=10)
+    
+    assert MigrationRunner.get_status()['state'] == 'succeeded'
+    assert [m['applied'] for m in runner.get_migration_status()] == [True]
+
+
+def test_start_skip_does_not_touch_database(tmp_path):
+    runner = make_runner(tmp_path)
+    runner.mode = 'skip'
+    (tmp_path / '001_create_items.sqlite.sql').write_text('CREATE TABLE items (id INTEGER);')
+    
+    assert runner.start() is None
+    assert not (tmp_path / 'test.db').exists()
+
+
+class FakePgConnection:
+    """psycopg2 connection stand-in whose advisory unlock fails"""
+    def __init__(self):
+        self.closed = 0
+        self.rolled_back = False
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        return False
+    
+    def cursor(self):
+        return self
+    
+    def execute(self, sql, params=None):
+        if 'pg_advisory_unlock' in sql:
+            raise RuntimeError('current transaction is aborted')
+    
+    def commit(self):
+        pass
+    
+    def rollback(self):
+        self.rolled_back = True
+    
+    def close(self):
+        self.closed = 1
+
+
+def test_failed_lock_release_closes_connection(tmp_path, monkeypatch):
+    from migrations import run_migrations
+    
+    conn = FakePgConnection()
+    returned = []
+    
+    class FakePool:
+        def getconn(self):
+            return conn
+        
+        def putconn(self, c, close=False):
+            returned.append(close)
+    
+    monkeypatch.setattr(run_migrations, '_get_postgresql_pool', lambda url: FakePool())
+    runner = make_runner(tmp_path, db_type='postgresql')
+    (tmp_path / '001_first.postgresql.sql').write_text('SELECT 1;')
+    
+    def broken_table(cursor):
+        raise ValueError('create failed')
+    runner._create_migration_table = broken_table
+    
+    with pytest.raises(ValueError, match='create failed'):
+        runner.run_migrations()
+    
+    assert conn.rolled_back
+    assert returned == [True]
@@ -0,0 +1,29 @@
+"""
+Redis Cache Client
+==================
+
+Shared Redis connection for read-through caches. Caching is optional:
+get_redis() returns None when REDIS_URL is not configured, and callers fall
+back to the database.
+"""
+
+import threading
+from typing import Optional
+
+import redis
+
+from config.settings import settings
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_redis() -> Optional[redis.Redis]:
+    """Get the shared Redis client, or None if caching is not configured."""
+    global _client
+    if not settings.REDIS_URL:
+        return None
+    with _client_lock:
+        if _client is None:
+            _client = redis.Redis.from_url(settings.REDIS_URL, socket_timeout=0.5)
+        return _client
@@ -0,0 +1,48 @@
+"""
+Credential Encryption
+=====================
+
+AES-256-GCM for secrets stored in the database. The key comes from
+CREDENTIALS_ENCRYPTION_KEY (32 bytes, base64-encoded); the cipher is built once
+and shared, since AESGCM objects are thread-safe and reusing one keeps the key
+schedule out of every call. Ciphertexts are stored as raw bytes:
+12-byte nonce followed by the GCM ciphertext and tag.
+"""
+
+import base64
+import os
+import threading
+
+from config.settings import settings
+
+NONCE_SIZE = 12
+
+_cipher = None
+_cipher_lock = threading.Lock()
+
+
+def get_cipher():
+    """Get the shared AESGCM cipher for CREDENTIALS_ENCRYPTION_KEY."""
+    global _cipher
+    with _cipher_lock:
+        if _cipher is None:
+            from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+            
+            if not settings.CREDENTIALS_ENCRYPTION_KEY:
+                raise ValueError("Required setting CREDENTIALS_ENCRYPTION_KEY is not configured")
+            key = base64.b64decode(settings.CREDENTIALS_ENCRYPTION_KEY)
+            if len(key) != 32:
+                raise ValueError("CREDENTIALS_ENCRYPTION_KEY must be 32 bytes, base64-encoded")
+            _cipher = AESGCM(key)
+        return _cipher
+
+
+def encrypt(plaintext: bytes, associated_data: bytes = None) -> bytes:
+    """Encrypt plaintext, returning nonce || ciphertext."""
+    nonce = os.urandom(NONCE_SIZE)
+    return nonce + get_cipher().encrypt(nonce, plaintext, associated_data)
+
+
+def decrypt(token: bytes, associated_data: bytes = None) -> bytes:
+    """Decrypt a value produced by encrypt(); raises InvalidTag if it was tampered with."""
+    return get_cipher().decrypt(token[:NONCE_SIZE], token[NONCE_SIZE:], associated_data)
@@ -0,0 +1,30 @@
+"""
+orjson Response Provider
+========================
+
+Flask JSON provider that encodes jsonify() responses with orjson. Dates,
+datetimes, UUIDs and numpy values are encoded natively in C, so model
+to_dict() methods can return them as-is instead of formatting each one in
+Python. Dates come out as ISO 8601 strings, matching what to_dict() used to
+produce. Anything orjson cannot encode falls back to Flask's default handler.
+"""
+
+import orjson
+from flask.json.provider import DefaultJSONProvider
+
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """DefaultJSONProvider whose responses are serialized with orjson."""
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        option = _ORJSON_OPTIONS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            option |= orjson.OPT_INDENT_2
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=option), mimetype=self.mimetype
+        )